@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Per-object memory footprint of regular and compact resources
+
+Hydrates `count` servers from the unit test fixture with distinct ids and
+reports the average number of bytes each one holds. Objects shared between
+resources, such as interned strings, are counted once.
+
+    python benchmarks/memory.py [count]
+"""
+import os
+import sys
+os.environ.setdefault('ES_ACCESS_KEY', 'benchmark')
+os.environ.setdefault('ES_SECRET_KEY', 'benchmark')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import copy
+import gc
+import json
+import types
+
+from mixcoatl.infrastructure.server import Server
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       '..', 'tests', 'data', 'unit', 'infrastructure', 'server.json')
+
+def footprint(objects):
+    """Return the total size in bytes of `objects` and everything they refer to"""
+    seen = set()
+    stack = list(objects)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+def listing(count):
+    with open(FIXTURE) as f:
+        server = json.load(f)['servers'][0]
+    servers = []
+    for i in range(count):
+        s = copy.deepcopy(server)
+        s['serverId'] = i
+        servers.append(s)
+    return {'servers': servers}
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = listing(count)
+    for cls in [Server, Server.compact()]:
+        resources = cls.from_collection(data)
+        print('%-14s %8d bytes/object' % (cls.__name__, footprint(resources) / count))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Start-up time of the dcm-* tools
+
+Runs the interpreter on its own, a baseline tool that only parses its
+arguments and imports a resource module, and every ``dcm-*`` tool with
+``--help`` in fresh processes, and reports the best wall time of `runs` for
+each along with its overhead over the bare interpreter. Exits with status 1
+if a tool's overhead is more than `budget` times that of the baseline. The
+baseline is run in turn with each tool, so that the check depends neither on
+the speed of the machine nor on how busy it gets during the run.
+
+    python benchmarks/startup.py [--runs N] [--budget RATIO] [tool ...]
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+#: The default overhead allowed for a tool, as a multiple of the baseline's
+BUDGET = 2.0
+
+#: What every tool does at the least: parse its arguments and import a resource
+BASELINE = ('import argparse; argparse.ArgumentParser().parse_args([]); '
+            'import mixcoatl.infrastructure.server')
+
+def environment():
+    """Return the environment the commands run in, without a daemon or API to talk to"""
+    env = dict(os.environ)
+    env.setdefault('ES_ACCESS_KEY', 'benchmark')
+    env.setdefault('ES_SECRET_KEY', 'benchmark')
+    env['ES_DAEMON_SOCKET'] = os.path.join(ROOT, 'benchmarks', 'no-daemon.sock')
+    # Nothing should reach the API, but fail fast if a tool tries
+    env['ES_ENDPOINT'] = 'http://127.0.0.1:9/api/enstratus/2012-06-15'
+    env['ES_RETRIES'] = '0'
+    env['PYTHONPATH'] = os.pathsep.join([ROOT] + [p for p in [env.get('PYTHONPATH')] if p])
+    return env
+
+def best(argvs, runs, env):
+    """Return the best wall time of `runs` runs of each of `argvs`, in milliseconds
+
+    The commands are run in turn, so that they are timed in the same conditions.
+    """
+    times = [[] for _ in argvs]
+    with open(os.devnull, 'w') as devnull:
+        for _ in range(runs):
+            for argv, t in zip(argvs, times):
+                start = time.time()
+                subprocess.call(argv, stdout=devnull, stderr=devnull, env=env)
+                t.append((time.time() - start) * 1000)
+    return [min(t) for t in times]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=9, help='Runs of each command (default 9)')
+    parser.add_argument('--budget', type=float, default=BUDGET,
+                        help="Overhead allowed for a tool, as a multiple of the baseline's "
+                             '(default %.1f)' % BUDGET)
+    parser.add_argument('tools', nargs='*', help='The tools to run (default every dcm-* tool)')
+    cmd_args = parser.parse_args()
+
+    env = environment()
+    tools = cmd_args.tools or sorted(os.path.basename(t) for t in glob.glob(os.path.join(ROOT, 'bin', 'dcm-*')))
+    python = [sys.executable, '-c', 'pass']
+    baseline = [sys.executable, '-c', BASELINE]
+    base, reference = best([python, baseline], cmd_args.runs, env)
+    print('%-36s %8.1f ms' % ('python', base))
+    print('%-36s %8.1f ms %+8.1f ms' % ('baseline', reference, reference - base))
+    over = []
+    for tool in tools:
+        command = [sys.executable, os.path.join(ROOT, 'bin', tool), '--help']
+        base, reference, elapsed = best([python, baseline, command], cmd_args.runs, env)
+        ratio = (elapsed - base) / (reference - base)
+        print('%-36s %8.1f ms %+8.1f ms %6.2fx' % (tool, elapsed, elapsed - base, ratio))
+        if ratio > cmd_args.budget:
+            over.append(tool)
+    if over:
+        print('Over %.1f times the overhead of the baseline: %s' % (cmd_args.budget, ', '.join(over)))
+        sys.exit(1)
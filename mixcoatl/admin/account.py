@@ -114,20 +114,22 @@ class Account(Resource):
         r = Resource(cls.PATH)
         if 'detail' in kwargs:
             r.request_details = kwargs['detail']
-        else:
+        elif keys_only is True:
             r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
 
         if 'cloud_id' in kwargs:
             params = {'cloudId': kwargs['cloud_id']}
         else:
             params = {}
 
-        c = r.get(params=params)
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i[camelize(cls.PRIMARY_KEY)] for i in c[cls.COLLECTION_NAME]]
             else:
-                return [cls(i[camelize(cls.PRIMARY_KEY)]) for i in c[cls.COLLECTION_NAME]]
+                return cls.from_collection(c, r.request_details)
         else:
             raise AccountException(r.last_error)
     
@@ -165,8 +165,10 @@ class ApiKey(Resource):
         r = Resource(cls.PATH)
         if 'detail' in kwargs:
             r.request_details = kwargs['detail']
-        else:
+        elif keys_only is True:
             r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
 
         if 'account_id' in kwargs:
             params = {'accountId': kwargs['account_id']}
@@ -175,12 +177,12 @@ class ApiKey(Resource):
         else:
             params = {}
 
-        c = r.get(params=params)
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i['accessKey'] for i in c[cls.COLLECTION_NAME]]
             else:
-                return [cls(i['accessKey']) for i in c[cls.COLLECTION_NAME]]
+                return cls.from_collection(c, r.request_details)
         else:
             raise ApiKeyException(r.last_error)
 
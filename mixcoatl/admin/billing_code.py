@@ -113,17 +113,21 @@ class BillingCode(Resource):
         :raises: :class:`BillingCodeException`
         """
         r = Resource(cls.PATH)
-        if 'details' in kwargs:
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        elif 'details' in kwargs:
             r.request_details = kwargs['details']
-        else:
+        elif keys_only is True:
             r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
 
-        x = r.get()
+        x = r.get(uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i['billingCodeId'] for i in x[cls.COLLECTION_NAME]]
             else:
-                return [cls(i['billingCodeId']) for i in x[cls.COLLECTION_NAME]]
+                return cls.from_collection(x, r.request_details)
         else:
             raise BillingCodeException(r.last_error)
 
@@ -74,20 +74,22 @@ class Group(Resource):
         r = Resource(cls.PATH)
         if 'detail' in kwargs:
             r.request_details = kwargs['detail']
-        else:
+        elif keys_only is True:
             r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
 
         if 'account_id' in kwargs:
             params = {'accountId': kwargs['account_id']}
         else:
             params = {}
 
-        x = r.get(params=params)
+        x = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i['groupId'] for i in x[cls.COLLECTION_NAME]]
             else:
-                return [cls(i['groupId']) for i in x[cls.COLLECTION_NAME]]
+                return cls.from_collection(x, r.request_details)
         else:
             raise GroupException(r.last_error)
 
@@ -8,8 +8,6 @@ from mixcoatl.resource import Resource
 from mixcoatl.decorators.lazy import lazy_property
 from mixcoatl.utils import camelize
 
-import time
-
 class Job(Resource):
     PATH = 'admin/Job'
     COLLECTION_NAME = 'jobs'
@@ -62,12 +60,12 @@ class Job(Resource):
         :raises: :class:`JobException`
         """
         r = Resource(cls.PATH)
-        x = r.get()
+        x = r.get(uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             else:
-                return [cls(i[camelize(cls.PRIMARY_KEY)]) for i in x[cls.COLLECTION_NAME]]
+                return cls.from_collection(x, r.request_details)
         else:
             raise JobException(r.last_error)
 
@@ -75,6 +73,10 @@ class Job(Resource):
     def wait_for(cls, job_id, status='COMPLETE', callback = None):
         """Blocks execution until :attr:`job_id` returns :attr:`status`
 
+        The job is checked once and then left to the shared
+        :class:`~mixcoatl.watch.JobWatcher`, so any number of threads can
+        wait on jobs with a handful of API calls per tick.
+
         :param job_id: The ID of the job to wait on
         :type job_id: int.
         :param status: The status to expect before continuing
@@ -89,14 +91,13 @@ class Job(Resource):
         j.load()
         if j.last_error is not None:
             raise JobException(j.last_error)
-        else:
-            while j.status != status:
-                time.sleep(5)
-                j.load()
-                if j.status == 'ERROR':
-                    break
-                else:
-                    continue
+        elif j.status not in [status, 'ERROR']:
+            from mixcoatl.watch import get_watcher
+            final = []
+            error = get_watcher().watch(job_id, status, callback=final.append).exception()
+            if len(final) == 0:
+                raise error
+            j = final[0]
         if callback is not None:
             callback(j)
         else:
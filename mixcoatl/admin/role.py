@@ -121,8 +121,10 @@ class Role(Resource):
         params = {}
         if 'detail' in kwargs:
             r.request_details = kwargs['detail']
-        else:
+        elif keys_only is True:
             r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
 
         if 'account_id' in kwargs:
             params['account_id'] = kwargs['account_id']
@@ -130,12 +132,12 @@ class Role(Resource):
         if 'group_id' in kwargs:
             params['group_id'] = kwargs['group_id']
 
-        x = r.get(params=params)
+        x = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i['roleId'] for i in x[cls.COLLECTION_NAME]]
             else:
-                return [cls(i['roleId']) for i in x[cls.COLLECTION_NAME]]
+                return cls.from_collection(x, r.request_details)
         else:
             raise RoleException(r.last_error)
 
@@ -260,15 +260,17 @@ class User(Resource):
         r = Resource(cls.PATH)
         if 'detail' in kwargs:
             r.request_details = kwargs['detail']
-        else:
+        elif keys_only is True:
             r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
 
-        x = r.get()
+        x = r.get(uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 return [i['userId'] for i in x[cls.COLLECTION_NAME]]
             else:
-                return [cls(i['userId']) for i in x[cls.COLLECTION_NAME]]
+                return cls.from_collection(x, r.request_details)
         else:
             raise UserException(r.last_error)
 
@@ -1,6 +1,5 @@
 from mixcoatl.resource import Resource
 from mixcoatl.decorators.lazy import lazy_property
-from mixcoatl.utils import camelize
 
 class ConfigurationManagementAccount(Resource):
     PATH = 'automation/ConfigurationManagementAccount'
@@ -73,10 +72,10 @@ class ConfigurationManagementAccount(Resource):
         if 'details' in kwargs:
             r.request_details = kwargs['details']
         else:
-            r.request_details = 'basic'
+            r.request_details = 'extended'
 
-        x = r.get()
+        x = r.get(uncameled=True)
         if r.last_error is None:
-            return [cls(i[camelize(cls.PRIMARY_KEY)]) for i in x[cls.COLLECTION_NAME]]
+            return cls.from_collection(x, r.request_details)
         else:
             return x.last_error
@@ -2,7 +2,7 @@
 from mixcoatl.resource import Resource
 from mixcoatl.decorators.lazy import lazy_property
 from mixcoatl.decorators.validations import required_attrs
-from mixcoatl.utils import camelize, camel_keys
+from mixcoatl.utils import camel_keys
 from mixcoatl.admin.job import Job
 
 import json
@@ -127,11 +127,11 @@ class Deployment(Resource):
         if 'details' in kwargs:
             r.request_details = kwargs['details']
         else:
-            r.request_details = 'basic'
+            r.request_details = 'extended'
 
-        x = r.get()
+        x = r.get(uncameled=True)
         if r.last_error is None:
-            return [cls(i[camelize(cls.PRIMARY_KEY)]) for i in x[cls.COLLECTION_NAME]]
+            return cls.from_collection(x, r.request_details)
         else:
             return r.last_error
 
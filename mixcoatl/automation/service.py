@@ -1,6 +1,5 @@
 from mixcoatl.resource import Resource
 from mixcoatl.decorators.lazy import lazy_property
-from mixcoatl.utils import camelize
 
 class Service(Resource):
     PATH = 'automation/Service'
@@ -57,10 +56,10 @@ class Service(Resource):
         if 'details' in kwargs:
             r.request_details = kwargs['details']
         else:
-            r.request_details = 'basic'
+            r.request_details = 'extended'
 
-        x = r.get()
+        x = r.get(uncameled=True)
         if r.last_error is None:
-            return [cls(i[camelize(cls.PRIMARY_KEY)]) for i in x[cls.COLLECTION_NAME]]
+            return cls.from_collection(x, r.request_details)
         else:
             return r.last_error
@@ -1,7 +1,7 @@
 from mixcoatl.resource import Resource
 from mixcoatl.decorators.lazy import lazy_property
 from mixcoatl.decorators.validations import required_attrs
-from mixcoatl.utils import camelize, camel_keys
+from mixcoatl.utils import camel_keys
 from mixcoatl.admin.job import Job
 
 import json
@@ -158,11 +158,11 @@ class Tier(Resource):
         if 'details' in kwargs:
             r.request_details = kwargs['details']
         else:
-            r.request_details = 'basic'
+            r.request_details = 'extended'
 
-        x = r.get()
+        x = r.get(uncameled=True)
         if r.last_error is None:
-            return [cls(i[camelize(cls.PRIMARY_KEY)]) for i in x[cls.COLLECTION_NAME]]
+            return cls.from_collection(x, r.request_details)
         else:
             return r.last_error
 
@@ -179,10 +179,13 @@ class Tier(Resource):
 										 'lower_ram_threshold',
 										 'upper_ram_threshold' ])
 
-    def create(self, callback=None):
+    def create(self, callback=None, future=False):
         """Creates a new tier
 
         :param callback: Optional callback to send the resulting :class:`Job`
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the created tier
+        :type future: bool.
         :raises: :class:`TierCreationException`
         """
 
@@ -204,6 +207,8 @@ class Tier(Resource):
 
         response=self.post(data=json.dumps(payload))
         if self.last_error is None:
+            if future:
+                return self.job_future(created=True)
             self.load()
             return response
         else:
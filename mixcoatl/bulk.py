@@ -0,0 +1,341 @@
+"""
+mixcoatl.bulk
+-------------
+
+Run one action against many resources.
+
+A :class:`BulkAction` calls an action such as `stop` or `terminate` on every
+resource, making up to `workers` API calls at once. With `wait` the jobs
+started are left to the shared :class:`~mixcoatl.watch.JobWatcher` and each
+resource succeeds or fails with its job. The outcome of every resource is
+kept in :attr:`BulkAction.results`.
+
+With a `state_file` each outcome is also appended to the file as soon as it
+is known. Running the same action again with that file skips the resources
+that already succeeded, watches the jobs still running instead of starting
+them again and retries the rest, so an interrupted run can be resumed.
+
+>>> from mixcoatl.bulk import BulkAction
+>>> action = BulkAction(Server, 'stop', server_ids, workers=20, wait=True, state_file='stop.state')
+>>> action.run()
+{'succeeded': 498, 'started': 0, 'failed': 2, 'skipped': 0}
+>>> action.failed()
+{331810: u'Server is not running'}
+"""
+import fnmatch
+import os
+import sys
+import threading
+from mixcoatl.utils import json
+
+#: The resource method behind each action
+ACTIONS = {'start': 'start',
+           'stop': 'stop',
+           'pause': 'pause',
+           'terminate': 'destroy',
+           'delete': 'destroy'}
+
+#: The actions that cannot be undone, which need `--yes` to run on the
+#: resources selected by `--filter`
+DESTRUCTIVE = ['terminate', 'delete']
+
+#: The action was accepted and its job is still running
+STARTED = 'started'
+#: The action completed
+SUCCEEDED = 'succeeded'
+#: The action was refused, raised an exception or its job failed
+FAILED = 'failed'
+
+class BulkAction(object):
+    """Run `action` on the resources of class `cls` with the primary keys `ids`
+
+    Any other keyword argument, such as `reason`, is passed on to the action.
+
+    :param cls: The class of the resources, e.g. :class:`~mixcoatl.infrastructure.server.Server`
+    :type cls: class.
+    :param action: One of :data:`ACTIONS`
+    :type action: str.
+    :param ids: The primary keys of the resources
+    :type ids: iterable.
+    :param workers: The maximum number of concurrent API calls
+    :type workers: int.
+    :param wait: Wait for the jobs started by the action to finish
+    :type wait: bool.
+    :param state_file: Record the outcome of each resource in this file and
+        resume from it
+    :type state_file: str.
+    :raises: :class:`BulkActionException` if `cls` has no such action
+    """
+
+    def __init__(self, cls, action, ids, workers=10, wait=False, state_file=None, **kwargs):
+        if action not in ACTIONS or not hasattr(cls, ACTIONS[action]):
+            raise BulkActionException('%s does not support %s' % (cls.__name__, action))
+        self.cls = cls
+        self.action = action
+        self.ids = list(ids)
+        self.workers = workers
+        self.wait = wait
+        self.state_file = state_file
+        self.kwargs = kwargs
+        #: The outcome of each resource keyed by primary key: a `dict` with
+        #: its `status`, `job_id` and `error`
+        self.results = {}
+        #: The primary keys skipped because a previous run succeeded
+        self.skipped = []
+        self.__lock = threading.Lock()
+
+    def __read_state(self):
+        state = {}
+        if self.state_file is None or not os.path.exists(self.state_file):
+            return state
+        with open(self.state_file) as f:
+            lines = f.readlines()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line of an interrupted run may be cut short
+                continue
+            if entry.get('action') == self.action:
+                state[entry['id']] = entry
+        if len(lines) > 0 and not lines[-1].endswith('\n'):
+            with open(self.state_file, 'a') as f:
+                f.write('\n')
+        return state
+
+    def __record(self, key, status, job_id=None, error=None):
+        result = {'status': status, 'job_id': job_id, 'error': error}
+        with self.__lock:
+            self.results[key] = result
+            if self.state_file is not None:
+                entry = dict(result, id=key, action=self.action)
+                with open(self.state_file, 'a') as f:
+                    f.write(json.dumps(entry, sort_keys=True))
+                    f.write('\n')
+
+    def __call(self, key):
+        resource = self.cls(key)
+        try:
+            getattr(resource, ACTIONS[self.action])(**self.kwargs)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as e:
+            return key, None, str(e)
+        return key, resource.current_job, resource.last_error
+
+    def __watch(self, key, job_id):
+        """Return a future done once the outcome of the job of `key` is recorded"""
+        from mixcoatl.futures import Future
+        from mixcoatl.watch import get_watcher
+        recorded = Future()
+
+        def _done(future):
+            error = future.exception()
+            if error is None:
+                self.__record(key, SUCCEEDED, job_id)
+            else:
+                self.__record(key, FAILED, job_id, str(error))
+            recorded.set_result(key)
+        get_watcher().watch(job_id).add_done_callback(_done)
+        return recorded
+
+    def run(self, timeout=None):
+        """Run the action and return the number of resources per outcome
+
+        :param timeout: Stop waiting for jobs after this many seconds, leaving
+            them :data:`STARTED`
+        :type timeout: float.
+        :returns: `dict` of the `succeeded`, `started`, `failed` and `skipped` counts
+        """
+        from multiprocessing.pool import ThreadPool
+        from mixcoatl import futures
+
+        state = self.__read_state()
+        todo = []
+        watched = []
+        for key in self.ids:
+            previous = state.get(key, {})
+            if previous.get('status') == SUCCEEDED:
+                self.skipped.append(key)
+            elif previous.get('status') == STARTED and previous.get('job_id') is not None:
+                if self.wait:
+                    watched.append(self.__watch(key, previous['job_id']))
+                else:
+                    self.results[key] = {'status': STARTED, 'job_id': previous['job_id'], 'error': None}
+            else:
+                todo.append(key)
+
+        if len(todo) > 0:
+            pool = ThreadPool(max(1, min(self.workers, len(todo))))
+            try:
+                for key, job_id, error in pool.imap_unordered(self.__call, todo):
+                    if error is not None:
+                        self.__record(key, FAILED, job_id, error)
+                    elif job_id is None:
+                        self.__record(key, SUCCEEDED)
+                    else:
+                        self.__record(key, STARTED, job_id)
+                        if self.wait:
+                            watched.append(self.__watch(key, job_id))
+            finally:
+                pool.close()
+                pool.join()
+
+        if len(watched) > 0:
+            futures.wait(watched, timeout)
+        return self.summary()
+
+    def summary(self):
+        """Return the number of resources per outcome"""
+        counts = {SUCCEEDED: 0, STARTED: 0, FAILED: 0, 'skipped': len(self.skipped)}
+        with self.__lock:
+            for result in self.results.values():
+                counts[result['status']] += 1
+        return counts
+
+    def failed(self):
+        """Return the error of each failed resource keyed by primary key"""
+        with self.__lock:
+            return dict((k, r['error']) for k, r in self.results.items() if r['status'] == FAILED)
+
+def read_ids(path):
+    """Read primary keys from `path`, one per line
+
+    Blank lines and lines starting with `#` are ignored. `-` reads standard input.
+
+    :returns: `list` of the keys, as `int` where they are numbers
+    """
+    if path == '-':
+        lines = sys.stdin.readlines()
+    else:
+        with open(path) as f:
+            lines = f.readlines()
+    ids = []
+    for line in lines:
+        line = line.strip()
+        if line == '' or line.startswith('#'):
+            continue
+        if line.isdigit():
+            line = int(line)
+        ids.append(line)
+    return ids
+
+def parse_filters(filters):
+    """Parse `FIELD=PATTERN` strings into a `dict`
+
+    :raises: :class:`BulkActionException` if a filter has no `=`
+    """
+    parsed = {}
+    for f in filters or []:
+        if '=' not in f:
+            raise BulkActionException('Filters must look like FIELD=PATTERN: %s' % f)
+        field, pattern = f.split('=', 1)
+        parsed[field.strip()] = pattern.strip()
+    return parsed
+
+def _value(resource, field):
+    value = resource
+    for name in field.split('.'):
+        if isinstance(value, dict):
+            value = value.get(name)
+        else:
+            value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value
+
+def matches(resource, filters):
+    """Return whether every field of `resource` matches its shell-style pattern in `filters`
+
+    Fields of nested values are named with dots, e.g. ``region.name``.
+    """
+    for field, pattern in filters.items():
+        value = _value(resource, field)
+        if value is None or not fnmatch.fnmatchcase(unicode(value), pattern):
+            return False
+    return True
+
+def select(cls, filters, ids=None, **kwargs):
+    """Return the primary keys of the resources of `cls` that match `filters`
+
+    :param filters: Shell-style patterns keyed by field
+    :type filters: dict.
+    :param ids: Only consider these primary keys
+    :type ids: list.
+    :returns: `list` of primary keys
+    """
+    keys = []
+    wanted = None
+    if ids is not None:
+        wanted = set(ids)
+    for resource in cls.all(**kwargs):
+        key = getattr(resource, cls.PRIMARY_KEY)
+        if wanted is not None and key not in wanted:
+            continue
+        if matches(resource, filters):
+            keys.append(key)
+    return keys
+
+def add_arguments(parser):
+    """Add the bulk options of the `dcm-*` action tools to `parser`"""
+    parser.add_argument('--ids-from-file', metavar='FILE',
+                        help='Act on every ID listed in FILE, one per line (- for stdin)')
+    parser.add_argument('--filter', action='append', metavar='FIELD=PATTERN',
+                        help='Act on every resource whose FIELD matches PATTERN, e.g. status=RUNNING '
+                             'or name=dev-*. May be repeated.')
+    parser.add_argument('--workers', type=int, default=10, help='Concurrent API calls (default 10)')
+    parser.add_argument('--wait', action='store_true', help='Wait for the jobs started to finish')
+    parser.add_argument('--state-file', metavar='FILE',
+                        help='Record progress in FILE and resume from it when run again')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the IDs that would be acted on and stop')
+    parser.add_argument('--yes', action='store_true',
+                        help='Terminate or delete the resources selected by --filter without a dry run first')
+
+def is_bulk(cmd_args):
+    """Return whether the bulk options were given"""
+    return cmd_args.ids_from_file is not None or cmd_args.filter is not None
+
+def run_from_args(cls, action, cmd_args, **kwargs):
+    """Run `action` on the resources selected by the bulk options and print the outcome
+
+    With `--dry-run` the selected IDs are printed instead. So they are for a
+    :data:`DESTRUCTIVE` action on resources selected by `--filter` unless
+    `--yes` is given.
+
+    :returns: `int` - The exit status, `1` if any resource failed or the
+        action was not confirmed
+    """
+    ids = None
+    if cmd_args.ids_from_file is not None:
+        ids = read_ids(cmd_args.ids_from_file)
+    if cmd_args.filter is not None:
+        ids = select(cls, parse_filters(cmd_args.filter), ids)
+    unconfirmed = action in DESTRUCTIVE and cmd_args.filter is not None and not cmd_args.yes
+    if cmd_args.dry_run or unconfirmed:
+        for key in ids:
+            print(key)
+        print('%d selected to %s' % (len(ids), action))
+        if cmd_args.dry_run:
+            return 0
+        print('Nothing was done. Check the IDs above and run again with --yes to %s them.' % action)
+        return 1
+    bulk = BulkAction(cls, action, ids, workers=cmd_args.workers, wait=cmd_args.wait,
+                      state_file=cmd_args.state_file, **kwargs)
+    summary = bulk.run()
+    for key in bulk.ids:
+        result = bulk.results.get(key)
+        if result is None:
+            print('%s\tskipped' % key)
+        elif result['status'] == FAILED:
+            print('%s\t%s\t%s' % (key, result['status'], result['error']))
+        else:
+            print('%s\t%s\t%s' % (key, result['status'], result['job_id'] or ''))
+    print('%(succeeded)d succeeded, %(started)d started, %(failed)d failed, %(skipped)d skipped' % summary)
+    if summary[FAILED] > 0:
+        return 1
+    return 0
+
+class BulkActionException(BaseException):
+    """Bulk action exception"""
+    pass
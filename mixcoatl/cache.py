@@ -0,0 +1,426 @@
+"""
+mixcoatl.cache
+--------------
+
+Opt-in caches for `GET` responses.
+
+Reference data such as regions, data centers, clouds, server products and
+machine images rarely changes, yet is requested again every time it is
+needed. When enabled (``ES_CACHE=1`` or :func:`enable`), successful `GET`
+responses for resource types with a TTL are kept in memory and reused until
+they expire. Any `POST`, `PUT` or `DELETE` against a resource type drops
+every cached response of that type.
+
+The in-memory cache only lives as long as the process. :class:`DiskCache`
+keeps the same responses in a sqlite database under ``~/.cache/mixcoatl``
+(``ES_CACHE_DIR``) so separate runs of the ``dcm-*`` tools start warm. It is
+enabled with ``ES_DISK_CACHE=1`` or :func:`enable_disk`; the ``dcm-*`` tools
+that read reference data use it unless ``ES_DISK_CACHE=0`` and accept
+``--refresh`` to skip cached responses and store fresh ones. Writes drop the
+responses of their resource type from the database even in processes that
+do not use it (see :func:`invalidate_disk`).
+
+>>> from mixcoatl import cache
+>>> c = cache.enable(size=500)
+>>> c.set_ttl('admin/Group', 300)
+>>> Region.all()
+>>> c.stats()
+{'hits': 0, 'misses': 1, 'evictions': 0, 'invalidations': 0, 'entries': 1}
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+try:
+    from collections import OrderedDict
+except ImportError:
+    # Python 2.6, with the ordereddict backport
+    from ordereddict import OrderedDict
+from mixcoatl.settings.load_settings import settings
+
+#: Default time to live in seconds per resource type
+DEFAULT_TTLS = {
+    'geography/Cloud': 3600,
+    'geography/Region': 3600,
+    'geography/DataCenter': 3600,
+    'infrastructure/ServerProduct': 3600,
+    'infrastructure/MachineImage': 900,
+    'platform/RelationalDatabaseProduct': 3600,
+}
+
+#: Default time to live in seconds per resource type of the on-disk cache
+DISK_TTLS = dict(DEFAULT_TTLS)
+DISK_TTLS.update({
+    'admin/Group': 3600,
+    'admin/BillingCode': 3600,
+})
+
+_cache = None
+_disk_cache = None
+_lock = threading.Lock()
+
+def resource_type(path):
+    """Return the resource type of an API path
+
+    >>> resource_type('infrastructure/Server/12345')
+    'infrastructure/Server'
+    """
+    return '/'.join(path.strip('/').split('/')[:2])
+
+class CachedResponse(object):
+    """The parts of a :class:`requests.Response` kept in the cache"""
+
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @classmethod
+    def from_response(cls, response):
+        """Return the :class:`CachedResponse` of a :class:`requests.Response`"""
+        return cls(response.status_code, dict(response.headers), response.content, response.url)
+
+class BaseCache(object):
+    """TTL lookup and key building shared by the response caches"""
+
+    def __init__(self, ttls=None, default_ttl=0, defaults=DEFAULT_TTLS):
+        self.default_ttl = default_ttl
+        self.ttls = dict(defaults)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def ttl(self, path):
+        """Return the TTL in seconds that applies to `path`"""
+        return self.ttls.get(resource_type(path), self.default_ttl)
+
+    def set_ttl(self, rtype, ttl):
+        """Set the TTL in seconds for resource type `rtype` (e.g. ``admin/Group``)"""
+        self.ttls[rtype] = ttl
+
+    def key(self, path, params, request_details):
+        """Return the cache key of a `GET` request or `None` if it is not cacheable"""
+        if self.ttl(path) <= 0:
+            return None
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        return (path, repr(params), request_details, settings.access_key)
+
+class ResponseCache(BaseCache):
+    """A thread-safe LRU cache of `GET` responses with per-resource-type TTLs
+
+    :param size: The maximum number of responses to keep
+    :type size: int.
+    :param ttls: TTLs in seconds keyed by resource type, merged over :data:`DEFAULT_TTLS`
+    :type ttls: dict.
+    :param default_ttl: TTL for resource types not in `ttls`. `0` disables caching them.
+    :type default_ttl: int.
+    """
+
+    def __init__(self, size=1000, ttls=None, default_ttl=0):
+        BaseCache.__init__(self, ttls, default_ttl)
+        self.size = size
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """Return the unexpired response cached under `key` or `None`"""
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is None or entry[0] < time.time():
+                self.misses += 1
+                return None
+            self.__entries[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response):
+        """Cache `response` under `key`, evicting the least recently used entries"""
+        expires = time.time() + self.ttl(key[0])
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = (expires, response)
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, path):
+        """Drop every cached response of the resource type of `path`"""
+        rtype = resource_type(path)
+        with self.__lock:
+            for key in self.__entries.keys():
+                if resource_type(key[0]) == rtype:
+                    del self.__entries[key]
+                    self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached response"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """Return the hit, miss, eviction and invalidation counters"""
+        with self.__lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'invalidations': self.invalidations,
+                    'entries': len(self.__entries)}
+
+    def __len__(self):
+        return len(self.__entries)
+
+class DiskCache(BaseCache):
+    """A `GET` response cache kept in a sqlite database shared between processes
+
+    Every operation opens its own connection, so the cache may be used from
+    several threads and by several ``dcm-*`` processes at once; sqlite
+    serializes the writers. Errors from the database (a locked or read-only
+    file, for instance) are counted and otherwise ignored so the cache can
+    never make an API call fail.
+
+    :param path: The database file. Defaults to ``responses.db`` in ``ES_CACHE_DIR``
+    :type path: str.
+    :param ttls: TTLs in seconds keyed by resource type, merged over :data:`DISK_TTLS`
+    :type ttls: dict.
+    :param default_ttl: TTL for resource types not in `ttls`. `0` disables caching them.
+    :type default_ttl: int.
+    :param refresh: Ignore cached responses but store fresh ones
+    :type refresh: bool.
+    :param timeout: Seconds to wait for another process holding the database lock
+    :type timeout: int.
+    """
+
+    def __init__(self, path=None, ttls=None, default_ttl=0, refresh=False, timeout=10):
+        BaseCache.__init__(self, ttls, default_ttl, DISK_TTLS)
+        if path is None:
+            path = os.path.join(settings.cache_dir, 'responses.db')
+        self.path = path
+        self.refresh = refresh
+        self.timeout = timeout
+        self.errors = 0
+        self.__lock = threading.Lock()
+        self.__create()
+
+    def __connect(self):
+        import sqlite3
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def __create(self):
+        import sqlite3
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory, 0700)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+        conn = self.__connect()
+        try:
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+            except sqlite3.DatabaseError:
+                pass
+            conn.execute('CREATE TABLE IF NOT EXISTS responses ('
+                         'key TEXT PRIMARY KEY, rtype TEXT, expires REAL, '
+                         'status_code INTEGER, headers TEXT, content BLOB, url TEXT)')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_rtype ON responses (rtype)')
+        finally:
+            conn.close()
+        os.chmod(self.path, 0600)
+
+    def __count(self, counter, n=1):
+        with self.__lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def __execute(self, sql, args=()):
+        conn = self.__connect()
+        try:
+            cursor = conn.execute(sql, args)
+            return cursor.fetchall(), cursor.rowcount
+        finally:
+            conn.close()
+
+    @staticmethod
+    def digest(key):
+        """Return the database key of the cache key `key`"""
+        return hashlib.sha1(repr(key)).hexdigest()
+
+    def get(self, key):
+        """Return the unexpired response cached under `key` or `None`
+
+        Always returns `None` when :attr:`refresh` is set.
+        """
+        import sqlite3
+        if self.refresh:
+            self.__count('misses')
+            return None
+        try:
+            rows, _ = self.__execute('SELECT status_code, headers, content, url FROM responses '
+                                     'WHERE key = ? AND expires >= ?', (self.digest(key), time.time()))
+        except sqlite3.Error:
+            self.__count('errors')
+            return None
+        if not rows:
+            self.__count('misses')
+            return None
+        self.__count('hits')
+        status_code, headers, content, url = rows[0]
+        return CachedResponse(status_code, json.loads(headers), str(content), url)
+
+    def put(self, key, response):
+        """Cache `response` under `key` and drop expired entries"""
+        import sqlite3
+        now = time.time()
+        try:
+            conn = self.__connect()
+            try:
+                conn.execute('DELETE FROM responses WHERE expires < ?', (now,))
+                conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (self.digest(key), resource_type(key[0]), now + self.ttl(key[0]),
+                              response.status_code, json.dumps(response.headers),
+                              sqlite3.Binary(response.content), response.url))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            self.__count('errors')
+
+    def invalidate(self, path):
+        """Drop every cached response of the resource type of `path`"""
+        import sqlite3
+        try:
+            _, count = self.__execute('DELETE FROM responses WHERE rtype = ?', (resource_type(path),))
+        except sqlite3.Error:
+            self.__count('errors')
+        else:
+            self.__count('invalidations', max(count, 0))
+
+    def clear(self):
+        """Drop every cached response"""
+        import sqlite3
+        try:
+            self.__execute('DELETE FROM responses')
+        except sqlite3.Error:
+            self.__count('errors')
+
+    def stats(self):
+        """Return the hit, miss, invalidation and error counters"""
+        with self.__lock:
+            stats = {'hits': self.hits,
+                     'misses': self.misses,
+                     'invalidations': self.invalidations,
+                     'errors': self.errors}
+        stats['entries'] = len(self)
+        return stats
+
+    def __len__(self):
+        import sqlite3
+        try:
+            rows, _ = self.__execute('SELECT COUNT(*) FROM responses')
+        except sqlite3.Error:
+            self.__count('errors')
+            return 0
+        return rows[0][0]
+
+def get_cache():
+    """Return the active :class:`ResponseCache` or `None` if caching is disabled"""
+    global _cache
+    if _cache is None and settings.cache is True:
+        with _lock:
+            if _cache is None:
+                _cache = ResponseCache(size=settings.cache_size)
+    return _cache
+
+def enable(size=None, ttls=None, default_ttl=0):
+    """Enable response caching and return the new :class:`ResponseCache`"""
+    global _cache
+    if size is None:
+        size = settings.cache_size
+    with _lock:
+        _cache = ResponseCache(size=size, ttls=ttls, default_ttl=default_ttl)
+        settings.set_cache('1')
+    return _cache
+
+def disable():
+    """Disable response caching and drop every cached response"""
+    global _cache
+    with _lock:
+        _cache = None
+        settings.set_cache('0')
+
+def get_disk_cache():
+    """Return the active :class:`DiskCache` or `None` if it is disabled"""
+    global _disk_cache
+    if _disk_cache is None and settings.disk_cache is True:
+        with _lock:
+            if _disk_cache is None:
+                _disk_cache = DiskCache()
+    return _disk_cache
+
+def enable_disk(path=None, ttls=None, default_ttl=0, refresh=False):
+    """Enable the on-disk cache and return the new :class:`DiskCache`"""
+    global _disk_cache
+    with _lock:
+        _disk_cache = DiskCache(path=path, ttls=ttls, default_ttl=default_ttl, refresh=refresh)
+        settings.set_disk_cache('1')
+    return _disk_cache
+
+def disable_disk():
+    """Stop using the on-disk cache. Responses already on disk are kept."""
+    global _disk_cache
+    with _lock:
+        _disk_cache = None
+        settings.set_disk_cache('0')
+
+def use_disk_cache(refresh=False):
+    """Enable the on-disk cache for a command line tool unless ``ES_DISK_CACHE=0``
+
+    :param refresh: Ignore cached responses but store fresh ones (``--refresh``)
+    :type refresh: bool.
+    :returns: The :class:`DiskCache` or `None`
+    """
+    import sqlite3
+    if settings.disk_cache is False:
+        return None
+    if _disk_cache is not None:
+        # Already open, e.g. for an earlier command of `dcm batch`, which
+        # may have asked for --refresh when this one did not
+        _disk_cache.refresh = refresh
+        return _disk_cache
+    try:
+        return enable_disk(refresh=refresh)
+    except (OSError, sqlite3.Error):
+        return None
+
+def invalidate_disk(path, db=None):
+    """Drop the responses of the resource type of `path` from the on-disk cache
+
+    Called for every write made while this process does not use the on-disk
+    cache, so that the ``dcm-*`` tools which do never serve what it changed.
+    Does nothing if there is no database yet.
+
+    :param db: The database file. Defaults to ``responses.db`` in ``ES_CACHE_DIR``
+    :type db: str.
+    """
+    import sqlite3
+    if db is None:
+        db = os.path.join(settings.cache_dir, 'responses.db')
+    if not os.path.exists(db):
+        return
+    try:
+        conn = sqlite3.connect(db, timeout=10, isolation_level=None)
+        try:
+            conn.execute('DELETE FROM responses WHERE rtype = ?', (resource_type(path),))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+def get_caches():
+    """Return the active caches, fastest first"""
+    return [c for c in [get_cache(), get_disk_cache()] if c is not None]
@@ -0,0 +1,246 @@
+"""
+mixcoatl.cli
+------------
+
+The ``dcm`` command: every ``dcm-*`` tool as a subcommand of one process.
+
+``dcm list-servers -a`` runs ``dcm-list-servers -a``. Run on its own, each
+tool starts an interpreter, imports :mod:`mixcoatl` and connects to the API
+again. ``dcm shell`` and ``dcm batch`` run any number of tools in one
+process, so they share the connection pool, the response caches and the
+names resolved by :func:`~mixcoatl.directory.get_directory`:
+
+.. code-block:: bash
+
+   $ cat runbook.txt
+   list-servers -g 2001
+   stop-server --filter status=RUNNING --wait
+   list-servers -g 2001 --output csv
+   $ dcm batch -f runbook.txt
+
+Tools are found next to the ``dcm`` script, where ``setup.py`` installs
+them, and then on the `PATH`.
+"""
+import cmd
+import os
+import runpy
+import shlex
+import sys
+
+#: The prefix of the tools run as subcommands
+PREFIX = 'dcm-'
+
+def _directories():
+    here = os.path.dirname(os.path.realpath(sys.argv[0] or '.'))
+    return [here] + os.environ.get('PATH', '').split(os.pathsep)
+
+def find(command, directories=None):
+    """Return the path of the tool behind `command`, e.g. `list-servers`
+
+    :raises: :class:`CLIException` if there is no such tool
+    """
+    if command.startswith(PREFIX):
+        command = command[len(PREFIX):]
+    for directory in directories or _directories():
+        path = os.path.join(directory, PREFIX + command)
+        if os.path.isfile(path):
+            return path
+    raise CLIException('Unknown command: %s' % command)
+
+def commands(directories=None):
+    """Return the sorted names of the subcommands available"""
+    found = set()
+    for directory in directories or _directories():
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if name.startswith(PREFIX) and os.path.isfile(os.path.join(directory, name)):
+                found.add(name[len(PREFIX):])
+    return sorted(found)
+
+def run(argv, directories=None):
+    """Run the tool named by ``argv[0]`` with the arguments ``argv[1:]`` in this process
+
+    The tool runs as ``__main__`` with `sys.argv` set as if it had been run on
+    its own. Its exit status is returned instead of exiting and any other
+    exception is printed.
+
+    :param argv: The command and its arguments, e.g. ``['list-servers', '-a']``
+    :type argv: list.
+    :returns: `int` - The exit status
+    """
+    try:
+        path = find(argv[0], directories)
+    except CLIException as e:
+        sys.stderr.write('%s\n' % e)
+        return 127
+    from mixcoatl import daemon
+    saved = sys.argv, daemon._serving
+    sys.argv = [path] + list(argv[1:])
+    # The tool runs here, not in a daemon it would forward to
+    daemon._serving = True
+    try:
+        if hasattr(runpy, 'run_path'):
+            runpy.run_path(path, run_name='__main__')
+        else:
+            # Python 2.6
+            execfile(path, {'__name__': '__main__', '__file__': path})
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        elif isinstance(e.code, int):
+            return e.code
+        sys.stderr.write('%s\n' % e.code)
+        return 1
+    except KeyboardInterrupt:
+        raise
+    except BaseException as e:
+        sys.stderr.write('%s: %s\n' % (os.path.basename(path), e))
+        return 1
+    finally:
+        sys.argv, daemon._serving = saved
+        sys.stdout.flush()
+    return 0
+
+def split(line):
+    """Return the arguments of a shell or batch line, `None` for blanks and comments"""
+    args = shlex.split(line, comments=True)
+    if len(args) == 0:
+        return None
+    return args
+
+def batch(lines, keep_going=False, echo=False, directories=None):
+    """Run one command per line of `lines`
+
+    :param keep_going: Run the remaining lines after a command fails
+    :type keep_going: bool.
+    :param echo: Print each command to standard error before running it
+    :type echo: bool.
+    :returns: `int` - The exit status of the command that failed, else `0`
+    """
+    status = 0
+    for number, line in enumerate(lines, 1):
+        try:
+            args = split(line)
+        except ValueError as e:
+            sys.stderr.write('line %d: %s\n' % (number, e))
+            code = 2
+        else:
+            if args is None:
+                continue
+            if echo:
+                sys.stderr.write('+ dcm %s\n' % line.strip())
+            code = run(args, directories)
+        if code != 0:
+            status = code
+            if not keep_going:
+                break
+    return status
+
+class Shell(cmd.Cmd):
+    """An interactive prompt running one ``dcm`` subcommand per line"""
+
+    prompt = 'dcm> '
+    intro = 'Type a dcm command without the dcm- prefix, "help" for the list or "exit" to leave.'
+
+    def __init__(self, directories=None, **kwargs):
+        cmd.Cmd.__init__(self, **kwargs)
+        self.directories = directories
+        #: The exit status of the last command
+        self.status = 0
+
+    def emptyline(self):
+        pass
+
+    def default(self, line):
+        try:
+            args = split(line)
+        except ValueError as e:
+            self.stdout.write('%s\n' % e)
+            self.status = 2
+            return
+        if args is not None:
+            self.status = run(args, self.directories)
+
+    def completenames(self, text, *ignored):
+        return [c for c in commands(self.directories) + ['exit', 'help'] if c.startswith(text)]
+
+    def do_help(self, arg):
+        """List the commands, or show the help of one"""
+        if arg:
+            self.default('%s --help' % arg)
+        else:
+            self.columnize(commands(self.directories))
+
+    def do_exit(self, arg):
+        """Leave the shell"""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        self.stdout.write('\n')
+        return True
+
+    def cmdloop(self, intro=None):
+        while True:
+            try:
+                return cmd.Cmd.cmdloop(self, intro)
+            except KeyboardInterrupt:
+                self.stdout.write('\n')
+                intro = ''
+
+USAGE = """usage: dcm COMMAND [ARGS...]
+       dcm shell
+       dcm batch [-f FILE] [--keep-going] [--echo]
+       dcm daemon [--socket SOCKET] [--stop | --status]
+
+Runs the dcm-COMMAND tool, e.g. "dcm list-servers -a". "dcm shell" and
+"dcm batch" run many commands in one process, sharing connections and caches.
+"dcm daemon" keeps such a process running for the dcm-* tools to send their
+commands to.
+"""
+
+def main(argv=None):
+    """The ``dcm`` command
+
+    :returns: `int` - The exit status
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) == 0 or argv[0] in ['-h', '--help', 'help']:
+        if len(argv) > 1:
+            return run([argv[1], '--help'])
+        sys.stdout.write(USAGE)
+        sys.stdout.write('\ncommands:\n')
+        for command in commands():
+            sys.stdout.write('  %s\n' % command)
+        return 0
+    elif argv[0] == 'shell':
+        shell = Shell()
+        shell.cmdloop()
+        return shell.status
+    elif argv[0] == 'daemon':
+        from mixcoatl import daemon
+        return daemon.main(argv[1:])
+    elif argv[0] == 'batch':
+        import argparse
+        parser = argparse.ArgumentParser(prog='dcm batch')
+        parser.add_argument('--file', '-f', default='-',
+                            help='Read one command per line from FILE (default - for stdin)')
+        parser.add_argument('--keep-going', '-k', action='store_true',
+                            help='Run the remaining commands after one fails')
+        parser.add_argument('--echo', '-x', action='store_true',
+                            help='Print each command to stderr before running it')
+        cmd_args = parser.parse_args(argv[1:])
+        if cmd_args.file == '-':
+            return batch(sys.stdin, cmd_args.keep_going, cmd_args.echo)
+        with open(cmd_args.file) as f:
+            return batch(f.readlines(), cmd_args.keep_going, cmd_args.echo)
+    return run(argv)
+
+class CLIException(BaseException):
+    """CLI exception"""
+    pass
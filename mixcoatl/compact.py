@@ -0,0 +1,115 @@
+"""
+mixcoatl.compact
+----------------
+
+Slot-based variants of resource classes for keeping large fleets in memory.
+
+A regular resource keeps its attributes in a per-instance `__dict__`. The
+class returned by :meth:`Resource.compact() <mixcoatl.resource.Resource.compact>`
+behaves the same but:
+
+* stores every attribute in `__slots__`
+* keeps only the status code and URL of its last API call in
+  :attr:`last_request` unless ``ES_DEBUG=1``
+* shares one copy of repeated keys and short strings such as statuses and
+  region or cloud names between all compact resources
+
+>>> CompactServer = Server.compact()
+>>> servers = CompactServer.all()
+>>> servers[0].status
+u'RUNNING'
+
+Most of the memory of a resource is the nested data the API returns, such as
+its `cloud`, `region` or `owning_user`, which both variants keep. What
+compact resources save is the attribute `__dict__` of each instance, about 5%
+on the server fixture of the unit tests: ``python benchmarks/memory.py``
+reports 14383 bytes per regular server and 13646 per compact one. They
+inherit the `__dict__` slot of :class:`~mixcoatl.resource.Resource`, which
+stays empty unless an attribute that is not behind a property of the class
+is set.
+
+Compact resources are not instances of the class they were built from.
+"""
+import threading
+import types
+from mixcoatl.decorators.lazy import lazy_property
+
+#: Strings longer than this are never shared
+MAX_INTERN_LENGTH = 64
+#: The maximum number of distinct strings shared by :func:`intern_value`
+MAX_INTERNED = 100000
+
+_classes = {}
+_strings = {}
+_lock = threading.Lock()
+
+def intern_value(value):
+    """Return `value` with dict keys and short strings replaced by shared copies
+
+    :param value: A value decoded from an API response
+    :returns: An equal value of the same type
+    """
+    if isinstance(value, dict):
+        return dict((intern_value(k), intern_value(v)) for k, v in value.iteritems())
+    elif isinstance(value, list):
+        return [intern_value(v) for v in value]
+    elif isinstance(value, basestring) and len(value) <= MAX_INTERN_LENGTH:
+        key = (type(value), value)
+        shared = _strings.get(key)
+        if shared is not None:
+            return shared
+        if len(_strings) < MAX_INTERNED:
+            return _strings.setdefault(key, value)
+    return value
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_code_names(const))
+    return names
+
+def _functions(value):
+    if isinstance(value, lazy_property):
+        return [value._func, value._sfunc]
+    elif isinstance(value, property):
+        return [value.fget, value.fset, value.fdel]
+    elif isinstance(value, (classmethod, staticmethod)):
+        return [value.__func__]
+    elif isinstance(value, types.FunctionType):
+        return [value]
+    return []
+
+def slots(cls):
+    """Return the attribute names instances of `cls` may set
+
+    These are the attributes behind the properties of `cls` and every
+    private attribute its methods refer to.
+    """
+    prefix = '_%s__' % cls.__name__
+    schema = cls.schema()
+    names = set(['loaded'])
+    for k, v in cls.__dict__.items():
+        if k in schema:
+            names.add(schema.attributes[k])
+        for func in _functions(v):
+            if func is not None:
+                names.update(n for n in _code_names(func.__code__) if n.startswith(prefix))
+    return names
+
+def compact_class(cls):
+    """Return the slot-based variant of resource class `cls`, building it on first use"""
+    compact = _classes.get(cls)
+    if compact is None:
+        with _lock:
+            compact = _classes.get(cls)
+            if compact is None:
+                namespace = dict(cls.__dict__)
+                for k in ['__dict__', '__weakref__', '_schema']:
+                    namespace.pop(k, None)
+                namespace['__slots__'] = tuple(sorted(slots(cls)))
+                namespace['_schema'] = cls.schema()
+                namespace['COMPACT'] = True
+                compact = type('Compact' + cls.__name__, cls.__bases__, namespace)
+                _classes[cls] = compact
+    return compact
@@ -1,4 +1,4 @@
-import os, datetime
+import os, datetime, threading
 
 from mixcoatl.exceptions import ConfigException
 
@@ -9,6 +9,19 @@ def validate(date_text):
     except ValueError:
         raise ValueError("Incorrect data format, should be YYYY-MM-DD")
 
+def default_cache_dir():
+    """Return the cache directory named by the environment"""
+    if 'ES_CACHE_DIR' in os.environ:
+        return os.path.expanduser(os.environ['ES_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME', os.path.join('~', '.cache'))
+    return os.path.expanduser(os.path.join(base, 'mixcoatl'))
+
+def default_daemon_socket():
+    """Return the daemon socket named by the environment"""
+    if 'ES_DAEMON_SOCKET' in os.environ:
+        return os.path.expanduser(os.environ['ES_DAEMON_SOCKET'])
+    return os.path.join(default_cache_dir(), 'dcm.sock')
+
 class Config(object):
     # pylint: disable-msg=E0710
     def __init__(self):
@@ -20,6 +33,20 @@ class Config(object):
         self.basepath = None
         self.default_api_version = '2012-06-15'
         self.ssl_verify = None
+        self.pool_size = None
+        self.keep_alive = None
+        self.cache = None
+        self.cache_size = None
+        self.disk_cache = None
+        self.cache_dir = None
+        self.daemon_socket = None
+        self.debug = None
+        self.retries = None
+        self.retry_backoff = None
+        self.rate_limit = None
+        self.rate_burst = None
+        self.rate_limits = None
+        self.rate_limit_shared = None
 
     def configure(self):
         if self.access_key is None:
@@ -60,6 +87,83 @@ class Config(object):
             else:
                 self.set_ssl_verify('1')
 
+        if self.pool_size is None:
+            if 'ES_POOL_SIZE' in os.environ:
+                self.set_pool_size(os.environ['ES_POOL_SIZE'])
+            else:
+                self.set_pool_size(10)
+
+        if self.keep_alive is None:
+            if 'ES_KEEP_ALIVE' in os.environ:
+                self.set_keep_alive(os.environ['ES_KEEP_ALIVE'])
+            else:
+                self.set_keep_alive('1')
+
+        if self.cache is None:
+            if 'ES_CACHE' in os.environ:
+                self.set_cache(os.environ['ES_CACHE'])
+            else:
+                self.set_cache('0')
+
+        if self.cache_size is None:
+            if 'ES_CACHE_SIZE' in os.environ:
+                self.set_cache_size(os.environ['ES_CACHE_SIZE'])
+            else:
+                self.set_cache_size(1000)
+
+        if self.disk_cache is None:
+            if 'ES_DISK_CACHE' in os.environ:
+                self.set_disk_cache(os.environ['ES_DISK_CACHE'])
+
+        if self.cache_dir is None:
+            self.set_cache_dir(default_cache_dir())
+
+        if self.daemon_socket is None:
+            if 'ES_DAEMON_SOCKET' in os.environ:
+                self.set_daemon_socket(os.environ['ES_DAEMON_SOCKET'])
+            else:
+                self.set_daemon_socket(os.path.join(self.cache_dir, 'dcm.sock'))
+
+        if self.debug is None:
+            if 'ES_DEBUG' in os.environ:
+                self.set_debug(os.environ['ES_DEBUG'])
+            else:
+                self.set_debug('0')
+
+        if self.retries is None:
+            if 'ES_RETRIES' in os.environ:
+                self.set_retries(os.environ['ES_RETRIES'])
+            else:
+                self.set_retries(3)
+
+        if self.retry_backoff is None:
+            if 'ES_RETRY_BACKOFF' in os.environ:
+                self.set_retry_backoff(os.environ['ES_RETRY_BACKOFF'])
+            else:
+                self.set_retry_backoff(0.5)
+
+        if self.rate_limit is None:
+            if 'ES_RATE_LIMIT' in os.environ:
+                self.set_rate_limit(os.environ['ES_RATE_LIMIT'])
+            else:
+                self.set_rate_limit(0)
+
+        if self.rate_burst is None:
+            if 'ES_RATE_BURST' in os.environ:
+                self.set_rate_burst(os.environ['ES_RATE_BURST'])
+
+        if self.rate_limits is None:
+            if 'ES_RATE_LIMITS' in os.environ:
+                self.set_rate_limits(os.environ['ES_RATE_LIMITS'])
+            else:
+                self.set_rate_limits({})
+
+        if self.rate_limit_shared is None:
+            if 'ES_RATE_LIMIT_SHARED' in os.environ:
+                self.set_rate_limit_shared(os.environ['ES_RATE_LIMIT_SHARED'])
+            else:
+                self.set_rate_limit_shared('0')
+
     def set_access_key(self, key):
         self.access_key = key
 
@@ -80,3 +184,112 @@ class Config(object):
             self.ssl_verify = False
         else:
             self.ssl_verify = True
+
+    def set_pool_size(self, size):
+        self.pool_size = int(size)
+
+    def set_keep_alive(self, keep_alive):
+        if keep_alive in ['0', False]:
+            self.keep_alive = False
+        else:
+            self.keep_alive = True
+
+    def set_cache(self, cache):
+        if cache in ['1', True]:
+            self.cache = True
+        else:
+            self.cache = False
+
+    def set_cache_size(self, size):
+        self.cache_size = int(size)
+
+    def set_disk_cache(self, disk_cache):
+        if disk_cache in ['1', True]:
+            self.disk_cache = True
+        elif disk_cache in ['0', False]:
+            self.disk_cache = False
+        else:
+            self.disk_cache = None
+
+    def set_cache_dir(self, cache_dir):
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def set_daemon_socket(self, path):
+        self.daemon_socket = os.path.expanduser(path)
+
+    def set_debug(self, debug):
+        if debug in ['1', True]:
+            self.debug = True
+        else:
+            self.debug = False
+
+    def set_retries(self, retries):
+        self.retries = int(retries)
+
+    def set_retry_backoff(self, backoff):
+        self.retry_backoff = float(backoff)
+
+    def set_rate_limit(self, rate):
+        self.rate_limit = float(rate)
+
+    def set_rate_burst(self, burst):
+        self.rate_burst = float(burst)
+
+    def set_rate_limits(self, limits):
+        """Set per resource type limits from a `dict` or a string such as
+        ``infrastructure/Server=2,admin/Job=5:10`` (rate and optional burst)"""
+        if isinstance(limits, basestring):
+            parsed = {}
+            for limit in limits.split(','):
+                if limit.strip() == '':
+                    continue
+                try:
+                    rtype, value = limit.split('=')
+                    value = [float(x) for x in value.split(':')]
+                except ValueError:
+                    raise ConfigException('invalid ES_RATE_LIMITS entry: %s' % limit)
+                parsed[rtype.strip()] = tuple(value)
+            limits = parsed
+        self.rate_limits = limits
+
+    def set_rate_limit_shared(self, shared):
+        if shared in ['1', True]:
+            self.rate_limit_shared = True
+        else:
+            self.rate_limit_shared = False
+
+class LazyConfig(object):
+    """A :class:`Config` that reads the environment the first time a setting is read
+
+    Importing a resource module therefore costs no configuration, and a
+    missing ``ES_ACCESS_KEY`` raises :class:`ConfigException` on the first
+    request rather than on import. Settings given with the ``set_*`` methods
+    beforehand take precedence over the environment, as with
+    :meth:`Config.configure`.
+    """
+
+    def __init__(self):
+        object.__setattr__(self, '_config', Config())
+        object.__setattr__(self, '_configured', False)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def configure(self):
+        with self._lock:
+            self._config.configure()
+            object.__setattr__(self, '_configured', True)
+
+    def __getattr__(self, name):
+        value = getattr(self._config, name)
+        if callable(value) or self._configured:
+            return value
+        with self._lock:
+            if not self._configured:
+                self._config.configure()
+                object.__setattr__(self, '_configured', True)
+        return getattr(self._config, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._config, name, value)
+
+    def __delattr__(self, name):
+        delattr(self._config, name)
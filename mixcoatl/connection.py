@@ -0,0 +1,68 @@
+"""
+mixcoatl.connection
+-------------------
+
+Pooled, keep-alive HTTP sessions shared by every API call.
+
+Each thread gets its own :class:`requests.Session` so connections to the
+enStratus endpoint are reused between calls instead of paying a new TCP/TLS
+handshake every time. The pool size and keep-alive behavior are controlled
+by ``ES_POOL_SIZE`` and ``ES_KEEP_ALIVE``.
+"""
+import threading
+import weakref
+from mixcoatl.settings.load_settings import settings
+
+_local = threading.local()
+_sessions = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+def get_session():
+    """Return the pooled :class:`requests.Session` for the current thread
+
+    The session is created on first use and reused for every subsequent call
+    made from the same thread.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = new_session()
+        _local.session = session
+        with _lock:
+            _sessions[id(session)] = session
+    return session
+
+def new_session():
+    """Return a new :class:`requests.Session` configured from `settings`"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    for prefix in ['http://', 'https://']:
+        session.mount(prefix, HTTPAdapter(pool_connections=settings.pool_size,
+                                          pool_maxsize=settings.pool_size))
+    if settings.keep_alive is False:
+        session.headers['Connection'] = 'close'
+    return session
+
+def close_session():
+    """Close the pooled session of the current thread, if any"""
+    session = getattr(_local, 'session', None)
+    if session is not None:
+        _local.session = None
+        with _lock:
+            _sessions.pop(id(session), None)
+        session.close()
+
+def close_all():
+    """Close every pooled session opened by any thread
+
+    Threads that make further calls afterwards will transparently open a
+    new session.
+    """
+    global _local
+    with _lock:
+        sessions = _sessions.values()
+        _sessions.clear()
+        _local = threading.local()
+    for session in sessions:
+        session.close()
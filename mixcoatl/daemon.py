@@ -0,0 +1,346 @@
+"""
+mixcoatl.daemon
+---------------
+
+Run the ``dcm-*`` tools in a long-lived process.
+
+``dcm daemon`` listens on a Unix socket (``ES_DAEMON_SOCKET``, by default
+``dcm.sock`` in ``ES_CACHE_DIR``) and runs the commands sent to it with
+:func:`mixcoatl.cli.run`. It keeps its connection pool, response caches,
+:class:`~mixcoatl.directory.Directory` and
+:class:`~mixcoatl.watch.JobWatcher` between commands, so a command costs
+little more than its API calls.
+
+Each ``dcm-*`` tool calls :func:`forward` before anything else. When a
+daemon is listening, the command is sent to it and its output and exit
+status are relayed; otherwise :func:`forward` returns and the tool runs as
+usual. A daemon only serves clients with the same endpoint, API keys, cache,
+retry and rate limit settings (see :data:`SETTINGS`). Tools reading standard
+input (an argument of ``-``) always run on their own, as do the tools run
+by ``dcm shell`` and ``dcm batch``.
+
+Commands are run one at a time, since they share the standard streams of
+the daemon.
+
+.. code-block:: bash
+
+   $ dcm daemon &
+   $ dcm-describe-server 331810
+   $ dcm daemon --stop
+"""
+import os
+import sys
+
+# socket, hashlib and json are imported where they are used, so that
+# forward() costs next to nothing when no daemon is listening
+
+#: Set while the tools run inside this process, i.e. in the daemon or in
+#: ``dcm shell`` and ``dcm batch``, where they must not forward
+_serving = False
+
+#: The settings a command must run with for the daemon to run it. Commands
+#: with other settings run on their own.
+SETTINGS = ['endpoint', 'api_version', 'basepath', 'access_key', 'secret_key', 'ssl_verify',
+            'cache', 'disk_cache', 'debug', 'retries', 'retry_backoff', 'rate_limit',
+            'rate_burst', 'rate_limits', 'rate_limit_shared']
+
+#: Seconds a client waits to connect before running the command itself
+CONNECT_TIMEOUT = 0.5
+
+#: How often, in seconds, the daemon checks whether it should stop
+POLL_INTERVAL = 0.5
+
+def _settings():
+    from mixcoatl.settings.load_settings import settings
+    return settings
+
+def socket_path():
+    """Return the path of the daemon socket"""
+    return _settings().daemon_socket
+
+def fingerprint():
+    """Return a digest of the :data:`SETTINGS` commands are run with"""
+    import hashlib
+    s = _settings()
+    parts = []
+    for name in SETTINGS:
+        value = getattr(s, name)
+        if isinstance(value, dict):
+            value = sorted(value.items())
+        parts.append(repr(value))
+    return hashlib.sha1('\n'.join(parts)).hexdigest()
+
+def _connect(path):
+    import socket
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT)
+    try:
+        client.connect(path)
+    except socket.error:
+        client.close()
+        raise
+    client.settimeout(None)
+    return client
+
+def _send(client, message):
+    from mixcoatl.utils import json
+    client.sendall(json.dumps(message) + '\n')
+
+def request(message, path=None, out=None, err=None):
+    """Send `message` to the daemon and relay its output to `out` and `err`
+
+    :returns: `dict` - The last message of the daemon, with the `exit` status
+    :raises: :class:`socket.error` if no daemon is listening
+    """
+    from mixcoatl.utils import json
+    out = out or sys.stdout
+    err = err or sys.stderr
+    client = _connect(path or socket_path())
+    try:
+        _send(client, message)
+        reply = {'exit': None, 'error': 'The daemon closed the connection'}
+        # readline() rather than iterating, which reads ahead and would hold
+        # back the output of the command until a buffer fills
+        replies = client.makefile('rb')
+        while True:
+            line = replies.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            if 'out' in reply:
+                out.write(reply['out'].encode('utf-8'))
+                out.flush()
+            elif 'err' in reply:
+                err.write(reply['err'].encode('utf-8'))
+                err.flush()
+            else:
+                break
+        return reply
+    finally:
+        client.close()
+
+def call(argv, path=None, out=None, err=None):
+    """Run the command `argv` in the daemon
+
+    :param argv: The tool and its arguments, e.g. ``['dcm-check-job', '339452']``
+    :type argv: list.
+    :returns: `int` - The exit status, or `None` if the daemon cannot run it
+    """
+    if '-' in argv[1:]:
+        return None
+    path = path or socket_path()
+    if not path or not os.path.exists(path):
+        return None
+    import socket
+    message = {'argv': list(argv), 'cwd': os.getcwd(), 'key': fingerprint()}
+    try:
+        reply = request(message, path, out, err)
+    except socket.error:
+        return None
+    return reply.get('exit')
+
+def forward():
+    """Run the current ``dcm-*`` tool in the daemon, if one is listening, and exit
+
+    Returns without doing anything in the daemon itself, in ``dcm shell`` and
+    ``dcm batch``, or when there is no daemon to run the tool. The socket is
+    looked up from the environment alone, so that a tool run without a daemon
+    does not read its settings here.
+    """
+    if _serving:
+        return
+    from mixcoatl.config import default_daemon_socket
+    path = default_daemon_socket()
+    if not os.path.exists(path):
+        return
+    try:
+        code = call([os.path.basename(sys.argv[0])] + sys.argv[1:], path)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException:
+        # Whatever the reason, the tool can still run on its own
+        return
+    if code is not None:
+        sys.exit(code)
+
+class _Stream(object):
+    """A standard stream writing to a client of the daemon"""
+
+    def __init__(self, connection, name):
+        self.connection = connection
+        self.name = name
+        self.softspace = 0
+        self.encoding = 'utf-8'
+
+    def write(self, text):
+        if isinstance(text, str):
+            text = text.decode('utf-8', 'replace')
+        if text:
+            _send(self.connection, {self.name: text})
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class Daemon(object):
+    """Serve ``dcm-*`` commands on the Unix socket `path`
+
+    :param path: The socket. Defaults to :func:`socket_path`.
+    :type path: str.
+    :param directories: Where to find the tools, see :func:`mixcoatl.cli.find`
+    :type directories: list.
+    """
+
+    def __init__(self, path=None, directories=None):
+        self.path = path or socket_path()
+        self.directories = directories
+        #: The number of commands run so far
+        self.commands = 0
+        self.__server = None
+        self.__bound = False
+
+    def __handle(self, connection):
+        from mixcoatl import cli
+        from StringIO import StringIO
+        from mixcoatl.utils import json
+        message = json.loads(connection.makefile('rb').readline())
+        if message.get('command') == 'stop':
+            _send(connection, {'exit': 0})
+            self.stop()
+            return
+        elif message.get('command') == 'ping':
+            _send(connection, {'exit': 0, 'pid': os.getpid(), 'commands': self.commands})
+            return
+        elif message.get('key') != fingerprint():
+            _send(connection, {'exit': None, 'error': 'The daemon runs with other settings'})
+            return
+        streams = sys.stdin, sys.stdout, sys.stderr
+        cwd = os.getcwd()
+        try:
+            sys.stdin = StringIO()
+            sys.stdout = _Stream(connection, 'out')
+            sys.stderr = _Stream(connection, 'err')
+            os.chdir(message.get('cwd') or cwd)
+            self.commands += 1
+            code = cli.run(message['argv'], self.directories)
+        finally:
+            os.chdir(cwd)
+            sys.stdin, sys.stdout, sys.stderr = streams
+        _send(connection, {'exit': code})
+
+    def bind(self):
+        """Listen on the socket, replacing a stale one
+
+        :raises: :class:`DaemonException` if a daemon is already listening
+        """
+        import socket
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, 0700)
+        if os.path.exists(self.path):
+            try:
+                _connect(self.path).close()
+            except socket.error:
+                os.unlink(self.path)
+            else:
+                raise DaemonException('A daemon is already listening on %s' % self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0177)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(umask)
+        server.listen(16)
+        server.settimeout(POLL_INTERVAL)
+        self.__server = server
+        self.__bound = True
+
+    def serve(self):
+        """Serve commands until :meth:`stop` is called, binding the socket first if needed"""
+        global _serving
+        import socket
+        if not self.__bound:
+            self.bind()
+        _serving = True
+        try:
+            while True:
+                server = self.__server
+                if server is None:
+                    break
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    continue
+                except socket.error:
+                    if self.__server is None:
+                        break
+                    raise
+                connection.settimeout(None)
+                try:
+                    self.__handle(connection)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except BaseException:
+                    # The client went away; the daemon carries on
+                    pass
+                finally:
+                    connection.close()
+        finally:
+            _serving = False
+            self.stop()
+
+    def stop(self):
+        """Stop serving and remove the socket"""
+        server, self.__server = self.__server, None
+        if server is not None:
+            server.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+def main(argv):
+    """The ``dcm daemon`` command
+
+    :returns: `int` - The exit status
+    """
+    import argparse
+    import socket
+    parser = argparse.ArgumentParser(prog='dcm daemon')
+    parser.add_argument('--socket', help='The Unix socket to listen on (default ES_DAEMON_SOCKET)')
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument('--stop', action='store_true', help='Stop the daemon listening on the socket')
+    actions.add_argument('--status', action='store_true', help='Report whether a daemon is listening')
+    cmd_args = parser.parse_args(argv)
+    path = cmd_args.socket or socket_path()
+    if cmd_args.stop or cmd_args.status:
+        try:
+            reply = request({'command': 'stop' if cmd_args.stop else 'ping'}, path)
+        except socket.error:
+            sys.stderr.write('No daemon is listening on %s\n' % path)
+            return 1
+        if cmd_args.status:
+            sys.stdout.write('Daemon %(pid)s has run %(commands)s commands\n' % reply)
+        return 0
+    daemon = Daemon(path)
+    try:
+        daemon.bind()
+    except DaemonException as e:
+        sys.stderr.write('%s\n' % e)
+        return 1
+    sys.stderr.write('Listening on %s\n' % path)
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+class DaemonException(BaseException):
+    """Daemon exception"""
+    pass
@@ -33,12 +33,9 @@ class lazy_property(object):
         if self._func is None:
             raise AttributeError, "unknown attribute %s" % myname
         # Check if we've already loaded from API
-        if 'loaded' in instance.__dict__:
-            if myname in dir(instance):
-                return self._func(instance)
-            else:
-                raise AttributeError, "unknown attribute %s" % myname
-        elif myname in instance.__dict__:
+        if getattr(instance, 'loaded', False):
+            return self._func(instance)
+        elif not instance.COMPACT and myname in instance.__dict__:
             return self._func(instance)
         else:
             if getattr(instance, instance.PRIMARY_KEY) is not None:
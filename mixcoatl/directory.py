@@ -0,0 +1,139 @@
+"""
+mixcoatl.directory
+------------------
+
+Look up the ids of groups, budgets, users and regions by name.
+
+A :class:`Directory` lists each kind of resource once and indexes it by
+name, so any number of lookups cost a single API call per kind. The indexes
+are listed again once they are older than `ttl` seconds.
+
+>>> from mixcoatl.directory import get_directory
+>>> directory = get_directory()
+>>> directory.group_id('Admin')
+9465
+>>> directory.user(email='jdoe@example.com').account_user_id
+16898
+
+:func:`get_directory` returns the directory shared by
+:mod:`mixcoatl.resource_utils`.
+"""
+import threading
+import time
+from mixcoatl import query
+
+#: The default seconds before an index is listed again
+TTL = 300
+
+_directory = None
+_lock = threading.Lock()
+
+def _groups():
+    from mixcoatl.admin.group import Group
+    return Group.all(detail='basic')
+
+def _budgets():
+    from mixcoatl.admin.billing_code import BillingCode
+    return BillingCode.all(detail='basic')
+
+def _users():
+    from mixcoatl.admin.user import User
+    return User.all()
+
+def _regions():
+    from mixcoatl.geography.region import Region
+    return Region.all(detail='basic')
+
+#: The listing and the fields indexed for each kind of resource
+KINDS = {'group': (_groups, ['name']),
+         'budget': (_budgets, ['name', 'billing_code_id']),
+         'user': (_users, ['email', 'vm_login_id']),
+         'region': (_regions, ['provider_id'])}
+
+class Directory(object):
+    """Indexes of resources by name, listed once per `ttl` seconds
+
+    :param ttl: The seconds before an index is listed again
+    :type ttl: float.
+    """
+
+    def __init__(self, ttl=TTL):
+        self.ttl = ttl
+        #: The number of listings made so far
+        self.listings = 0
+        self.__indexes = {}
+        self.__lock = threading.Lock()
+
+    def refresh(self, kind=None):
+        """Drop the index of `kind`, or of every kind, so the next lookup lists it again"""
+        with self.__lock:
+            if kind is None:
+                self.__indexes.clear()
+            else:
+                self.__indexes.pop(kind, None)
+
+    def index(self, kind, field):
+        """Return the resources of `kind` keyed by `field`, listing them if needed
+
+        :param kind: One of :data:`KINDS`
+        :type kind: str.
+        :returns: `dict`
+        """
+        with self.__lock:
+            entry = self.__indexes.get(kind)
+            if entry is None or time.time() - entry[0] >= self.ttl:
+                listing, fields = KINDS[kind]
+                indexes = dict((f, {}) for f in fields)
+                for resource in listing():
+                    for f in fields:
+                        for value in query.values(resource, f):
+                            indexes[f][value] = resource
+                self.listings += 1
+                entry = (time.time(), indexes)
+                self.__indexes[kind] = entry
+        return entry[1][field]
+
+    def lookup(self, kind, field, value):
+        """Return the resource of `kind` whose `field` is `value`
+
+        :raises: :class:`DirectoryException` if there is none
+        """
+        resource = self.index(kind, field).get(value)
+        if resource is None:
+            raise DirectoryException('No %s with %s %s' % (kind, field, value))
+        return resource
+
+    def group_id(self, name):
+        """Return the id of the group called `name`"""
+        return self.lookup('group', 'name', name).group_id
+
+    def budget_id(self, name):
+        """Return the id of the budget (billing code) called `name`"""
+        return self.lookup('budget', 'name', name).billing_code_id
+
+    def budget_name(self, budget_id):
+        """Return the name of the budget (billing code) with `budget_id`"""
+        return self.lookup('budget', 'billing_code_id', int(budget_id)).name
+
+    def region_id(self, provider_id):
+        """Return the id of the region with `provider_id`, such as `us-east-1`"""
+        return self.lookup('region', 'provider_id', provider_id).region_id
+
+    def user(self, email=None, vm_login_id=None):
+        """Return the :class:`~mixcoatl.admin.user.User` with `vm_login_id` or `email`"""
+        if vm_login_id is not None:
+            return self.lookup('user', 'vm_login_id', vm_login_id)
+        return self.lookup('user', 'email', email)
+
+def get_directory():
+    """Return the shared :class:`Directory`"""
+    global _directory
+    if _directory is None:
+        with _lock:
+            if _directory is None:
+                _directory = Directory()
+    return _directory
+
+class DirectoryException(BaseException):
+    """Directory lookup exception"""
+    pass
@@ -0,0 +1,176 @@
+"""
+mixcoatl.export
+---------------
+
+Stream resources out as NDJSON, JSON, CSV or TSV.
+
+Each resource is converted with :meth:`~mixcoatl.resource.Resource.to_dict`
+and written as soon as it is produced, so exporting a large inventory never
+builds the whole document in memory. `resources` may be any iterable,
+including a generator.
+
+>>> from mixcoatl import export
+>>> export.export(Server.all(), sys.stdout, 'csv', fields=['server_id', 'name', 'status'])
+server_id,name,status
+331810,web-1,RUNNING
+
+Nested values are written as JSON in CSV cells. :func:`write_rows` writes
+rows that are already dicts, such as the columns of the ``dcm-list-*`` tools.
+"""
+import csv
+import itertools
+from mixcoatl.utils import json
+
+#: The supported output formats
+FORMATS = ['ndjson', 'json', 'csv', 'tsv']
+
+def _peek(resources):
+    """Return the first resource and an iterator over all of them"""
+    it = iter(resources)
+    try:
+        first = it.next()
+    except StopIteration:
+        return None, iter([])
+    return first, itertools.chain([first], it)
+
+def default_fields(resource):
+    """Return the fields exported for `resource` when none are given
+
+    These are the properties read from the API, primary key first.
+    """
+    return resource.schema().fields
+
+def iter_dicts(resources, fields=None):
+    """Yield the `dict` of each resource, limited to `fields`"""
+    for resource in resources:
+        if fields is None:
+            yield resource.to_dict(default_fields(resource))
+        else:
+            yield resource.to_dict(fields)
+
+def _ndjson(dicts, out, flush=False):
+    count = 0
+    for d in dicts:
+        out.write(json.dumps(d, sort_keys=True))
+        out.write('\n')
+        if flush:
+            out.flush()
+        count += 1
+    return count
+
+def _json(dicts, out, indent=None):
+    count = 0
+    out.write('[')
+    for d in dicts:
+        if count > 0:
+            out.write(',')
+        out.write('\n')
+        out.write(json.dumps(d, sort_keys=True, indent=indent))
+        count += 1
+    out.write('\n]\n')
+    return count
+
+def _csv(dicts, out, fields, header=True, delimiter=',', flush=False):
+    writer = csv.writer(out, delimiter=delimiter, lineterminator='\n')
+    if header:
+        writer.writerow(fields)
+    count = 0
+    for d in dicts:
+        writer.writerow([_cell(d.get(f)) for f in fields])
+        if flush:
+            out.flush()
+        count += 1
+    return count
+
+def write_ndjson(resources, out, fields=None):
+    """Write one JSON object per line to `out`
+
+    :returns: `int` - The number of resources written
+    """
+    return _ndjson(iter_dicts(resources, fields), out)
+
+def write_json(resources, out, fields=None, indent=None):
+    """Write a JSON array of objects to `out`
+
+    :returns: `int` - The number of resources written
+    """
+    return _json(iter_dicts(resources, fields), out, indent)
+
+def _cell(value):
+    if value is None:
+        return ''
+    elif isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    elif isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+def write_csv(resources, out, fields=None, header=True, delimiter=','):
+    """Write `resources` to `out` as CSV
+
+    :param fields: The columns. Defaults to :func:`default_fields` of the first resource.
+    :type fields: list.
+    :param header: Write the field names as the first row
+    :type header: bool.
+    :param delimiter: The column separator, e.g. ``'\\t'`` for TSV
+    :type delimiter: str.
+    :returns: `int` - The number of resources written
+    """
+    first, resources = _peek(resources)
+    if fields is None:
+        if first is None:
+            return 0
+        fields = default_fields(first)
+    return _csv(iter_dicts(resources, fields), out, fields, header, delimiter)
+
+def write_rows(rows, out, format='ndjson', fields=None, header=True, flush=False):
+    """Write `rows`, an iterable of `dict`, to `out` in `format`
+
+    :param fields: The columns of CSV and TSV. Defaults to the keys of the first row.
+    :type fields: list.
+    :param header: Write the field names as the first row of CSV and TSV
+    :type header: bool.
+    :param flush: Flush `out` after each row, for readers at the other end of a pipe
+    :type flush: bool.
+    :returns: `int` - The number of rows written
+    :raises: :class:`ExportException`
+    """
+    if format == 'ndjson':
+        return _ndjson(rows, out, flush)
+    elif format == 'json':
+        return _json(rows, out)
+    elif format in ['csv', 'tsv']:
+        if fields is None:
+            first, rows = _peek(rows)
+            if first is None:
+                return 0
+            fields = sorted(first.keys())
+        return _csv(rows, out, fields, header, '\t' if format == 'tsv' else ',', flush)
+    else:
+        raise ExportException('Unknown format: %s' % format)
+
+def export(resources, out, format='ndjson', fields=None):
+    """Write `resources` to `out` in `format`
+
+    :param resources: The resources to export
+    :type resources: iterable.
+    :param out: A file-like object to write to
+    :param format: One of :data:`FORMATS`
+    :type format: str.
+    :param fields: Only export these properties
+    :type fields: list.
+    :returns: `int` - The number of resources written
+    :raises: :class:`ExportException`
+    """
+    if format == 'ndjson':
+        return write_ndjson(resources, out, fields)
+    elif format == 'json':
+        return write_json(resources, out, fields)
+    elif format == 'csv':
+        return write_csv(resources, out, fields)
+    elif format == 'tsv':
+        return write_csv(resources, out, fields, delimiter='\t')
+    else:
+        raise ExportException('Unknown format: %s' % format)
+
+class ExportException(BaseException): pass
@@ -0,0 +1,289 @@
+"""
+mixcoatl.futures
+----------------
+
+Futures for API operations that complete in the background.
+
+If the `futures` backport is installed, :class:`Future` is
+:class:`concurrent.futures.Future`. Otherwise it is a compatible
+implementation of the same interface: :meth:`~Future.result`,
+:meth:`~Future.exception`, :meth:`~Future.done`, :meth:`~Future.cancel` and
+:meth:`~Future.add_done_callback`, along with the `set_*` methods used to
+resolve it. :func:`wait` and :func:`as_completed` work with either.
+
+A :class:`JobFuture` is the future of an asynchronous API operation, such as
+launching a server. It is resolved by the shared
+:class:`~mixcoatl.watch.JobWatcher` once the job of the operation completes,
+so hundreds of operations can be in flight without a thread each:
+
+>>> from mixcoatl import futures
+>>> launched = [s.launch(future=True) for s in servers]
+>>> for f in futures.as_completed(launched, timeout=1800):
+...     print f.result().server_id, f.result().status
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+
+try:
+    from logging import NullHandler
+except ImportError:
+    # Python 2.6
+    class NullHandler(logging.Handler):
+        def emit(self, record):
+            pass
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.addHandler(NullHandler())
+
+try:
+    from concurrent.futures import Future, CancelledError, TimeoutError
+    from concurrent.futures import FIRST_COMPLETED, FIRST_EXCEPTION, ALL_COMPLETED
+    from concurrent.futures import wait, as_completed
+except ImportError:
+    import Queue
+
+    FIRST_COMPLETED = 'FIRST_COMPLETED'
+    FIRST_EXCEPTION = 'FIRST_EXCEPTION'
+    ALL_COMPLETED = 'ALL_COMPLETED'
+
+    _PENDING = 'PENDING'
+    _RUNNING = 'RUNNING'
+    _CANCELLED = 'CANCELLED'
+    _FINISHED = 'FINISHED'
+
+    class CancelledError(Exception):
+        """The future was cancelled"""
+
+    class TimeoutError(Exception):
+        """The future did not finish in time"""
+
+    class Future(object):
+        """The result of an operation that finishes in the background"""
+
+        def __init__(self):
+            self._condition = threading.Condition()
+            self._state = _PENDING
+            self._result = None
+            self._exception = None
+            self._done_callbacks = []
+
+        def __repr__(self):
+            return '<Future at %#x state=%s>' % (id(self), self._state.lower())
+
+        def _invoke_callbacks(self):
+            for callback in self._done_callbacks:
+                try:
+                    callback(self)
+                except Exception:
+                    LOGGER.exception('exception calling callback for %r', self)
+
+        def cancel(self):
+            """Cancel the future unless it is running or done. Returns `True` if cancelled."""
+            with self._condition:
+                if self._state in [_RUNNING, _FINISHED]:
+                    return False
+                if self._state == _CANCELLED:
+                    return True
+                self._state = _CANCELLED
+                self._condition.notify_all()
+            self._invoke_callbacks()
+            return True
+
+        def cancelled(self):
+            return self._state == _CANCELLED
+
+        def running(self):
+            return self._state == _RUNNING
+
+        def done(self):
+            return self._state in [_CANCELLED, _FINISHED]
+
+        def __get_result(self):
+            if self._exception is not None:
+                raise self._exception
+            return self._result
+
+        def result(self, timeout=None):
+            """Wait up to `timeout` seconds and return the result of the operation
+
+            :raises: :class:`CancelledError`, :class:`TimeoutError` or the
+                exception of the operation
+            """
+            with self._condition:
+                if self._state == _CANCELLED:
+                    raise CancelledError()
+                elif self._state == _FINISHED:
+                    return self.__get_result()
+                self._condition.wait(timeout)
+                if self._state == _CANCELLED:
+                    raise CancelledError()
+                elif self._state == _FINISHED:
+                    return self.__get_result()
+                raise TimeoutError()
+
+        def exception(self, timeout=None):
+            """Wait up to `timeout` seconds and return the exception of the operation, if any"""
+            with self._condition:
+                if self._state == _CANCELLED:
+                    raise CancelledError()
+                elif self._state == _FINISHED:
+                    return self._exception
+                self._condition.wait(timeout)
+                if self._state == _CANCELLED:
+                    raise CancelledError()
+                elif self._state == _FINISHED:
+                    return self._exception
+                raise TimeoutError()
+
+        def add_done_callback(self, fn):
+            """Call `fn` with the future once it is done, right away if it already is"""
+            with self._condition:
+                if self._state not in [_CANCELLED, _FINISHED]:
+                    self._done_callbacks.append(fn)
+                    return
+            try:
+                fn(self)
+            except Exception:
+                LOGGER.exception('exception calling callback for %r', self)
+
+        def set_running_or_notify_cancel(self):
+            """Mark the future as running. Returns `False` if it was cancelled."""
+            with self._condition:
+                if self._state == _CANCELLED:
+                    return False
+                elif self._state == _PENDING:
+                    self._state = _RUNNING
+                    return True
+                raise RuntimeError('Future in unexpected state')
+
+        def set_result(self, result):
+            with self._condition:
+                self._result = result
+                self._state = _FINISHED
+                self._condition.notify_all()
+            self._invoke_callbacks()
+
+        def set_exception(self, exception):
+            with self._condition:
+                self._exception = exception
+                self._state = _FINISHED
+                self._condition.notify_all()
+            self._invoke_callbacks()
+
+    DoneAndNotDoneFutures = namedtuple('DoneAndNotDoneFutures', 'done not_done')
+
+    def as_completed(fs, timeout=None):
+        """Yield the futures in `fs` as they finish
+
+        :param timeout: Raise :class:`TimeoutError` if futures are still
+            pending after this many seconds
+        :type timeout: float.
+        """
+        fs = set(fs)
+        finished = Queue.Queue()
+        for f in fs:
+            f.add_done_callback(finished.put)
+        if timeout is not None:
+            deadline = time.time() + timeout
+        for n in range(len(fs)):
+            remaining = None
+            if timeout is not None:
+                remaining = deadline - time.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise Queue.Empty()
+                yield finished.get(True, remaining)
+            except Queue.Empty:
+                raise TimeoutError('%d (of %d) futures unfinished' % (len(fs) - n, len(fs)))
+
+    def wait(fs, timeout=None, return_when=ALL_COMPLETED):
+        """Wait for the futures in `fs` to finish
+
+        :param timeout: Stop waiting after this many seconds
+        :type timeout: float.
+        :param return_when: :data:`FIRST_COMPLETED`, :data:`FIRST_EXCEPTION`
+            or :data:`ALL_COMPLETED`
+        :returns: `tuple` of the `set` of finished futures and the `set` of the others
+        """
+        fs = set(fs)
+        try:
+            for f in as_completed(fs, timeout):
+                if return_when == FIRST_COMPLETED:
+                    break
+                elif return_when == FIRST_EXCEPTION and not f.cancelled() and f.exception() is not None:
+                    break
+        except TimeoutError:
+            pass
+        done = set(f for f in fs if f.done())
+        return DoneAndNotDoneFutures(done, fs - done)
+
+class JobFuture(Future):
+    """The future of an API operation that runs as a job
+
+    The job is watched by the shared :class:`~mixcoatl.watch.JobWatcher`.
+    Once it completes the future resolves to `resolve(job)`, or to the final
+    :class:`~mixcoatl.admin.job.Job` without `resolve`. A job that fails sets
+    a :class:`~mixcoatl.admin.job.JobException` instead. Without a job the
+    operation finished right away and the future resolves to `resolve(None)`.
+
+    :param job_id: The job of the operation
+    :type job_id: int.
+    :param resolve: Returns the result of the operation from the final job
+    :type resolve: func.
+    :param status: The status of the job once the operation is done
+    :type status: str.
+    :param watcher: Watch the job with this :class:`~mixcoatl.watch.JobWatcher`
+        instead of the shared one
+    """
+
+    def __init__(self, job_id, resolve=None, status='COMPLETE', watcher=None):
+        Future.__init__(self)
+        self.job_id = job_id
+        self.__resolve = resolve
+        self.__watched = None
+        if job_id is None:
+            self.__finish(None)
+            return
+        if watcher is None:
+            from mixcoatl.watch import get_watcher
+            watcher = get_watcher()
+        self.__watched = watcher.watch(job_id, status)
+        self.__watched.add_done_callback(self.__job_done)
+
+    def __repr__(self):
+        return '<JobFuture at %#x job_id=%s done=%s>' % (id(self), self.job_id, self.done())
+
+    def cancel(self):
+        """Cancel the future and stop watching its job. The operation itself keeps running."""
+        if not Future.cancel(self):
+            return False
+        if self.__watched is not None:
+            self.__watched.cancel()
+        return True
+
+    def __job_done(self, watched):
+        if watched.cancelled():
+            return
+        error = watched.exception()
+        if error is not None:
+            if self.set_running_or_notify_cancel():
+                self.set_exception(error)
+        else:
+            self.__finish(watched.result())
+
+    def __finish(self, job):
+        if not self.set_running_or_notify_cancel():
+            return
+        try:
+            if self.__resolve is None:
+                result = job
+            else:
+                result = self.__resolve(job)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as e:
+            self.set_exception(e)
+        else:
+            self.set_result(result)
@@ -98,7 +98,6 @@ class Cloud(Resource):
         :returns: `list` of :class:`Cloud` or :attr:`cloud_id`
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
         params = {}
 
         if 'public_only' in kwargs:
@@ -106,20 +105,21 @@ class Cloud(Resource):
         if 'status' in kwargs:
             params['status'] = kwargs['status']
 
-        c = r.get(params=params)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        elif keys_only is True:
+            r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
+        c = r.get(params=params, uncameled=not keys_only)
 
         if r.last_error is None:
             if keys_only is True:
                 return [i['cloudId'] for i in c[cls.COLLECTION_NAME]]
             else:
-                clouds = []
-                for i in c[cls.COLLECTION_NAME]:
-                    cloud = cls(i['cloudId'])
-                    if 'detail' in kwargs:
-                        cloud.request_details = kwargs['detail']
+                clouds = cls.from_collection(c, r.request_details)
+                for cloud in clouds:
                     cloud.params = params
-                    cloud.load()
-                    clouds.append(cloud)
                 return clouds
         else:
             return r.last_error
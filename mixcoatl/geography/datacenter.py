@@ -64,20 +64,19 @@ class DataCenter(Resource):
             keys_only = False
 
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
         params = {'regionId':region_id}
-        c = r.get(params=params)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        elif keys_only is True:
+            r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 dcs = [i['dataCenterId'] for i in c[cls.COLLECTION_NAME]]
             else:
-                dcs = []
-                for i in c[cls.COLLECTION_NAME]:
-                    dc = cls(i['dataCenterId'])
-                    if 'detail' in kwargs:
-                        dc.request_details = kwargs['detail']
-                    dc.load()
-                    dcs.append(dc)
+                dcs = cls.from_collection(c, r.request_details)
             return dcs
         else:
             raise DataCenterException(r.last_error)
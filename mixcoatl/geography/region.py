@@ -72,7 +72,6 @@ class Region(Resource):
         :raises: :class:`RegionException`
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
         params = {}
         if 'keys_only' in kwargs:
             keys_only = kwargs['keys_only']
@@ -81,18 +80,18 @@ class Region(Resource):
         for x in ['account_id', 'jurisdiction', 'scope']:
             if x in kwargs:
                 params[camelize(x)] = kwargs[x]
-        c = r.get(params=params)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        elif keys_only is True:
+            r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 regions = [item['regionId'] for item in c[cls.COLLECTION_NAME]]
             else:
-                regions = []
-                for i in c[cls.COLLECTION_NAME]:
-                    region = cls(i['regionId'])
-                    if 'detail' in kwargs:
-                        region.request_details = kwargs['detail']
-                    region.load()
-                    regions.append(region)
+                regions = cls.from_collection(c, r.request_details)
             return regions
         else:
             raise RegionException(r.last_error)
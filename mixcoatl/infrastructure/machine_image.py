@@ -198,7 +198,7 @@ class MachineImage(Resource):
         return self.delete(p, params=qopts)
 
     @required_attrs(['server_id', 'name', 'budget'])
-    def create(self, callback=None):
+    def create(self, callback=None, future=False):
         """Creates a machine image from server_id
 
         >>> def cb(j): print(j)
@@ -208,6 +208,9 @@ class MachineImage(Resource):
         >>> m.budget = 12345
         >>> m.create(callback=cb)
         
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the new machine image instead of the job id
+        :type future: bool.
         :returns: int -- The job id of the create request
         """
 
@@ -221,7 +224,9 @@ class MachineImage(Resource):
 
         self.post(data=json.dumps(payload))
         if self.last_error is None:
-            if callback is not None:
+            if future:
+                return self.job_future(created=True)
+            elif callback is not None:
                 callback(self.current_job)
             else:
                 return self.current_job
@@ -266,11 +271,13 @@ class MachineImage(Resource):
         :type registered: str.
         :param detail: The level of detail to return - `basic` or `extended`
         :type detail: str.
+        :param parallel: Load each image separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :returns: `list` of :class:`MachineImage` or :attr:`machine_image_id`
         :raises: :class:`MachineImageException`
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
         params = {'regionId':region_id}
         if 'keys_only' in kwargs:
             keys_only = kwargs['keys_only']
@@ -280,18 +287,24 @@ class MachineImage(Resource):
             params['active'] = kwargs['active']
         if 'registered' in kwargs:
             params['registered'] = kwargs['registered']
-        c = r.get(params=params)
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+        if 'detail' in kwargs:
+            request_details = kwargs['detail']
+        else:
+            request_details = 'extended'
+        if keys_only is True or parallel is not None:
+            r.request_details = 'basic'
+        else:
+            r.request_details = request_details
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 images = [item['machineImageId'] for item in c[cls.COLLECTION_NAME]]
             else:
-                images = []
-                for i in c[cls.COLLECTION_NAME]:
-                    image = cls(i['machineImageId'])
-                    if 'detail' in kwargs:
-                        image.request_details = kwargs['detail']
-                    image.load()
-                    images.append(image)
+                images = cls.from_collection(c, request_details, parallel)
             return images
         else:
             raise MachineImageException(r.last_error)
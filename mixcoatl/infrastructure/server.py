@@ -1,10 +1,11 @@
 from mixcoatl.resource import Resource
+from mixcoatl import paging
 from mixcoatl.admin.job import Job
 from mixcoatl.utils import camel_keys
 from mixcoatl.decorators.validations import required_attrs
 from mixcoatl.decorators.lazy import lazy_property
 
-import json, sys, time
+import json, sys
 
 class Server(Resource):
     """A server is a virtual machine running within a data center."""
@@ -277,8 +278,15 @@ class Server(Resource):
     def keypair(self, kp):
         self.__keypair = kp
 
-    def reload(self):
-        """Reload resource data from API calls"""
+    def reload(self, future=False):
+        """Reload resource data from API calls
+
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the reloaded server instead of waiting for :attr:`current_job`
+        :type future: bool.
+        """
+        if future:
+            return self.job_future(created=True)
         if self.server_id is not None:
             self.load()
         elif self.current_job is None:
@@ -362,7 +370,7 @@ class Server(Resource):
     # never done it.
     @required_attrs(['provider_product_id', 'machine_image', 'description',
                     'name', 'data_center', 'budget'])
-    def launch(self, callback=None):
+    def launch(self, callback=None, future=False):
         """Launches a server with the configured parameters
 
         >>> def cb(j): print(j)
@@ -377,6 +385,9 @@ class Server(Resource):
 
         :param callback: Optional callback to send the results of the API call
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the launched server instead of the job id
+        :type future: bool.
         :returns: int -- The job id of the launch request
         :raises: :class:`ServerLaunchException`, :class:`mixcoatl.decorators.validations.ValidationException`
         """
@@ -412,7 +423,9 @@ class Server(Resource):
 
         self.post(data=json.dumps(payload))
         if self.last_error is None:
-            if callback is not None:
+            if future:
+                return self.job_future(created=True)
+            elif callback is not None:
                 callback(self.current_job)
             else:
                 return self.current_job
@@ -425,25 +438,27 @@ class Server(Resource):
     def wait_for(self, status='RUNNING', callback = None):
         """Blocks execution until the current server has status of :attr:`status`
 
+        The server is checked by a :class:`~mixcoatl.watch.StatusWaiter`; use
+        one directly to wait on many of them at once.
+
         :param status: The status to expect before continuing *(i.e. `RUNNING` or `PAUSED`)*
         :type status: str.
         :param callback: Optional callback to be called with the final :class:`Server`` when ``status`` is reached
         :type callback: func.
         :raises: `ServerException`
         """
+        from mixcoatl.watch import StatusWaiter
         if self.server_id is None:
             raise ServerException('Must be called with an existing server.')
         initial_status = self.status
         if self.last_error is None:
             if initial_status == status:
                 return self
-            while self.status != status:
-                time.sleep(5)
-                self.load()
-                if self.last_error is not None:
-                    raise ServerException(self.last_error)
-                else:
-                    continue
+            waiter = StatusWaiter([self], status)
+            for resource in waiter:
+                pass
+            if self.server_id in waiter.errors:
+                raise ServerException(waiter.errors[self.server_id])
             if callback is not None:
                 callback(self)
             else:
@@ -456,22 +471,83 @@ class Server(Resource):
         >>> Server.all()
         [{'server_id':1,...},{'server_id':2,...}]
 
+        :param detail: The level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param parallel: Load each server separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
+        :param region_id: Only list servers in `region_id`
+        :type region_id: int.
+        :param data_center_id: Only list servers in `data_center_id`
+        :type data_center_id: int.
         :returns: list -- a list of :class:`Server`
         :raises: ServerException
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
+        if 'detail' in kwargs:
+            request_details = kwargs['detail']
+        else:
+            request_details = 'extended'
+
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+        if parallel is None:
+            r.request_details = request_details
+        else:
+            r.request_details = 'basic'
 
         if 'params' in kwargs:
           params = kwargs['params']
         else:
           params = []
-        s = r.get(params=params)
+        if 'region_id' in kwargs or 'data_center_id' in kwargs:
+            params = dict(params or {})
+            if 'region_id' in kwargs:
+                params['regionId'] = kwargs['region_id']
+            if 'data_center_id' in kwargs:
+                params['dataCenterId'] = kwargs['data_center_id']
+        s = r.get(params=params, uncameled=True)
         if r.last_error is None:
-            servers = [cls(server['serverId']) for server in s[cls.COLLECTION_NAME]]
+            servers = cls.from_collection(s, request_details, parallel)
             return servers
         else:
             raise ServerException(r.last_error)
 
+    @classmethod
+    def iter_all(cls, **kwargs):
+        """Yield servers one at a time as the listing is read
+
+        Unlike :meth:`all`, the listing is parsed incrementally so memory use
+        stays flat however many servers there are.
+
+        >>> for server in Server.iter_all():
+        ...     print server.name
+
+        :param detail: The level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param page_size: The number of resources read ahead at a time
+        :type page_size: int.
+        :param prefetch: The number of pages to read ahead, `0` for none
+        :type prefetch: int.
+        :returns: generator of :class:`Server`
+        :raises: ServerException
+        """
+        r = Resource(cls.PATH)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        else:
+            r.request_details = 'extended'
+
+        if 'params' in kwargs:
+          params = kwargs['params']
+        else:
+          params = []
+        servers = cls.iter_collection(r, params=params, **paging.options(kwargs))
+        if servers is None:
+            raise ServerException(r.last_error)
+        return servers
+
 class ServerException(BaseException): pass
 class ServerLaunchException(ServerException): pass
@@ -101,25 +101,24 @@ class ServerProduct(Resource):
         """
         from mixcoatl.utils import uncamel_keys
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
         params = {'regionId':region_id}
         if 'keys_only' in kwargs:
             keys_only = kwargs['keys_only']
         else:
             keys_only = False
 
-        c = r.get(params=params)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        elif keys_only is True:
+            r.request_details = 'basic'
+        else:
+            r.request_details = 'extended'
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 products = [item['productId'] for item in c[cls.COLLECTION_NAME]]
             else:
-                products = []
-                for i in c[cls.COLLECTION_NAME]:
-                    product = cls(i['productId'])
-                    if 'detail' in kwargs:
-                        product.request_details = kwargs['detail']
-                    product.load()
-                    products.append(product)
+                products = cls.from_collection(c, r.request_details)
             return products
         else:
             raise ServerProductException(r.last_error)
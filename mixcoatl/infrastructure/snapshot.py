@@ -1,5 +1,6 @@
 """Implements access to the enStratus Snapshot API"""
 from mixcoatl.resource import Resource
+from mixcoatl import paging
 from mixcoatl.decorators.lazy import lazy_property
 from mixcoatl.decorators.validations import required_attrs
 from mixcoatl.utils import camel_keys
@@ -191,9 +192,12 @@ class Snapshot(Resource):
                 raise SnapshotException(self.last_error)
 
     @required_attrs(['volume', 'name', 'description', 'budget'])
-    def create(self, callback=None):
+    def create(self, callback=None, future=False):
         """Creates a snapshot
 
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the completed snapshot
+        :type future: bool.
         :returns: :class:`Snapshot`
         :raises: :class:`SnapshotException`
         """
@@ -217,7 +221,9 @@ class Snapshot(Resource):
                 pass
         self.post(self.PATH, data=json.dumps(payload))
         if self.last_error is None:
-            if callback is not None:
+            if future:
+                return self.job_future(created=True)
+            elif callback is not None:
                 callback(self)
             else:
                 return self
@@ -238,11 +244,13 @@ class Snapshot(Resource):
         :type keys_only: bool.
         :param detail: Level of detail to return - `basic` or `extended`
         :type detail: str.
+        :param parallel: Load each snapshot separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :returns: `list` of :attr:`snapshot_id` or :class:`Snapshot`
         :raises: :class:`SnapshotException`
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
         params = {}
         if 'keys_only' in kwargs:
             keys_only = kwargs['keys_only']
@@ -254,22 +262,67 @@ class Snapshot(Resource):
             params['accountId'] = kwargs['account_id']
         if 'volume_id' in kwargs:
             params['volumeId'] = kwargs['volume_id']
-        c = r.get(params=params)
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+        if 'detail' in kwargs:
+            request_details = kwargs['detail']
+        else:
+            request_details = 'extended'
+        if keys_only is True or parallel is not None:
+            r.request_details = 'basic'
+        else:
+            r.request_details = request_details
+        c = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
             if keys_only is True:
                 snapshots = [item['snapshotId'] for item in c[cls.COLLECTION_NAME]]
             else:
-                snapshots = []
-                for i in c[cls.COLLECTION_NAME]:
-                    snapshot = cls(i['snapshotId'])
-                    if 'detail' in kwargs:
-                        snapshot.request_details = kwargs['detail']
-                    snapshot.load()
-                    snapshots.append(snapshot)
+                snapshots = cls.from_collection(c, request_details, parallel)
             return snapshots
         else:
             raise SnapshotException(r.last_error)
 
+    @classmethod
+    def iter_all(cls, **kwargs):
+        """Yield snapshots one at a time as the listing is read
+
+        Unlike :meth:`all`, the listing is parsed incrementally so memory use
+        stays flat however many snapshots there are.
+
+        :param account_id: Restrict to snapshots owned by `account_id`
+        :type account_id: int.
+        :param volume_id: Restrict to snapshots based on `volume_id`
+        :type volume_id: int.
+        :param region_id: Restrict to snapshots in `region_id`
+        :type region_id: int.
+        :param detail: Level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param page_size: The number of resources read ahead at a time
+        :type page_size: int.
+        :param prefetch: The number of pages to read ahead, `0` for none
+        :type prefetch: int.
+        :returns: generator of :class:`Snapshot`
+        :raises: :class:`SnapshotException`
+        """
+        r = Resource(cls.PATH)
+        params = {}
+        if 'region_id' in kwargs:
+            params['regionId'] = kwargs['region_id']
+        if 'account_id' in kwargs:
+            params['accountId'] = kwargs['account_id']
+        if 'volume_id' in kwargs:
+            params['volumeId'] = kwargs['volume_id']
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        else:
+            r.request_details = 'extended'
+        snapshots = cls.iter_collection(r, params=params, **paging.options(kwargs))
+        if snapshots is None:
+            raise SnapshotException(r.last_error)
+        return snapshots
+
     @classmethod
     def describe_snapshot(cls, snapshot_id, **kwargs):
         """Changes the basic metadata for a snapshot
@@ -307,7 +360,7 @@ class Snapshot(Resource):
         return s.destroy(reason=reason)
 
     @classmethod
-    def add_snapshot(cls, volume_id, name, description, budget, callback=None):
+    def add_snapshot(cls, volume_id, name, description, budget, callback=None, future=False):
         """Creates a snapshot from `volume_id`
 
             .. warning::
@@ -326,6 +379,9 @@ class Snapshot(Resource):
         :type budget: int.
         :param callback: An optional callback to send the final :class:`Snapshot`.
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the final :class:`Snapshot` without blocking
+        :type future: bool.
         :returns: :class:`Snapshot`
         :raises: :class:`SnapshotException`
         """
@@ -339,7 +395,9 @@ class Snapshot(Resource):
         if s.current_job is None:
             raise SnapshotException('No job found. This is...odd')
         else:
-            if callback is not None:
+            if future:
+                return s.job_future(created=True)
+            elif callback is not None:
                 job = Job.wait_for(s.current_job)
                 if job is True:
                     try:
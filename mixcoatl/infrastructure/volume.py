@@ -1,5 +1,6 @@
 """Implements the enStratus Volume API"""
 from mixcoatl.resource import Resource
+from mixcoatl import paging
 from mixcoatl.decorators.lazy import lazy_property
 from mixcoatl.decorators.validations import required_attrs
 from mixcoatl.utils import camelize, camel_keys
@@ -173,12 +174,15 @@ class Volume(Resource):
         self.__description = b
 
     @required_attrs(['volume_id'])
-    def attach(self, server_id, device_id=None, callback=None):
+    def attach(self, server_id, device_id=None, callback=None, future=False):
         """Attach a volume to a server
 
         :param server_id: Server to attach the volume
         :type server_id: int.
         :param callback: Optional callback to send the results
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the reloaded volume once it is attached
+        :type future: bool.
         :returns: :class:`Volume`
         :raises: :class:`VolumeException`
         """
@@ -189,27 +193,36 @@ class Volume(Resource):
         if device_id is not None:
             payload['attach'][0]['device_id'] = device_id
 
+        self.current_job = None
         self.put(self.PATH+'/'+str(self.volume_id), data=json.dumps(camel_keys(payload)))
 
         if self.last_error is None:
-            if callback is None:
+            if future:
+                return self.job_future()
+            elif callback is None:
                 return self
             else:
                 callback(self)
         else:
             raise VolumeException(self.last_error)
 
-    def detach(self, callback=None):
+    def detach(self, callback=None, future=False):
         """Detach a volume from a server
 
         :param callback: Optional callback to send the results
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the reloaded volume once it is detached
+        :type future: bool.
         :returns: :class:`Volume`
         :raises: :class:`VolumeException`
         """
         payload = '{"detach":[{}]}'
         path = self.PATH+'/'+str(self.volume_id)
+        self.current_job = None
         s = self.put(path, data=payload)
         if self.last_error is None:
+            if future:
+                return self.job_future()
             self.load()
             if callback is None:
                 return s
@@ -219,11 +232,14 @@ class Volume(Resource):
             raise VolumeException(self.last_error)
 
     @required_attrs(['budget', 'size_in_gb', 'description', 'data_center', 'name'])
-    def create(self, callback=None):
+    def create(self, callback=None, future=False):
         """Creates a new volume
 
         :param callback: Optional callback to send the resulting :class:`Job`
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the created volume instead of the :class:`Job`
+        :type future: bool.
         :returns: :class:`Job`
         :raises: :class:`VolumeCreationException`
         """
@@ -249,6 +265,8 @@ class Volume(Resource):
         payload = {'addVolume':[camel_keys(parms)]}
         self.post(data=json.dumps(payload))
         if self.last_error is None:
+            if future:
+                return self.job_future(created=True)
             j = Job(self.current_job)
             j.load()
             if callback is not None:
@@ -340,6 +358,9 @@ class Volume(Resource):
         :type budget: int.
         :param callback: Optional callback to return the results.
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the completed :class:`Snapshot`
+        :type future: bool.
         :returns: :class:`Snapshot`
         :raises: :class:`VolumeSnapshotException`
         """
@@ -366,7 +387,8 @@ class Volume(Resource):
                                     name,
                                     description,
                                     budget,
-                                    callback=callback)
+                                    callback=callback,
+                                    future=kwargs.get('future', False))
             return s
         except SnapshotException, e:
             raise VolumeSnapshotException(str(e))
@@ -385,6 +407,9 @@ class Volume(Resource):
         :type keys_only: bool.
         :param detail: Level of detail to return - `basic` or `extended`
         :type detail: str.
+        :param parallel: Load each volume separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :returns: `list` of :attr:`volume_id` or :class:`Volume`
         :raises: :class:`VolumeException`
         """
@@ -401,6 +426,11 @@ class Volume(Resource):
         else:
             keys_only = False
 
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+
         if 'datacenter_id' in kwargs:
             params['dataCenterId'] = kwargs['datacenter_id']
         if 'region_id' in kwargs:
@@ -408,23 +438,60 @@ class Volume(Resource):
         if 'account_id' in kwargs:
             params['accountId'] = kwargs['account_id']
 
-        x = r.get(params=params)
+        if keys_only is False and parallel is None:
+            r.request_details = request_details
+
+        x = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
-            keys = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             if keys_only is True:
-                volumes = keys
+                volumes = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             else:
-                volumes = []
-                for i in x[cls.COLLECTION_NAME]:
-                    key = i[camelize(cls.PRIMARY_KEY)]
-                    volume = cls(key)
-                    volume.request_details = request_details
-                    volume.load()
-                    volumes.append(volume)
+                volumes = cls.from_collection(x, request_details, parallel)
             return volumes
         else:
             raise VolumeException(r.last_error)
 
+    @classmethod
+    def iter_all(cls, **kwargs):
+        """Yield volumes one at a time as the listing is read
+
+        Unlike :meth:`all`, the listing is parsed incrementally so memory use
+        stays flat however many volumes there are.
+
+        :param account_id: Restrict to volumes owned by `account_id`
+        :type account_id: int.
+        :param datacenter_id: Restrict to volumes based in `datacenter_id`
+        :type datacenter_id: int.
+        :param region_id: Restrict to volumes in `region_id`
+        :type region_id: int.
+        :param detail: Level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param page_size: The number of resources read ahead at a time
+        :type page_size: int.
+        :param prefetch: The number of pages to read ahead, `0` for none
+        :type prefetch: int.
+        :returns: generator of :class:`Volume`
+        :raises: :class:`VolumeException`
+        """
+        params = {}
+        r = Resource(cls.PATH)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        else:
+            r.request_details = 'extended'
+
+        if 'datacenter_id' in kwargs:
+            params['dataCenterId'] = kwargs['datacenter_id']
+        if 'region_id' in kwargs:
+            params['regionId'] = kwargs['region_id']
+        if 'account_id' in kwargs:
+            params['accountId'] = kwargs['account_id']
+
+        volumes = cls.iter_collection(r, params=params, **paging.options(kwargs))
+        if volumes is None:
+            raise VolumeException(r.last_error)
+        return volumes
+
 def assign_budget(volume_id, budget):
     """Change the budget associated with a volume
 
@@ -0,0 +1,265 @@
+"""
+mixcoatl.listing
+----------------
+
+Tables of resources for the ``dcm-list-*`` tools.
+
+A list tool declares the :class:`Column` objects it renders. :func:`project`
+then makes sure every resource has the fields those columns read before
+they are rendered: resources read from a full listing already do and cost
+nothing more, while those listed with `basic` detail or built from an id
+alone are loaded a page at a time with
+:meth:`~mixcoatl.resource.Resource.load_many`. Cells are read from the
+hydrated data, so rendering never triggers a lazy load.
+
+>>> from mixcoatl import listing
+>>> columns = [listing.Column('Server ID', 'server_id'),
+...            listing.Column('Region', 'region.name'),
+...            listing.Column('Owner', 'owning_user.email')]
+>>> print listing.table(listing.project(Server.all(), columns), columns)
+
+The options added by :func:`add_arguments` are handled by
+:func:`write_from_args`:
+
+* `--fields` replaces the default columns with any fields of the resource,
+  e.g. ``--fields server_id,name,region.name``
+* `--output` writes NDJSON, JSON, CSV or TSV instead of a table. These are
+  written a row at a time as soon as each page of resources is ready, so the
+  first rows of a large account show up at once and memory does not grow
+  with the number of rows. The keys and headers are the field names.
+* `--limit` stops after that many rows, without fetching the fields of the rest
+* `--sort` orders the rows by a column, descending when prefixed with `-`.
+  Sorting has to read every row before writing the first one.
+* `--no-header` leaves out the table or CSV/TSV header
+"""
+import itertools
+import sys
+from mixcoatl import export
+from mixcoatl import paging
+from mixcoatl import query
+
+#: The formats of `--output`
+OUTPUTS = ['table'] + export.FORMATS
+
+class Column(object):
+    """A column of a list tool
+
+    :param title: The heading of the column
+    :type title: str.
+    :param field: The field shown, as understood by :func:`mixcoatl.query.values`,
+        or a `list` of fields of which the first one set is shown
+    :type field: str.
+    :param format: Turns the value into what is shown
+    :type format: func.
+    :param default: Shown when the field is not set
+    :param separator: Joins the values of a field going through a `list`
+    :type separator: str.
+    :param align: The alignment in a table, `l`, `c` or `r`
+    :type align: str.
+    :param key: The name of the column in machine-readable output. Defaults to the first field.
+    :type key: str.
+    """
+
+    def __init__(self, title, field, format=None, default=None, separator=',', align=None, key=None):
+        self.title = title
+        if isinstance(field, (list, tuple)):
+            self.fields = list(field)
+        else:
+            self.fields = [field]
+        self.format = format
+        self.default = default
+        self.separator = separator
+        self.align = align
+        self.key = key or self.fields[0]
+
+    def __repr__(self):
+        return 'Column(%r, %r)' % (self.title, self.fields)
+
+    def value(self, resource):
+        """Return the value of the column for `resource`"""
+        for field in self.fields:
+            found = query.values(resource, field)
+            if len(found) > 0:
+                break
+        else:
+            return self.default
+        if len(found) == 1:
+            value = found[0]
+        else:
+            value = self.separator.join(unicode(v) for v in found)
+        if self.format is not None:
+            value = self.format(value)
+        return value
+
+def parse_fields(text):
+    """Return a :class:`Column` for each field of a comma-separated list"""
+    return [Column(f.strip(), f.strip()) for f in text.split(',') if f.strip() != '']
+
+def _attribute_names(resource, columns):
+    names = set()
+    schema = resource.schema()
+    for column in columns:
+        for field in column.fields:
+            if field in query.FIELDS and field not in schema:
+                field = query.FIELDS[field]
+            name = field.split('.')[0]
+            if name in schema:
+                names.add(schema.attributes[name])
+    return names
+
+def _incomplete(resource, names):
+    if not getattr(resource, 'loaded', False):
+        return True
+    if resource.request_details == 'extended':
+        return False
+    return any(not hasattr(resource, name) for name in names)
+
+def project(resources, columns, workers=10, page_size=paging.PAGE_SIZE):
+    """Yield `resources` once they have every field `columns` read
+
+    Resources missing some of the fields are loaded with `extended` detail,
+    up to `workers` at once for each page of `page_size` resources. Fields
+    the API does not return at all are left unset. Plain `dict` items are
+    yielded as they are.
+
+    :param resources: The resources, usually of one class
+    :type resources: iterable.
+    :param columns: The columns to be rendered
+    :type columns: list.
+    :returns: generator
+    """
+    names = None
+    for page in paging.pages(resources, page_size):
+        if not hasattr(page[0], 'schema'):
+            for item in page:
+                yield item
+            continue
+        if names is None:
+            names = _attribute_names(page[0], columns)
+        incomplete = [r for r in page if _incomplete(r, names)]
+        for resource in incomplete:
+            resource.request_details = 'extended'
+        if len(incomplete) > 0:
+            type(incomplete[0]).load_many(incomplete, workers)
+        for resource in page:
+            yield resource
+
+def rows(resources, columns):
+    """Yield the `list` of cell values of each resource"""
+    for resource in resources:
+        yield [c.value(resource) for c in columns]
+
+def _table(cells, columns, header=True):
+    """Return a :class:`prettytable.PrettyTable` of `cells` and the number of rows"""
+    from prettytable import PrettyTable
+    t = PrettyTable([c.title for c in columns])
+    t.header = header
+    for column in columns:
+        if column.align is not None:
+            t.align[column.title] = column.align
+    count = 0
+    for row in cells:
+        t.add_row(row)
+        count += 1
+    return t, count
+
+def table(resources, columns, header=True):
+    """Return a :class:`prettytable.PrettyTable` of `resources`"""
+    return _table(rows(resources, columns), columns, header)[0]
+
+def _position(columns, name):
+    for position, column in enumerate(columns):
+        if name in [column.key, column.title] + column.fields:
+            return position
+    raise ListingException('Cannot sort by %s, it is not one of the columns' % name)
+
+def write(resources, columns, output='table', limit=None, sort=None, header=True, out=None, workers=10):
+    """Write `resources` to `out` as a table or in one of the formats of :mod:`mixcoatl.export`
+
+    Machine-readable output is written and flushed a row at a time as the
+    resources are projected. A table is printed once every row is ready.
+
+    :param resources: The resources, usually of one class
+    :type resources: iterable.
+    :param columns: The columns to write
+    :type columns: list.
+    :param output: One of :data:`OUTPUTS`
+    :type output: str.
+    :param limit: Write no more than this many rows
+    :type limit: int.
+    :param sort: Order the rows by this column, given by key, title or field,
+        descending when prefixed with `-`
+    :type sort: str.
+    :param header: Write the table or CSV/TSV header
+    :type header: bool.
+    :param out: A file-like object. Defaults to standard output.
+    :param workers: The maximum number of concurrent loads
+    :type workers: int.
+    :returns: `int` - The number of rows written
+    :raises: :class:`ListingException`
+    """
+    if output not in OUTPUTS:
+        raise ListingException('Unknown output: %s' % output)
+    if out is None:
+        out = sys.stdout
+    if sort is not None:
+        position = _position(columns, sort.lstrip('-'))
+    elif limit is not None:
+        resources = itertools.islice(resources, limit)
+    cells = rows(project(resources, columns, workers), columns)
+    if sort is not None:
+        cells = sorted(cells, key=lambda row: row[position], reverse=sort.startswith('-'))
+        if limit is not None:
+            cells = cells[:limit]
+    if output == 'table':
+        t, count = _table(cells, columns, header)
+        out.write('%s\n' % t)
+        return count
+    keys = [c.key for c in columns]
+    return export.write_rows((dict(zip(keys, row)) for row in cells), out, output, keys, header, flush=True)
+
+def add_arguments(parser, sort=None):
+    """Add the `--fields`, `--output`, `--limit`, `--sort` and `--no-header` options to `parser`
+
+    :param sort: The column sorted by when `--sort` is not given, if it is shown
+    :type sort: str.
+    """
+    parser.add_argument('--fields', metavar='FIELDS',
+                        help='Comma-separated fields to show instead of the default columns, '
+                             'e.g. server_id,name,region.name,owning_user.email')
+    parser.add_argument('--output', choices=OUTPUTS, default='table',
+                        help='Output format (default table). Other formats are written a row at a time.')
+    parser.add_argument('--limit', type=int, metavar='N', help='Show at most N rows')
+    parser.add_argument('--sort', metavar='FIELD',
+                        help='Sort the rows by FIELD, or in descending order by -FIELD')
+    parser.add_argument('--no-header', dest='header', action='store_false',
+                        help='Leave out the table or CSV/TSV header')
+    parser.set_defaults(default_sort=sort)
+
+def columns(cmd_args, default):
+    """Return the columns asked for with `--fields`, or `default`"""
+    if getattr(cmd_args, 'fields', None):
+        return parse_fields(cmd_args.fields)
+    return default
+
+def write_from_args(resources, default, cmd_args, out=None):
+    """Write `resources` as asked for by the options of :func:`add_arguments`
+
+    :param default: The columns shown without `--fields`
+    :type default: list.
+    :returns: `int` - The number of rows written
+    """
+    shown = columns(cmd_args, default)
+    sort = cmd_args.sort
+    if sort is None and cmd_args.default_sort is not None:
+        try:
+            _position(shown, cmd_args.default_sort)
+            sort = cmd_args.default_sort
+        except ListingException:
+            pass
+    return write(resources, shown, output=cmd_args.output, limit=cmd_args.limit,
+                 sort=sort, header=cmd_args.header, out=out)
+
+class ListingException(BaseException):
+    """Listing exception"""
+    pass
@@ -139,6 +139,9 @@ class Firewall(Resource):
         :type label: str.
         :param callback: Optional callback to call with resulting :class:`Firewall`
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the created firewall
+        :type future: bool.
         :returns: :class:`Firewall`
         :raises: :class:`FirewallException`
         """
@@ -158,7 +161,9 @@ class Firewall(Resource):
         self.post(self.PATH, data=json.dumps(camel_keys(payload)))
 
         if self.last_error is None:
-            if callback is None:
+            if kwargs.get('future', False):
+                return self.job_future(created=True)
+            elif callback is None:
                 return self
             else:
                 if Job.wait_for(self.current_job) is True:
@@ -185,6 +190,9 @@ class Firewall(Resource):
         :type account_id: int.
         :param detail: Level of detail to return - `basic` or `extended`
         :type detail: str.
+        :param parallel: Load each firewall separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :param keys_only: Return only :attr:`firewall_id` in results
         :type keys_only: bool.
         :returns: `list` of :attr:`firewall_id` or :class:`Firewall`
@@ -205,23 +213,26 @@ class Firewall(Resource):
         else:
             keys_only = False
 
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+
         if 'region_id' in kwargs:
             params['regionId'] = kwargs['region_id']
 
         if 'account_id' in kwargs:
             params['accountId'] = kwargs['account_id']
 
-        x = r.get(params=params)
+        if keys_only is False and parallel is None:
+            r.request_details = request_details
+
+        x = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
-            keys = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             if keys_only is True:
-                firewalls = keys
+                firewalls = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             else:
-                firewalls = []
-                for key in keys:
-                    fw = cls(key, detail=request_details)
-                    fw.load()
-                    firewalls.append(fw)
+                firewalls = cls.from_collection(x, request_details, parallel)
             return firewalls
         else:
             raise FirewallException(r.last_error)
@@ -173,6 +173,9 @@ class FirewallRule(Resource):
         :type firewall_id: int.
         :param detail: Level of detail to return - `basic` or `extended`
         :type detail: str.
+        :param parallel: Load each rule separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :param keys_only: Return only :attr:`firewall_rule_id` in results
         :type keys_only: bool.
         :returns: `list` of :attr:`firewall_rule_id` or :class:`FirewallRule`
@@ -192,20 +195,21 @@ class FirewallRule(Resource):
         else:
             keys_only = False
 
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+
+        if keys_only is False and parallel is None:
+            r.request_details = request_details
+
         params['firewallId'] = firewall_id
-        x = r.get(params=params)
+        x = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
-            keys = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             if keys_only is True:
-                rules = keys
+                rules = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             else:
-                rules = []
-                for i in x[cls.COLLECTION_NAME]:
-                    key = i[camelize(cls.PRIMARY_KEY)]
-                    rule = cls(key)
-                    rule.request_details = request_details
-                    rule.load()
-                    rules.append(rule)
+                rules = cls.from_collection(x, request_details, parallel)
             return rules
         else:
             raise FirewallRuleException(r.last_error)
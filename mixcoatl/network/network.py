@@ -206,6 +206,9 @@ class Network(Resource):
 
         :param callback: Optional callback to call with resulting :class:`Network`
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the created network instead of the :class:`Job`
+        :type future: bool.
         :returns: :class:`Job`
         :raises: :class:`NetworkException`
         """
@@ -233,6 +236,8 @@ class Network(Resource):
         self.post(self.PATH, data=json.dumps(camel_keys(payload)))
 
         if self.last_error is None:
+            if kwargs.get('future', False):
+                return self.job_future(created=True)
             j = Job(self.current_job)
             j.load()
             if callback is not None:
@@ -266,6 +271,9 @@ class Network(Resource):
         :type account_id: int.
         :param detail: Level of detail to return - `basic` or `extended`
         :type detail: str.
+        :param parallel: Load each network separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :param keys_only: Return only :attr:`network_id` in results
         :type keys_only: bool.
         :param active_only: Limits the list of networks to only active networks if true. Default is True.
@@ -288,6 +296,11 @@ class Network(Resource):
         else:
             keys_only = False
 
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+
         if 'region_id' in kwargs:
             params['regionId'] = kwargs['region_id']
 
@@ -302,17 +315,15 @@ class Network(Resource):
         else:
             params['activeOnly'] = True
 
-        x = r.get(params=params)
+        if keys_only is False and parallel is None:
+            r.request_details = request_details
+
+        x = r.get(params=params, uncameled=not keys_only)
         if r.last_error is None:
-            keys = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             if keys_only is True:
-                networks = keys
+                networks = [i[camelize(cls.PRIMARY_KEY)] for i in x[cls.COLLECTION_NAME]]
             else:
-                networks = []
-                for key in keys:
-                    nw = cls(key, detail=request_details)
-                    nw.load()
-                    networks.append(nw)
+                networks = cls.from_collection(x, request_details, parallel)
             return networks
         else:
             raise NetworkException(r.last_error)
@@ -0,0 +1,115 @@
+"""
+mixcoatl.paging
+---------------
+
+Iterate over large listings a page at a time.
+
+The DCM API returns a listing in a single response. The `iter_all()`
+classmethods split the work into pages of resources instead and
+:func:`prefetch` produces the next page in a background thread while the
+caller processes the current one:
+
+* resources with a streamed listing (e.g. :meth:`Server.iter_all()
+  <mixcoatl.infrastructure.server.Server.iter_all>`) read and hydrate the
+  next page from the response
+* every other resource lists its ids and loads the next page of resources
+  with :meth:`~mixcoatl.resource.Resource.load_many`
+
+Either way the first resource is available once the first page is ready and
+no more than `prefetch` pages are held ahead of the caller.
+
+>>> for server in Server.iter_all(page_size=50, prefetch=2):
+...     print server.name
+"""
+import Queue
+import sys
+import threading
+
+#: The default number of resources in a page
+PAGE_SIZE = 100
+
+#: How often, in seconds, a waiting thread checks whether it should give up
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+def options(kwargs):
+    """Return the paging options in `kwargs`, for passing on to :func:`prefetch`"""
+    return dict((k, kwargs[k]) for k in ['page_size', 'prefetch'] if k in kwargs)
+
+def pages(items, page_size=PAGE_SIZE):
+    """Yield lists of up to `page_size` items from `items`"""
+    page = []
+    for item in items:
+        page.append(item)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if len(page) > 0:
+        yield page
+
+def prefetch(items, page_size=PAGE_SIZE, prefetch=1):
+    """Yield `items`, producing up to `prefetch` pages ahead in a background thread
+
+    Exceptions raised while producing a page are raised to the caller once
+    the pages before it have been consumed. Closing the generator stops the
+    background thread.
+
+    :param items: The items to page through, usually a generator
+    :type items: iterable.
+    :param page_size: The number of items in a page
+    :type page_size: int.
+    :param prefetch: The number of pages to produce ahead, `0` to produce
+        every page in the calling thread when it is needed
+    :type prefetch: int.
+    """
+    if prefetch < 1:
+        for item in items:
+            yield item
+        return
+
+    queue = Queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def _put(entry):
+        while not stop.is_set():
+            try:
+                queue.put(entry, True, POLL_INTERVAL)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for page in pages(items, page_size):
+                if not _put((page, None)):
+                    return
+            _put((_DONE, None))
+        except BaseException as e:
+            # The exceptions of mixcoatl derive from BaseException; whatever
+            # it is, the caller must hear of it or it waits forever
+            _put((_DONE, sys.exc_info()))
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+        finally:
+            if hasattr(items, 'close'):
+                items.close()
+
+    worker = threading.Thread(target=_produce, name='mixcoatl-prefetch')
+    worker.daemon = True
+    worker.start()
+    try:
+        while True:
+            try:
+                page, error = queue.get(True, POLL_INTERVAL)
+            except Queue.Empty:
+                continue
+            if page is _DONE:
+                if error is not None:
+                    raise error[0], error[1], error[2]
+                return
+            for item in page:
+                yield item
+    finally:
+        stop.set()
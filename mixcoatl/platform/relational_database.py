@@ -4,7 +4,7 @@ from mixcoatl.utils import camel_keys
 from mixcoatl.decorators.validations import required_attrs
 from mixcoatl.decorators.lazy import lazy_property
 
-import json, sys, time
+import json, sys
 
 class RelationalDatabase(Resource):
     """A relational database is a database as a service offering supporting a relational model."""
@@ -198,8 +198,15 @@ class RelationalDatabase(Resource):
         """`str` - The current status of the database *(i.e. `RUNNING` or `PAUSED`)*."""
         return self.__status
 
-    def reload(self):
-        """Reload resource data from API calls"""
+    def reload(self, future=False):
+        """Reload resource data from API calls
+
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the reloaded database instead of waiting for :attr:`current_job`
+        :type future: bool.
+        """
+        if future:
+            return self.job_future(created=True)
         if self.relational_database_id is not None:
             self.load()
         elif self.current_job is None:
@@ -226,7 +233,7 @@ class RelationalDatabase(Resource):
 
     @required_attrs(['name', 'description', 'port', 'engine', 'rdbms_product', 'data_center',
                      'allocated_storage_in_gb', 'admin_user', 'admin_password'])
-    def launch(self, callback=None):
+    def launch(self, callback=None, future=False):
         """Launches a relational database with the configured parameters
 
         >>> def cb(j): print(j)
@@ -244,6 +251,9 @@ class RelationalDatabase(Resource):
 
         :param callback: Optional callback to send the results of the API call
         :type callback: func.
+        :param future: Return a :class:`~mixcoatl.futures.JobFuture` that
+            resolves to the launched database instead of the job id
+        :type future: bool.
         :returns: int -- The job id of the launch request
         :raises: :class:`RelationalDatabaseLaunchException`, :class:`mixcoatl.decorators.validations.ValidationException`
         """
@@ -279,7 +289,9 @@ class RelationalDatabase(Resource):
 
         self.post(data=json.dumps(payload))
         if self.last_error is None:
-            if callback is not None:
+            if future:
+                return self.job_future(created=True)
+            elif callback is not None:
                 callback(self.current_job)
             else:
                 return self.current_job
@@ -289,25 +301,27 @@ class RelationalDatabase(Resource):
     def wait_for(self, status='RUNNING', callback = None):
         """Blocks execution until the current relational_database has status of :attr:`status`
 
+        The relational database is checked by a :class:`~mixcoatl.watch.StatusWaiter`; use
+        one directly to wait on many of them at once.
+
         :param status: The status to expect before continuing *(i.e. `RUNNING` or `PAUSED`)*
         :type status: str.
         :param callback: Optional callback to be called with the final :class:`RelationalDatabase`` when ``status`` is reached
         :type callback: func.
         :raises: `RelationalDatabaseException`
         """
+        from mixcoatl.watch import StatusWaiter
         if self.relational_database_id is None:
             raise RelationalDatabaseException('Must be called with an existing relational_database.')
         initial_status = self.status
         if self.last_error is None:
             if initial_status == status:
                 return self
-            while self.status != status:
-                time.sleep(5)
-                self.load()
-                if self.last_error is not None:
-                    raise RelationalDatabaseException(self.last_error)
-                else:
-                    continue
+            waiter = StatusWaiter([self], status)
+            for resource in waiter:
+                pass
+            if self.relational_database_id in waiter.errors:
+                raise RelationalDatabaseException(waiter.errors[self.relational_database_id])
             if callback is not None:
                 callback(self)
             else:
@@ -320,19 +334,36 @@ class RelationalDatabase(Resource):
         >>> RelationalDatabase.all()
         [{'relational_database_id':1,...},{'relational_database_id':2,...}]
 
+        :param detail: The level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param parallel: Load each database separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :returns: list -- a list of :class:`RelationalDatabase`
         :raises: RelationalDatabaseException
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
+        if 'detail' in kwargs:
+            request_details = kwargs['detail']
+        else:
+            request_details = 'extended'
+
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+        if parallel is None:
+            r.request_details = request_details
+        else:
+            r.request_details = 'basic'
 
         if 'params' in kwargs:
           params = kwargs['params']
         else:
           params = []
-        s = r.get(params=params)
+        s = r.get(params=params, uncameled=True)
         if r.last_error is None:
-            relational_databases = [cls(relational_database['relationalDatabaseId']) for relational_database in s[cls.COLLECTION_NAME]]
+            relational_databases = cls.from_collection(s, request_details, parallel)
             return relational_databases
         else:
             raise RelationalDatabaseException(r.last_error)
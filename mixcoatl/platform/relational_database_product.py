@@ -134,17 +134,22 @@ class RelationalDatabaseProduct(Resource):
         >>> RelationalDatabaseProduct.all(region_id=100, engine='MYSQL51')
         [{'product_id':1,...},{'product_id':2,...}]
 
+        :param detail: The level of detail to return - `basic` or `extended`
+        :type detail: str.
         :returns: list -- a list of :class:`RelationalDatabaseProduct`
         :raises: RelationalDatabaseProductException
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        else:
+            r.request_details = 'extended'
 
         qopts = {'regionId': region_id, 'engine': engine}
-        s = r.get(params=qopts)
+        s = r.get(params=qopts, uncameled=True)
 
         if r.last_error is None:
-            relational_database_products = [cls(relational_database_product['productId']) for relational_database_product in s[cls.COLLECTION_NAME]]
+            relational_database_products = cls.from_collection(s, r.request_details)
             return relational_database_products
         else:
             raise RelationalDatabaseProductException(r.last_error)
@@ -1,4 +1,5 @@
 from mixcoatl.resource import Resource
+from mixcoatl import paging
 from mixcoatl.admin.job import Job
 from mixcoatl.decorators.lazy import lazy_property
 
@@ -144,19 +145,66 @@ class StorageObject(Resource):
         >>> StorageObject.all(region_id=100)
         [{'storage_object_id':1,...},{'storage_object_id':2,...}]
 
+        :param detail: The level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param parallel: Load each storage object separately with `parallel` concurrent API calls
+            instead of reading the full detail from the listing
+        :type parallel: int.
         :returns: list -- a list of :class:`StorageObject`
         :raises: StorageObjectException
         """
         r = Resource(cls.PATH)
-        r.request_details = 'basic'
+        if 'detail' in kwargs:
+            request_details = kwargs['detail']
+        else:
+            request_details = 'extended'
+
+        if 'parallel' in kwargs:
+            parallel = kwargs['parallel']
+        else:
+            parallel = None
+        if parallel is None:
+            r.request_details = request_details
+        else:
+            r.request_details = 'basic'
 
         qopts = {'regionId': region_id}
-        s = r.get(params=qopts)
+        s = r.get(params=qopts, uncameled=True)
 
         if r.last_error is None:
-            storage_objects = [cls(storage_object['storageObjectId']) for storage_object in s[cls.COLLECTION_NAME]]
+            storage_objects = cls.from_collection(s, request_details, parallel)
             return storage_objects
         else:
             raise StorageObjectException(r.last_error)
 
+    @classmethod
+    def iter_all(cls, region_id, **kwargs):
+        """Yield storage objects one at a time as the listing is read
+
+        Unlike :meth:`all`, the listing is parsed incrementally so memory use
+        stays flat however many storage objects there are.
+
+        >>> for o in StorageObject.iter_all(region_id=100):
+        ...     print o.name
+
+        :param detail: The level of detail to return - `basic` or `extended`
+        :type detail: str.
+        :param page_size: The number of resources read ahead at a time
+        :type page_size: int.
+        :param prefetch: The number of pages to read ahead, `0` for none
+        :type prefetch: int.
+        :returns: generator of :class:`StorageObject`
+        :raises: StorageObjectException
+        """
+        r = Resource(cls.PATH)
+        if 'detail' in kwargs:
+            r.request_details = kwargs['detail']
+        else:
+            r.request_details = 'extended'
+
+        storage_objects = cls.iter_collection(r, params={'regionId': region_id}, **paging.options(kwargs))
+        if storage_objects is None:
+            raise StorageObjectException(r.last_error)
+        return storage_objects
+
 class StorageObjectException(BaseException): pass
@@ -0,0 +1,221 @@
+"""
+mixcoatl.query
+--------------
+
+Filter resources in a single pass.
+
+:meth:`Resource.query() <mixcoatl.resource.Resource.query>` passes the
+filters the API answers itself (see :data:`PUSHDOWN`) on to the listing and
+checks the rest against each resource as it is listed:
+
+>>> Server.query(region_id=19556, owner_email='jdoe@example.com', budget_id=10287)
+[<mixcoatl.infrastructure.server.Server object at 0x...>]
+
+A filter is named after an attribute of the resource, a dotted path into a
+nested value (``region.name``) or one of the shortcuts in :data:`FIELDS`. It
+matches a value equal to it, any value in a `list`, `tuple` or `set`, or
+any value for which a function returns `True`:
+
+>>> Volume.query(owner_email='jdoe@example.com', size_in_gb=lambda s: s >= 100)
+
+Filters only read what the listing returned, so filtering never loads a
+resource. To run many queries over the same resources, a :class:`Collection`
+keeps hash indexes of the fields queried:
+
+>>> servers = Collection(Server.all())
+>>> servers.query(group_id=2001)
+>>> servers.query(group_id=2001, budget_id=10287)
+"""
+
+#: Shortcuts for the fields most often filtered on
+FIELDS = {'owner_email': 'owning_user.email',
+          'email': 'owning_user.email',
+          'owner_login': 'owning_user.vm_login_id',
+          'vm_login_id': 'owning_user.vm_login_id',
+          'account_user_id': 'owning_user.account_user_id',
+          'group_id': 'owning_groups.group_id',
+          'budget_id': 'budget',
+          'region_id': 'region.region_id',
+          'data_center_id': 'data_center.data_center_id'}
+
+#: The filters each resource type applies in its listing, as the keyword
+#: argument of `all()` that takes them
+PUSHDOWN = {'infrastructure/Server': {'region_id': 'region_id',
+                                      'data_center_id': 'data_center_id'},
+            'infrastructure/Volume': {'region_id': 'region_id',
+                                      'data_center_id': 'datacenter_id',
+                                      'account_id': 'account_id'},
+            'infrastructure/Snapshot': {'region_id': 'region_id',
+                                        'account_id': 'account_id',
+                                        'volume_id': 'volume_id'}}
+
+#: The fields a :class:`Collection` indexes up front
+INDEXES = ['owner_email', 'group_id', 'budget_id']
+
+def _attribute(resource, name):
+    """Return attribute `name` of `resource` as listed, without loading it"""
+    entry = resource.schema().attribute(name)
+    if entry is None:
+        return getattr(resource, name, None)
+    return getattr(resource, entry[1], None)
+
+def values(resource, field):
+    """Return the `list` of values of `field` in `resource`
+
+    A field going through a `list`, such as ``owning_groups.group_id``, has a
+    value for each of its items. Shortcuts from :data:`FIELDS` apply to
+    resources without a property of the same name. `resource` may also be a
+    plain `dict`, such as an item of a nested list.
+    """
+    if isinstance(resource, dict):
+        path = field.split('.')
+        found = [resource.get(path[0])]
+    else:
+        if field in FIELDS and field not in resource.schema():
+            field = FIELDS[field]
+        path = field.split('.')
+        found = [_attribute(resource, path[0])]
+    for name in path[1:]:
+        nested = []
+        for value in found:
+            if isinstance(value, list):
+                nested.extend(v.get(name) for v in value if isinstance(v, dict))
+            elif isinstance(value, dict):
+                nested.append(value.get(name))
+        found = nested
+    result = []
+    for value in found:
+        if isinstance(value, list):
+            result.extend(value)
+        elif value is not None:
+            result.append(value)
+    return result
+
+def _test(expected):
+    """Return a function testing a single value against `expected`"""
+    if callable(expected):
+        return expected
+    elif isinstance(expected, (list, tuple, set, frozenset)):
+        wanted = set(expected) | set(unicode(e) for e in expected)
+        return lambda v: v in wanted or unicode(v) in wanted
+    else:
+        text = unicode(expected)
+        return lambda v: v == expected or unicode(v) == text
+
+def predicate(filters):
+    """Return a predicate matching resources against every filter in `filters`
+
+    :param filters: The expected value, values or test function keyed by field
+    :type filters: dict.
+    :returns: func.
+    """
+    tests = [(field, _test(expected)) for field, expected in filters.items()]
+
+    def _predicate(resource):
+        for field, test in tests:
+            for value in values(resource, field):
+                if test(value):
+                    break
+            else:
+                return False
+        return True
+    return _predicate
+
+def select(resources, filters):
+    """Return the resources matching every filter in one pass over `resources`"""
+    if not filters:
+        return list(resources)
+    matches = predicate(filters)
+    return [r for r in resources if matches(r)]
+
+def split(cls, filters):
+    """Split `filters` into the `all()` keyword arguments of `cls` and the filters left
+
+    :returns: `tuple` of two `dict`
+    """
+    pushdown = PUSHDOWN.get(cls.PATH, {})
+    pushed = {}
+    rest = {}
+    for field, expected in filters.items():
+        if field in pushdown and not callable(expected) and \
+                not isinstance(expected, (list, tuple, set, frozenset)):
+            pushed[pushdown[field]] = expected
+        else:
+            rest[field] = expected
+    return pushed, rest
+
+class Collection(object):
+    """Resources kept in memory and indexed for repeated queries
+
+    An index maps each value of a field to the resources with that value. It
+    is built in one pass the first time a field is queried, or up front for
+    the fields in `indexes`. Queries look up the indexed filters and check
+    only the resources found against the others.
+
+    :param resources: The resources, usually of one class
+    :type resources: iterable.
+    :param indexes: The fields to index up front
+    :type indexes: list.
+    """
+
+    def __init__(self, resources, indexes=INDEXES):
+        self.resources = list(resources)
+        self.__indexes = {}
+        for field in indexes:
+            self.index(field)
+
+    def __len__(self):
+        return len(self.resources)
+
+    def __iter__(self):
+        return iter(self.resources)
+
+    def index(self, field):
+        """Return the index of `field`, building it if needed
+
+        :returns: `dict` of the `list` of positions in :attr:`resources` keyed by value
+        """
+        index = self.__indexes.get(field)
+        if index is None:
+            index = {}
+            for position, resource in enumerate(self.resources):
+                for value in values(resource, field):
+                    if isinstance(value, dict):
+                        continue
+                    positions = index.setdefault(value, [])
+                    if len(positions) == 0 or positions[-1] != position:
+                        positions.append(position)
+            self.__indexes[field] = index
+        return index
+
+    def __lookup(self, field, expected):
+        index = self.index(field)
+        if isinstance(expected, (list, tuple, set, frozenset)):
+            keys = expected
+        else:
+            keys = [expected]
+        positions = set()
+        for key in keys:
+            positions.update(index.get(key, []))
+            if isinstance(key, basestring) and key.isdigit():
+                positions.update(index.get(int(key), []))
+        return positions
+
+    def query(self, **filters):
+        """Return the resources matching every filter, in their original order"""
+        indexed = dict((f, e) for f, e in filters.items() if not callable(e))
+        rest = dict((f, e) for f, e in filters.items() if callable(e))
+        positions = None
+        for field, expected in indexed.items():
+            found = self.__lookup(field, expected)
+            if positions is None:
+                positions = found
+            else:
+                positions &= found
+            if len(positions) == 0:
+                return []
+        if positions is None:
+            candidates = self.resources
+        else:
+            candidates = [self.resources[p] for p in sorted(positions)]
+        return select(candidates, rest)
@@ -0,0 +1,240 @@
+"""
+mixcoatl.ratelimit
+------------------
+
+Client-side rate limiting of API calls.
+
+When enabled (``ES_RATE_LIMIT`` or :func:`enable`) every API call, retries
+included, first takes a token from a bucket refilled at `rate` calls per
+second that holds up to `burst` tokens. Calls beyond that wait for their
+turn instead of being throttled by the API. The bucket is shared by every
+thread of the process.
+
+Resource types may have limits of their own (``ES_RATE_LIMITS`` or
+`limits`), which apply on top of the overall limit.
+
+With ``ES_RATE_LIMIT_SHARED=1`` (`shared=True`) the buckets are kept in
+files under ``ES_CACHE_DIR`` and locked while in use, so every process on the
+host draws from the same buckets.
+
+>>> from mixcoatl import ratelimit
+>>> limiter = ratelimit.enable(rate=10, burst=20, limits={'infrastructure/Server': 2})
+>>> Server.all(parallel=20)
+>>> limiter.stats()
+{'requests': 331, 'throttled': 310, 'waited': 152.4}
+"""
+import os
+import threading
+import time
+from mixcoatl.settings.load_settings import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_limiter = None
+_lock = threading.Lock()
+
+class TokenBucket(object):
+    """A token bucket shared by the threads of the process
+
+    Each call reserves a token right away, even when the bucket is empty,
+    and waits until the bucket would have refilled it. Waiting calls are
+    therefore served in the order they arrived.
+
+    :param rate: The tokens added per second
+    :type rate: float.
+    :param burst: The most tokens the bucket holds. Defaults to `rate`, at least 1.
+    :type burst: float.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        if not burst:
+            burst = max(1, rate)
+        self.burst = float(burst)
+        self.__tokens = self.burst
+        self.__updated = time.time()
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return '%s(rate=%r, burst=%r)' % (self.__class__.__name__, self.rate, self.burst)
+
+    def take(self, tokens, updated, now):
+        """Take one token from a bucket holding `tokens` at time `updated`
+
+        :returns: `tuple` of the tokens left at `now`, possibly negative,
+            and the seconds to wait before using the token taken
+        """
+        tokens = min(self.burst, tokens + max(0, now - updated) * self.rate) - 1
+        if tokens >= 0:
+            return tokens, 0
+        return tokens, -tokens / self.rate
+
+    def reserve(self):
+        """Take a token and return the seconds to wait before using it"""
+        with self.__lock:
+            now = time.time()
+            self.__tokens, wait = self.take(self.__tokens, self.__updated, now)
+            self.__updated = now
+        return wait
+
+    def acquire(self):
+        """Take a token, waiting until it may be used
+
+        :returns: `float` - The seconds waited
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket kept in a file and shared by every process on the host
+
+    The file is locked with `flock` while a token is taken. If it cannot be
+    used the bucket falls back to the tokens of the current process.
+
+    :param path: The file holding the state of the bucket
+    :type path: str.
+    """
+
+    def __init__(self, path, rate, burst=None):
+        TokenBucket.__init__(self, rate, burst)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory, 0700)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+    def reserve(self):
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0600)
+        except OSError:
+            return TokenBucket.reserve(self)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                tokens, updated = [float(x) for x in os.read(fd, 64).split()]
+            except ValueError:
+                tokens, updated = self.burst, now
+            tokens, wait = self.take(tokens, updated, now)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, '%r %r' % (tokens, now))
+            return wait
+        finally:
+            os.close(fd)
+
+class RateLimiter(object):
+    """The overall and per resource type token buckets of the API calls
+
+    :param rate: The overall calls per second. `0` for no overall limit.
+    :type rate: float.
+    :param burst: The most calls made at once before the rate applies
+    :type burst: float.
+    :param limits: Calls per second, or `tuple` of rate and burst, keyed by
+        resource type (e.g. ``infrastructure/Server``)
+    :type limits: dict.
+    :param shared: Share the buckets with other processes through files in `directory`
+    :type shared: bool.
+    :param directory: Where shared buckets are kept. Defaults to ``ES_CACHE_DIR``.
+    :type directory: str.
+    """
+
+    def __init__(self, rate=0, burst=None, limits=None, shared=False, directory=None):
+        if shared and fcntl is None:
+            shared = False
+        self.shared = shared
+        if directory is None:
+            directory = settings.cache_dir
+        self.directory = directory
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.__buckets = {}
+        self.__lock = threading.Lock()
+        if rate:
+            self.__buckets[None] = self.__bucket(None, rate, burst)
+        if limits is not None:
+            for rtype, limit in limits.items():
+                if isinstance(limit, (tuple, list)):
+                    self.set_limit(rtype, *limit)
+                else:
+                    self.set_limit(rtype, limit)
+
+    def __bucket(self, rtype, rate, burst):
+        if not self.shared:
+            return TokenBucket(rate, burst)
+        if rtype is None:
+            name = 'ratelimit'
+        else:
+            name = 'ratelimit-%s' % rtype.replace('/', '-')
+        return FileTokenBucket(os.path.join(self.directory, name), rate, burst)
+
+    def set_limit(self, rtype, rate, burst=None):
+        """Limit calls against resource type `rtype` to `rate` per second"""
+        with self.__lock:
+            self.__buckets[rtype] = self.__bucket(rtype, rate, burst)
+
+    def limits(self):
+        """Return the buckets keyed by resource type, `None` for the overall limit"""
+        with self.__lock:
+            return dict(self.__buckets)
+
+    def acquire(self, path):
+        """Wait until a call against `path` is allowed
+
+        :param path: The path of the API call, e.g. ``infrastructure/Server/1234``
+        :type path: str.
+        :returns: `float` - The seconds waited
+        """
+        from mixcoatl.cache import resource_type
+        buckets = [self.__buckets.get(resource_type(path)), self.__buckets.get(None)]
+        wait = max([b.reserve() for b in buckets if b is not None] + [0])
+        with self.__lock:
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self):
+        """Return the number of calls, how many of them waited and for how many seconds in total"""
+        with self.__lock:
+            return {'requests': self.requests,
+                    'throttled': self.throttled,
+                    'waited': self.waited}
+
+def get_limiter():
+    """Return the active :class:`RateLimiter` or `None` if calls are not limited"""
+    global _limiter
+    if _limiter is None and (settings.rate_limit or settings.rate_limits):
+        with _lock:
+            if _limiter is None:
+                _limiter = RateLimiter(settings.rate_limit, settings.rate_burst,
+                                       settings.rate_limits, settings.rate_limit_shared)
+    return _limiter
+
+def enable(rate, burst=None, limits=None, shared=False):
+    """Limit API calls and return the new :class:`RateLimiter`"""
+    global _limiter
+    with _lock:
+        _limiter = RateLimiter(rate, burst, limits, shared)
+        settings.set_rate_limit(rate)
+    return _limiter
+
+def disable():
+    """Stop limiting API calls"""
+    global _limiter
+    with _lock:
+        _limiter = None
+        settings.set_rate_limit(0)
+        settings.set_rate_limits({})
@@ -5,9 +5,16 @@ mixcoatl.resource
 """
 from mixcoatl.settings.load_settings import settings
 import mixcoatl.auth as auth
-import requests as r
-from mixcoatl.decorators.lazy import lazy_property
-from mixcoatl.utils import camel_keys
+import mixcoatl.connection as connection
+import mixcoatl.paging as paging
+import mixcoatl.ratelimit as ratelimit
+import mixcoatl.retry as retry
+import mixcoatl.cache as response_cache
+import mixcoatl.stream as stream
+import mixcoatl.utils as utils
+from mixcoatl.compact import intern_value
+from mixcoatl.schema import Schema
+from mixcoatl.utils import camel_keys, camelize, uncamel
 
 class Resource(object):
     """The base class for all resources returned from an enStratus API call
@@ -49,6 +56,11 @@ class Resource(object):
     COLLECTION_NAME = None
     #: The unique identifier of an individual resource
     PRIMARY_KEY = None
+    #: Whether the class is a slot-based variant built by :meth:`compact`
+    COMPACT = False
+
+    __slots__ = ('__path', '__request_details', '__params', '__last_request', '__last_error',
+                 '__current_job', '__payload_format', '__pending_changes', '__dict__', '__weakref__')
 
     def __init__(self, base_path=None, request_details = 'extended', **kwargs):
 
@@ -69,35 +81,31 @@ class Resource(object):
         if 'params' in kwargs:
             self.__params = kwargs['params']
         else:
-            self.__params = {}
+            self.__params = None
         self.__last_request = None
         self.__last_error = None
         self.__current_job = None
         self.__payload_format = 'json'
         self.__request_details = request_details
-        self.pending_changes = {}
-
-    def __props(self):
-        """List of properties and lazy properties for a given resource"""
-        p = [k for k, v in self.__class__.__dict__.items() if type(v) in [lazy_property, property]]
-        rp = ['last_error', 'path', 'last_request', 'current_job', 'request_details']
-        return p + rp
-
+        self.__pending_changes = None
+
+    @classmethod
+    def schema(cls):
+        """The :class:`~mixcoatl.schema.Schema` of the class, built on first use"""
+        s = cls.__dict__.get('_schema')
+        if s is None:
+            s = Schema(cls)
+            cls._schema = s
+        return s
+
+    @classmethod
+    def compact(cls):
+        """The slot-based variant of the class. See :mod:`mixcoatl.compact`"""
+        from mixcoatl.compact import compact_class
+        return compact_class(cls)
 
     def __repr__(self):
-        from mixcoatl.utils import convert
-        d = {}
-        for x in self.__props():
-            try:
-                if x == 'last_request':
-                    d[x] = str(getattr(self, x))
-                else:
-                    d[x] = getattr(self, x)
-            except AttributeError:
-                d[x] = None
-            except KeyError:
-                d[x] = None
-        return repr(convert(d))
+        return repr(self.to_dict())
 
     @property
     def request_details(self):
@@ -155,48 +163,303 @@ class Resource(object):
 
     @property
     def params(self):
+        if self.__params is None:
+            self.__params = {}
         return self.__params
 
     @params.setter
     def params(self, p):
         self.__params = p
 
+    @property
+    def pending_changes(self):
+        """Changes made through setters, keyed by property, as `{'old': ..., 'new': ...}`"""
+        if self.__pending_changes is None:
+            self.__pending_changes = {}
+        return self.__pending_changes
+
+    @pending_changes.setter
+    def pending_changes(self, changes):
+        self.__pending_changes = changes
+
     def load(self):
         """(Re)load the current object's attributes from an API call"""
-        from mixcoatl.utils import uncamel_keys
-        reserved_words = ['type']
         p = self.PATH+"/"+str(getattr(self, self.__class__.PRIMARY_KEY))
 
         #self.request_details = 'extended'
-        s = self.get(p, params=camel_keys(self.params))
+        s = self.get(p, params=camel_keys(self.params), uncameled=True)
         if self.last_error is None:
-            scope = uncamel_keys(s[self.__class__.COLLECTION_NAME][0])
-            for k in scope.keys():
-                if k in reserved_words:
-                    the_key = 'e_'+k
-                else:
-                    the_key = k
-                nk = '_%s__%s' % (self.__class__.__name__, the_key)
-                if the_key not in self.__props():
-                    raise AttributeError('Key found without accessor: %s' % k)
-                else:
-                    setattr(self, nk, scope[k])
-                    self.loaded = True
+            if isinstance(s, utils.Uncameled):
+                self.hydrate(s[uncamel(self.__class__.COLLECTION_NAME)][0])
+            else:
+                self.hydrate(s[self.__class__.COLLECTION_NAME][0])
         else:
             return self.last_error
 
-    def __doreq(self, method, *args, **kwargs):
-        """Performs the actual API call
+    def job_future(self, created=False):
+        """Return a :class:`~mixcoatl.futures.JobFuture` for :attr:`current_job`
 
-        * calls `auth.get_sig` for signed headers
-        * issues the requested :attr:`method` against the API endpoint
-        * Handles requests appropriately based on sync/async nature of the call
-            based on enStratus API documentation
+        The future resolves to this resource, reloaded once the job completes.
+        A resource that fails to reload is still the result, with the error
+        in :attr:`last_error`.
+
+        >>> f = server.launch(future=True)
+        >>> f.result().status
+        u'PENDING'
+
+        :param created: The job creates this resource, which takes its
+            primary key from the message of the job. A resource that already
+            has its primary key is reloaded right away.
+        :type created: bool.
+        :returns: :class:`~mixcoatl.futures.JobFuture`
+        """
+        from mixcoatl.futures import JobFuture
+
+        def _resolve(job):
+            if created and job is not None:
+                key = job.message
+                if isinstance(key, basestring) and key.isdigit():
+                    key = int(key)
+                setattr(self, self.schema().attribute(self.PRIMARY_KEY)[1], key)
+            if getattr(self, self.PRIMARY_KEY) is not None:
+                self.load()
+            return self
+        job_id = self.current_job
+        if created and getattr(self, self.PRIMARY_KEY) is not None:
+            job_id = None
+        return JobFuture(job_id, _resolve)
+
+    def hydrate(self, data):
+        """Populate the current object's attributes from an API response entry
+
+        This is the same mapping :meth:`load` applies to its own response,
+        so resources built from an already-fetched listing need no further
+        API call.
+
+        :param data: A single resource entry as returned by the API, or as
+            returned by ``get(uncameled=True)``
+        :type data: dict.
+        :raises: `AttributeError` if `data` has a key without an accessor
+        """
+        from mixcoatl.utils import uncamel_keys
+        schema = self.schema()
+        uncameled = isinstance(data, utils.Uncameled)
+        for k, v in data.iteritems():
+            entry = schema.attribute(k)
+            if entry is None:
+                raise AttributeError('Key found without accessor: %s' % uncamel(k))
+            if uncameled:
+                pass
+            elif isinstance(v, list):
+                v = [uncamel_keys(item) for item in v]
+            else:
+                v = uncamel_keys(v)
+            if self.COMPACT:
+                v = intern_value(v)
+            setattr(self, entry[1], v)
+            self.loaded = True
+
+    @classmethod
+    def from_collection(cls, data, request_details='extended', parallel=None):
+        """Return a `list` of `cls` populated from a collection API response
+
+        >>> r = Resource(Server.PATH)
+        >>> Server.from_collection(r.get(uncameled=True), r.request_details)
+        [{'server_id':1,...},{'server_id':2,...}]
+
+        :param data: The decoded API response holding :attr:`COLLECTION_NAME`,
+            preferably from ``get(uncameled=True)`` which saves converting
+            every key again
+        :type data: dict.
+        :param request_details: The level of detail `data` was requested with
+        :type request_details: str.
+        :param parallel: Only use the ids in `data` and load each resource
+            at `request_details` with :meth:`load_many` using `parallel` workers
+        :type parallel: int.
+        :returns: `list` of `cls`
+        """
+        if isinstance(data, utils.Uncameled):
+            items = data[uncamel(cls.COLLECTION_NAME)]
+            key = cls.PRIMARY_KEY
+        else:
+            items = data[cls.COLLECTION_NAME]
+            key = camelize(cls.PRIMARY_KEY)
+        resources = []
+        for item in items:
+            resource = cls(item[key])
+            resource.request_details = request_details
+            if parallel is None:
+                resource.hydrate(item)
+            resources.append(resource)
+        if parallel is not None:
+            cls.load_many(resources, workers=parallel)
+        return resources
+
+    @classmethod
+    def iter_collection(cls, r, page_size=paging.PAGE_SIZE, prefetch=1, **kwargs):
+        """Return a generator of `cls` hydrated one at a time from a streamed listing
+
+        The listing is requested through :meth:`get_stream` on `r`, so
+        memory use does not grow with the size of the collection. The next
+        `prefetch` pages of `page_size` resources are read and hydrated in
+        the background (see :mod:`mixcoatl.paging`).
+
+        >>> r = Resource(Snapshot.PATH)
+        >>> for snapshot in Snapshot.iter_collection(r, params={'regionId': 100}):
+        ...     print snapshot.snapshot_id
+
+        :param r: The resource to request the listing with
+        :type r: :class:`Resource`.
+        :param page_size: The number of resources in a page
+        :type page_size: int.
+        :param prefetch: The number of pages to read ahead
+        :type prefetch: int.
+        :param kwargs: Passed on to :meth:`get_stream`
+        :returns: generator of `cls`, or `None` if the call failed (see `r.last_error`)
+        """
+        items = r.get_stream(cls.COLLECTION_NAME, **kwargs)
+        if items is None:
+            return None
+
+        def _hydrated():
+            try:
+                for item in items:
+                    resource = cls(item[cls.PRIMARY_KEY])
+                    resource.request_details = r.request_details
+                    resource.hydrate(item)
+                    yield resource
+            finally:
+                items.close()
+        return paging.prefetch(_hydrated(), page_size, prefetch)
+
+    @classmethod
+    def iter_all(cls, *args, **kwargs):
+        """Return a generator of every `cls`, loaded a page at a time
+
+        Takes the same arguments as :meth:`all` along with `page_size`,
+        `prefetch` and `workers`. The ids are listed first and each page of
+        resources is then loaded with :meth:`load_many`, the next `prefetch`
+        pages in the background. Resources with a streamed listing override
+        this to read them from a single response instead.
+
+        Resources that fail to load are still yielded, with the error in
+        :attr:`last_error`.
+
+        >>> for job in Job.iter_all(page_size=20):
+        ...     print job.status
+
+        :param page_size: The number of resources in a page
+        :type page_size: int.
+        :param prefetch: The number of pages to load ahead
+        :type prefetch: int.
+        :param workers: The maximum number of concurrent API calls for each page
+        :type workers: int.
+        :returns: generator of `cls`
+        :raises: The exception :meth:`all` raises for `cls`
+        """
+        options = paging.options(kwargs)
+        for k in options.keys():
+            del kwargs[k]
+        workers = kwargs.pop('workers', 10)
+        if 'detail' in kwargs:
+            request_details = kwargs['detail']
+        else:
+            request_details = 'extended'
+        kwargs['keys_only'] = True
+        keys = cls.all(*args, **kwargs)
+
+        def _loaded():
+            for page in paging.pages(keys, options.get('page_size', paging.PAGE_SIZE)):
+                resources = []
+                for key in page:
+                    if isinstance(key, Resource):
+                        resource = key
+                    else:
+                        resource = cls(key)
+                        resource.request_details = request_details
+                    resources.append(resource)
+                cls.load_many([x for x in resources if not getattr(x, 'loaded', False)], workers)
+                for resource in resources:
+                    yield resource
+        return paging.prefetch(_loaded(), **options)
+
+    @classmethod
+    def query(cls, **filters):
+        """Return every `cls` matching `filters`
+
+        Filters the listing of `cls` accepts are passed on to :meth:`all`;
+        the others are checked against each listed resource in one pass,
+        without loading any of them. See :mod:`mixcoatl.query`.
+
+        >>> Server.query(region_id=19556, owner_email='jdoe@example.com', group_id=2001)
+
+        :returns: `list` of `cls`
+        :raises: The exception :meth:`all` raises for `cls`
+        """
+        from mixcoatl import query
+        pushed, rest = query.split(cls, filters)
+        return query.select(cls.all(**pushed), rest)
+
+    @classmethod
+    def load_many(cls, resources, workers=10):
+        """Load `resources` concurrently using a pool of `workers` threads
+
+        Every resource is loaded even if some of them fail. Failed resources
+        keep the error in :attr:`last_error` and are reported in the result.
+
+        >>> volumes = [Volume(i) for i in Volume.all(keys_only=True)]
+        >>> Resource.load_many(volumes, workers=20)
+        {}
+
+        :param resources: The resources to load. Each must have its primary key set.
+        :type resources: list.
+        :param workers: The maximum number of concurrent API calls
+        :type workers: int.
+        :returns: `dict` - Error message keyed by primary key for each failed resource
+        """
+        from multiprocessing.pool import ThreadPool
+
+        def _load(resource):
+            try:
+                error = resource.load()
+            except Exception as e:
+                resource.last_error = str(e)
+                error = resource.last_error
+            return resource, error
+
+        resources = list(resources)
+        errors = {}
+        if len(resources) == 0:
+            return errors
+        pool = ThreadPool(max(1, min(workers, len(resources))))
+        try:
+            for resource, error in pool.imap_unordered(_load, resources):
+                if error is not None:
+                    errors[getattr(resource, resource.PRIMARY_KEY)] = error
+        finally:
+            pool.close()
+            pool.join()
+        return errors
+
+    def prepare_request(self, method, **kwargs):
+        """Return the signed request for :attr:`method` against :attr:`path`
+
+        The result holds everything needed to issue the call with any HTTP
+        client or event loop: ``method``, ``url``, ``headers`` and ``verify``
+        along with any extra keyword arguments such as ``params`` or ``data``.
+        Pass the response back to :meth:`handle_response`.
+
+        >>> r = Resource('admin/Job')
+        >>> req = r.prepare_request('GET', params={'jobId': 1})
+        >>> req['url']
+        'https://api.enstratus.com/api/enstratus/2012-06-15/admin/Job'
+
+        :param method: The HTTP method of the API call
+        :type method: str.
+        :returns: `dict`
+        :raises: `AttributeError` if :attr:`payload_format` is unknown
         """
-        failures = [400, 403, 404, 409, 500, 501, 503]
         sig = auth.get_sig(method, self.path)
-        url = settings.endpoint+'/'+self.path
-        ssl_verify = settings.ssl_verify
 
         if self.payload_format == 'xml':
             payload_format = 'application/xml'
@@ -212,73 +475,175 @@ class Resource(object):
         'Accept': payload_format,
         'User-Agent': sig['ua']}
 
-        results = r.request(method, url, headers=headers, verify=ssl_verify, **kwargs)
-
+        req = {'method': method,
+               'url': settings.endpoint+'/'+self.path,
+               'headers': headers,
+               'verify': settings.ssl_verify}
+        req.update(kwargs)
+        return req
+
+    def handle_response(self, method, status_code, content, uncameled=False):
+        """Interpret the response of an API call made from :meth:`prepare_request`
+
+        Sets :attr:`last_error` and :attr:`current_job` the same way a call
+        through :meth:`get`, :meth:`post`, :meth:`put` or :meth:`delete` does.
+
+        :param method: The HTTP method of the API call
+        :type method: str.
+        :param status_code: The HTTP status code of the response
+        :type status_code: int.
+        :param content: The raw body of the response
+        :type content: str.
+        :param uncameled: Decode a `GET` response with snake case keys
+        :type uncameled: bool.
+        :returns: The decoded response, `True` or `False` depending on :attr:`method`
+        """
+        failures = [400, 403, 404, 409, 500, 501, 503]
         self.last_error = None
-        self.last_request = results
 
-        if self.payload_format == 'xml':
-            return results
-
-        if results.status_code in failures:
-            try:
-                err = results.json()
-                self.last_error = err['error']['message']
-            except ValueError:
-                self.last_error = results.content
+        if status_code in failures:
+            self.__set_error(content)
             return self.last_error
 
         if method == 'GET':
-            try:
-                results.raise_for_status()
-                self.last_error = None
-                return results.json()
-            except r.exceptions.HTTPError:
-                try:
-                    err = results.json()
-                    self.last_error = err['error']['message']
-                except ValueError:
-                    self.last_error = results.content
+            if status_code >= 400:
+                self.__set_error(content)
                 return False
+            return utils.loads(content, uncameled)
         if method == 'DELETE':
-            if results.status_code == 202:
-                self.current_job = results.json()['jobs'][0]['jobId']
-                return results.json()
-            elif results.status_code != 204:
-                try:
-                    err = results.json()
-                    self.last_error = err['error']['message']
-                except ValueError:
-                    self.last_error = results.content
+            if status_code == 202:
+                results = utils.loads(content)
+                self.current_job = results['jobs'][0]['jobId']
+                return results
+            elif status_code != 204:
+                self.__set_error(content)
                 return False
             else:
                 return True
         if method == 'PUT':
-            if results.status_code == 202:
-                self.current_job = results.json()['jobs'][0]['jobId']
-                return results.json()
-            elif results.status_code == 204:
+            if status_code == 202:
+                results = utils.loads(content)
+                self.current_job = results['jobs'][0]['jobId']
+                return results
+            elif status_code == 204:
                 return True
             else:
-                try:
-                    err = results.json()
-                    self.last_error = err['error']['message']
-                except ValueError:
-                    self.last_error = results.content
+                self.__set_error(content)
                 return False
         if method == 'POST':
-            if results.status_code in [201, 202]:
-                if results.status_code == 202:
-                    self.current_job = results.json()['jobs'][0]['jobId']
-                return results.json()
+            if status_code in [201, 202]:
+                results = utils.loads(content)
+                if status_code == 202:
+                    self.current_job = results['jobs'][0]['jobId']
+                return results
             else:
-                try:
-                    err = results.json()
-                    self.last_error = err['error']['message']
-                except ValueError:
-                    self.last_error = results.content
+                self.__set_error(content)
                 return False
 
+    def __set_error(self, content):
+        """Set :attr:`last_error` from the body of a failed API call"""
+        try:
+            err = utils.loads(content)
+            self.last_error = err['error']['message']
+        except ValueError:
+            self.last_error = content
+
+    def __send(self, method, **kwargs):
+        """Make one signed API call over the pooled session once the rate limit allows"""
+        limiter = ratelimit.get_limiter()
+        if limiter is not None:
+            limiter.acquire(self.path)
+        return connection.get_session().request(**self.prepare_request(method, **kwargs))
+
+    def __doreq(self, method, *args, **kwargs):
+        """Performs the actual API call
+
+        * answers cacheable `GET` calls from the in-memory or on-disk caches
+            of :mod:`mixcoatl.cache` when enabled
+        * calls :meth:`prepare_request` for the signed request
+        * issues the requested :attr:`method` against the API endpoint over
+            the pooled session of the current thread, retrying transient
+            failures as the :mod:`mixcoatl.retry` policy of the call allows
+            and within the limits of :mod:`mixcoatl.ratelimit`
+        * Handles requests appropriately based on sync/async nature of the call
+            based on enStratus API documentation via :meth:`handle_response`
+        """
+        uncameled = kwargs.pop('uncameled', False)
+        policy = retry.get_policy(method, kwargs.pop('retry', None))
+        caches = response_cache.get_caches()
+        misses = []
+        if method == 'GET' and self.payload_format == 'json':
+            for cache in caches:
+                cache_key = cache.key(self.path, kwargs.get('params'), self.request_details)
+                if cache_key is None:
+                    continue
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    for faster, faster_key in misses:
+                        faster.put(faster_key, cached)
+                    self.last_error = None
+                    self.last_request = cached
+                    return self.handle_response(method, cached.status_code, cached.content, uncameled)
+                misses.append((cache, cache_key))
+
+        results = retry.call(lambda: self.__send(method, **kwargs), policy)
+
+        self.last_error = None
+        if self.COMPACT and not settings.debug:
+            self.last_request = response_cache.CachedResponse(results.status_code, None, None, results.url)
+        else:
+            self.last_request = results
+
+        if method != 'GET':
+            for cache in caches:
+                cache.invalidate(self.path)
+            if response_cache.get_disk_cache() is None:
+                response_cache.invalidate_disk(self.path)
+        elif misses and results.status_code == 200:
+            cached = response_cache.CachedResponse.from_response(results)
+            for cache, cache_key in misses:
+                cache.put(cache_key, cached)
+
+        if self.payload_format == 'xml':
+            return results
+
+        return self.handle_response(method, results.status_code, results.content, uncameled)
+
+    def get_stream(self, collection, path=None, chunk_size=65536, **kwargs):
+        """Perform a streaming `GET` and return an iterator over the `collection` array
+
+        The response is read `chunk_size` bytes at a time and each element is
+        decoded with snake case keys as soon as it is complete. The call
+        itself is made right away, with retries as for :meth:`get`;
+        streamed responses are never cached.
+
+        :param collection: The top-level array of the response, e.g. ``snapshots``
+        :type collection: str.
+        :param chunk_size: The number of bytes to read at a time
+        :type chunk_size: int.
+        :returns: iterator of :class:`~mixcoatl.utils.Uncameled`, or `None`
+            if the call failed (see :attr:`last_error`)
+        """
+        self.set_path(path)
+        policy = retry.get_policy('GET', kwargs.pop('retry', None))
+        results = retry.call(lambda: self.__send('GET', stream=True, **kwargs), policy)
+        self.last_error = None
+        self.last_request = results
+        if results.status_code != 200:
+            data = self.handle_response('GET', results.status_code, results.content, True)
+            if self.last_error is not None:
+                return None
+            return iter(data[uncamel(collection)])
+
+        def _items():
+            try:
+                for item in stream.iter_array(results.iter_content(chunk_size), collection,
+                                              utils.uncamel_pairs):
+                    yield item
+            finally:
+                results.close()
+        return _items()
+
     def set_path(self, path=None):
         if path is None:
             path = self.path
@@ -286,12 +651,21 @@ class Resource(object):
             self.path = path
 
     def get(self, path=None, **kwargs):
-        """Perform an HTTP `GET` against the API endpoint for the current resource"""
+        """Perform an HTTP `GET` against the API endpoint for the current resource
+
+        Pass ``uncameled=True`` to have every key of the response converted
+        to snake case while it is decoded. Transient failures are retried
+        (see :mod:`mixcoatl.retry`).
+        """
         self.set_path(path)
         return self.__doreq('GET', **kwargs)
 
     def post(self, path=None, **kwargs):
-        """Perform an HTTP `POST` against the API endpoint for the current resource"""
+        """Perform an HTTP `POST` against the API endpoint for the current resource
+
+        The call is only retried if marked safe with ``retry=True``
+        (see :mod:`mixcoatl.retry`).
+        """
         self.set_path(path)
         return self.__doreq('POST', **kwargs)
 
@@ -308,11 +682,43 @@ class Resource(object):
     def pprint(self):
         """The prettyprint formatted representation of the current resource"""
         import pprint
-        pprint.pprint(eval(repr(self)))
+        pprint.pprint(self.to_dict())
+
+    def to_dict(self, fields=None):
+        """The `dict` representation of the current resource
+
+        :param fields: Only include these properties. Defaults to every property.
+        :type fields: list.
+        :raises: `AttributeError` if a field is not a property of the resource
+        """
+        from mixcoatl.utils import convert
+        schema = self.schema()
+        if fields is None:
+            fields = schema.properties
+        d = {}
+        for x in fields:
+            if x not in schema:
+                raise AttributeError('Unknown field: %s' % x)
+            try:
+                if x == 'last_request':
+                    d[x] = str(getattr(self, x))
+                else:
+                    d[x] = getattr(self, x)
+            except AttributeError:
+                d[x] = None
+            except KeyError:
+                d[x] = None
+        return convert(d)
+
+    def to_json(self, fields=None, **kwargs):
+        """The JSON representation of the current resource
 
-    def to_dict(self):
-        """The `dict` representation of the current resource"""
-        return eval(repr(self))
+        :param fields: Only include these properties. Defaults to every property.
+        :type fields: list.
+        :param kwargs: Passed on to :func:`json.dumps`
+        :returns: `str`
+        """
+        return utils.json.dumps(self.to_dict(fields), **kwargs)
 
     def track_change(self, var, prev, new):
         if prev == new:
@@ -1,7 +1,16 @@
-from mixcoatl.admin.billing_code import BillingCode
-from mixcoatl.geography.region import Region
-from mixcoatl.admin.group import Group
-from mixcoatl.admin.user import User
+from mixcoatl import query
+from mixcoatl.directory import get_directory
+
+def _filters(kwargs, fields):
+    """Return the query filters for the keyword arguments in `fields` that are set"""
+    filters = {}
+    for field in fields:
+        if kwargs.get(field) is not None:
+            if field in ['group_id', 'budget_id']:
+                filters[field] = int(kwargs[field])
+            else:
+                filters[field] = kwargs[field]
+    return filters
 
 def get_servers(servers, **kwargs):
     """ Returns a list of servers
@@ -18,32 +27,8 @@ def get_servers(servers, **kwargs):
     :returns: a list of filtered servers.
     :rtype: list
     """
-    filtered_servers = servers
-
-    if kwargs.has_key('account_user_id') and kwargs['account_user_id'] is not None:
-        filtered_servers = [server for server in servers if hasattr(server, 'owning_user') and
-                            server.owning_user.has_key('account_user_id') and
-                            server.owning_user['account_user_id'] == kwargs['account_user_id']]
-    if kwargs.has_key('vm_login_id') and kwargs['vm_login_id'] is not None:
-        if filtered_servers is not None: servers = filtered_servers
-        filtered_servers = [server for server in servers if hasattr(server, 'owning_user') and
-                            server.owning_user.has_key('vm_login_id') and
-                            server.owning_user['vm_login_id'] == kwargs['vm_login_id']]
-    if kwargs.has_key('email') and kwargs['email'] is not None:
-        if filtered_servers is not None: servers = filtered_servers
-        filtered_servers = [server for server in servers if hasattr(server, 'owning_user') and
-                            server.owning_user.has_key('email') and
-                            server.owning_user['email'] == kwargs['email']]
-    if kwargs.has_key('group_id') and kwargs['group_id'] is not None:
-        if filtered_servers is not None: servers = filtered_servers
-        filtered_servers = [server for server in servers if hasattr(server, 'owning_groups')
-                            for group in server.owning_groups if group['group_id'] == int(kwargs['group_id'])]
-    if kwargs.has_key('budget_id') and kwargs['budget_id'] is not None:
-        if filtered_servers is not None: servers = filtered_servers
-        filtered_servers = [server for server in servers if hasattr(server, 'budget') and
-                            server.budget == int(kwargs['budget_id'])]
-
-    return filtered_servers
+    return query.select(servers, _filters(kwargs, ['account_user_id', 'vm_login_id', 'email',
+                                                   'group_id', 'budget_id']))
 
 def get_snapshots(snapshots, **kwargs):
     """ Returns a list of snapshots
@@ -57,17 +42,7 @@ def get_snapshots(snapshots, **kwargs):
     :returns: a list of filtered snapshots.
     :rtype: list
     """
-    filtered_snapshots = snapshots
-
-    if kwargs.has_key('group_id') and kwargs['group_id'] is not None:
-        filtered_snapshots = [snapshot for snapshot in snapshots if hasattr(snapshot, 'owning_groups')
-                              for g in snapshot.owning_groups if g['group_id'] == int(kwargs['group_id'])]
-    if kwargs.has_key('budget_id') and kwargs['budget_id'] is not None:
-        if filtered_snapshots is not None: snapshots = filtered_snapshots
-        filtered_snapshots = [snapshot for snapshot in snapshots if hasattr(snapshot, 'budget') and
-                              snapshot.budget == int(kwargs['budget_id'])]
-
-    return filtered_snapshots
+    return query.select(snapshots, _filters(kwargs, ['group_id', 'budget_id']))
 
 def get_volumes(volumes, **kwargs):
     """ Returns a list of volumes
@@ -84,30 +59,11 @@ def get_volumes(volumes, **kwargs):
     :returns: a list of filtered volumes.
     :rtype: list
     """
-    filtered_volumes = volumes
-
-    if kwargs.has_key('vm_login_id') and kwargs['vm_login_id'] is not None:
-        filtered_volumes = [volume for volume in volumes if hasattr(volume, 'owning_user') and
-                            volume.owning_user.has_key('vm_login_id') and
-                            volume.owning_user['vm_login_id'] == kwargs['vm_login_id']]
-    if kwargs.has_key('email') and kwargs['email'] is not None:
-        if filtered_volumes is not None: volumes = filtered_volumes
-        filtered_volumes = [volume for volume in volumes if hasattr(volume, 'owning_user') and
-                            volume.owning_user.has_key('email') and
-                            volume.owning_user['email'] == kwargs['email']]
-    if kwargs.has_key('group_id') and kwargs['group_id'] is not None:
-        if filtered_volumes is not None: volumes = filtered_volumes
-        filtered_volumes = [volume for volume in volumes if hasattr(volume, 'owning_groups')
-                            for group in volume.owning_groups if group['group_id'] == int(kwargs['group_id'])]
-    if kwargs.has_key('budget_id') and kwargs['budget_id'] is not None:
-        if filtered_volumes is not None: volumes = filtered_volumes
-        filtered_volumes = [volume for volume in volumes if hasattr(volume, 'budget') and
-                            volume.budget == int(kwargs['budget_id'])]
-    if kwargs.has_key('size') and kwargs['size'] is not None:
-        if filtered_volumes is not None: volumes = filtered_volumes
-        filtered_volumes = [volume for volume in volumes if volume.size_in_gb >= int(kwargs['size'])]
-
-    return filtered_volumes
+    filters = _filters(kwargs, ['vm_login_id', 'email', 'group_id', 'budget_id'])
+    if kwargs.get('size') is not None:
+        size = int(kwargs['size'])
+        filters['size_in_gb'] = lambda s: s >= size
+    return query.select(volumes, filters)
 
 def get_user(users, **kwargs):
     """ Returns a user that matches with arguments.
@@ -142,16 +98,10 @@ def get_account_user_id(**kwargs):
     :param email: user's E-Mail address
     :returns: account_user_id
     :rtype: int
+    :raises: :class:`~mixcoatl.directory.DirectoryException`
     """
-
-    if 'vm_login_id' in kwargs:
-        users = User.all()
-        selected_user = get_user(users, vm_login_id=kwargs['vm_login_id'])
-    elif 'email' in kwargs:
-        users = User.all()
-        selected_user = get_user(users, email=kwargs['email'])
-
-    return selected_user.account_user_id
+    return get_directory().user(email=kwargs.get('email'),
+                                vm_login_id=kwargs.get('vm_login_id')).account_user_id
 
 def get_vm_login_id(**kwargs):
     """ Returns vm_login_id from arguments
@@ -160,13 +110,9 @@ def get_vm_login_id(**kwargs):
     :param email: user's E-Mail address
     :returns: vm_login_id
     :rtype: str
+    :raises: :class:`~mixcoatl.directory.DirectoryException`
     """
-
-    if 'email' in kwargs:
-        users = User.all()
-        selected_user = get_user(users, email=kwargs['email'])
-
-    return selected_user.vm_login_id
+    return get_directory().user(email=kwargs.get('email')).vm_login_id
 
 def get_budget_id(budget_name):
     """ Returns budget_id from arguments
@@ -175,14 +121,9 @@ def get_budget_id(budget_name):
     :param budget_name: budget name
     :returns: budget_id
     :rtype: int
+    :raises: :class:`~mixcoatl.directory.DirectoryException`
     """
-    budgets = BillingCode.all(detail='basic')
-
-    for budget in budgets:
-        if hasattr(budget, 'name') and budget.name == budget_name:
-            selected_budget = budget
-
-    return selected_budget.billing_code_id
+    return get_directory().budget_id(budget_name)
 
 def get_group_id(group_name):
     """ Returns a group ID from group name
@@ -191,14 +132,9 @@ def get_group_id(group_name):
     :param group_name: name of the group
     :returns: group_id
     :rtype: int
+    :raises: :class:`~mixcoatl.directory.DirectoryException`
     """
-    groups = Group.all(detail='basic')
-
-    for group in groups:
-        if hasattr(group, 'name') and group.name == group_name:
-            selected_group = group
-
-    return selected_group.group_id
+    return get_directory().group_id(group_name)
 
 def get_region_id(region_pid):
     """ Returns a region ID from provider_id such as us-east-1.
@@ -207,11 +143,6 @@ def get_region_id(region_pid):
     :param region_pid: provider ID of the region such as us-east-1
     :returns: region_id such as 19343
     :rtype: int
+    :raises: :class:`~mixcoatl.directory.DirectoryException`
     """
-    regions = Region.all(detail='basic')
-
-    for region in regions:
-        if hasattr(region, 'provider_id') and region.provider_id == region_pid:
-            selected_region = region
-
-    return selected_region.region_id
+    return get_directory().region_id(region_pid)
@@ -0,0 +1,175 @@
+"""
+mixcoatl.retry
+--------------
+
+Retry policies for transient API failures.
+
+Every API call goes through the :class:`RetryPolicy` of its HTTP method.
+By default `GET` calls are retried on connection errors and on `429`,
+`500`, `502`, `503` and `504` responses, waiting a random time of up to
+``ES_RETRY_BACKOFF * 2 ** attempt`` seconds between attempts (exponential
+backoff with full jitter) for up to ``ES_RETRIES`` retries. `POST`, `PUT`
+and `DELETE` calls start jobs or change resources and are never retried
+unless marked safe:
+
+>>> r.post(data=payload, retry=True)
+
+`retry` also accepts `False` or a :class:`RetryPolicy`, on any call. The
+defaults per method are changed with :func:`set_policy`.
+
+>>> from mixcoatl import retry
+>>> retry.set_policy('PUT', retry.RetryPolicy(retries=2))
+>>> retry.stats()
+{'retries': 3, 'recovered': 1, 'exhausted': 0}
+"""
+import threading
+import time
+from mixcoatl.settings.load_settings import settings
+
+#: The status codes of responses that are retried
+TRANSIENT_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+class RetryPolicy(object):
+    """When and how long to wait before repeating a failed API call
+
+    :param retries: The maximum number of retries. Defaults to ``ES_RETRIES``.
+    :type retries: int.
+    :param backoff: The base delay in seconds. Defaults to ``ES_RETRY_BACKOFF``.
+    :type backoff: float.
+    :param max_backoff: The longest delay in seconds
+    :type max_backoff: float.
+    :param statuses: The status codes to retry
+    :type statuses: set.
+    :param connection_errors: Retry calls that failed to connect or timed out
+    :type connection_errors: bool.
+    """
+
+    def __init__(self, retries=None, backoff=None, max_backoff=30,
+                 statuses=TRANSIENT_STATUSES, connection_errors=True):
+        self.__retries = retries
+        self.__backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.connection_errors = connection_errors
+
+    def __repr__(self):
+        return 'RetryPolicy(retries=%r, backoff=%r)' % (self.retries, self.backoff)
+
+    @property
+    def retries(self):
+        """The maximum number of retries"""
+        if self.__retries is None:
+            return settings.retries
+        return self.__retries
+
+    @property
+    def backoff(self):
+        """The base delay in seconds"""
+        if self.__backoff is None:
+            return settings.retry_backoff
+        return self.__backoff
+
+    def delay(self, attempt, response=None):
+        """Return the seconds to wait after failed attempt number `attempt` (from 0)
+
+        A `Retry-After` header of `response` is honored up to :attr:`max_backoff`.
+        """
+        import random
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if response is not None and response.headers is not None:
+            retry_after = response.headers.get('retry-after')
+            if retry_after is not None and retry_after.isdigit():
+                delay = max(delay, min(self.max_backoff, int(retry_after)))
+        return delay
+
+#: Never retry
+NEVER = RetryPolicy(retries=0)
+
+#: Retry on transient failures with the configured retries and backoff
+SAFE = RetryPolicy()
+
+_policies = {'GET': SAFE, 'POST': NEVER, 'PUT': NEVER, 'DELETE': NEVER}
+_counters = {'retries': 0, 'recovered': 0, 'exhausted': 0}
+_lock = threading.Lock()
+
+def get_policy(method, retry=None):
+    """Return the policy for an API call
+
+    :param method: The HTTP method of the call
+    :type method: str.
+    :param retry: `True` for :data:`SAFE`, `False` for :data:`NEVER`, a
+        :class:`RetryPolicy`, or `None` for the default of `method`
+    :returns: :class:`RetryPolicy`
+    """
+    if retry is None:
+        return _policies.get(method, NEVER)
+    elif retry is True:
+        return SAFE
+    elif retry is False:
+        return NEVER
+    return retry
+
+def set_policy(method, policy):
+    """Set the default policy for calls made with `method`"""
+    _policies[method] = policy
+
+def _count(counter):
+    with _lock:
+        _counters[counter] += 1
+
+def stats():
+    """Return the retry counters
+
+    * `retries` - calls repeated after a transient failure
+    * `recovered` - calls that succeeded after one or more retries
+    * `exhausted` - calls that still failed after the last retry
+    """
+    with _lock:
+        return dict(_counters)
+
+def reset_stats():
+    """Set every counter back to zero"""
+    with _lock:
+        for k in _counters:
+            _counters[k] = 0
+
+def _is_connection_error(error):
+    from requests.exceptions import ConnectionError, Timeout
+    return isinstance(error, (ConnectionError, Timeout))
+
+def call(send, policy):
+    """Return the response of `send()`, calling it again on transient failures
+
+    :param send: Makes the API call and returns the response
+    :type send: func.
+    :param policy: When to retry
+    :type policy: :class:`RetryPolicy`.
+    :returns: The response of the last attempt
+    :raises: The error of the last attempt if it failed to connect
+    """
+    attempt = 0
+    while True:
+        try:
+            response = send()
+        except Exception as e:
+            if not policy.connection_errors or not _is_connection_error(e):
+                raise
+            if attempt >= policy.retries:
+                if attempt > 0:
+                    _count('exhausted')
+                raise
+            delay = policy.delay(attempt)
+        else:
+            if response.status_code not in policy.statuses:
+                if attempt > 0:
+                    _count('recovered')
+                return response
+            if attempt >= policy.retries:
+                if attempt > 0:
+                    _count('exhausted')
+                return response
+            delay = policy.delay(attempt, response)
+            response.close()
+        attempt += 1
+        _count('retries')
+        time.sleep(delay)
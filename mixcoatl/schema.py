@@ -0,0 +1,85 @@
+"""
+mixcoatl.schema
+---------------
+
+The property schema of a :class:`~mixcoatl.resource.Resource` class.
+
+Hydrating a resource maps every key of an API response to the
+name-mangled attribute behind one of the class' properties. The
+:class:`Schema` works that mapping out once per class, on first use, so
+:meth:`~mixcoatl.resource.Resource.hydrate`, `repr()` and
+:meth:`~mixcoatl.resource.Resource.to_dict` no longer scan the class for
+its properties on every key.
+
+>>> s = Server.schema()
+>>> s.attribute('serverId')
+('server_id', '_Server__server_id')
+>>> 'name' in s.mutable
+True
+"""
+from mixcoatl.decorators.lazy import lazy_property
+from mixcoatl.utils import uncamel
+
+#: API keys that clash with Python names and the property they are stored under
+RESERVED_WORDS = {'type': 'e_type'}
+
+#: Properties of every resource that are not part of the API response
+BASE_PROPERTIES = ['last_error', 'path', 'last_request', 'current_job', 'request_details']
+
+class Schema(object):
+    """The properties of a resource class and how API keys map onto them
+
+    :param cls: The resource class
+    :type cls: type.
+    """
+
+    def __init__(self, cls):
+        self.name = cls.__name__
+        self.properties = []
+        mutable = set()
+        for k, v in cls.__dict__.items():
+            if type(v) is lazy_property:
+                self.properties.append(k)
+                if v._sfunc is not None:
+                    mutable.add(k)
+            elif type(v) is property:
+                self.properties.append(k)
+                if v.fset is not None:
+                    mutable.add(k)
+        for k in BASE_PROPERTIES:
+            if k not in self.properties:
+                self.properties.append(k)
+        #: The properties read from the API, primary key first and the rest sorted
+        self.fields = sorted(k for k in self.properties if k not in BASE_PROPERTIES)
+        if cls.PRIMARY_KEY in self.fields:
+            self.fields.remove(cls.PRIMARY_KEY)
+            self.fields.insert(0, cls.PRIMARY_KEY)
+        #: `frozenset` of the properties that have a setter
+        self.mutable = frozenset(mutable)
+        #: Name-mangled attribute keyed by property
+        self.attributes = dict((k, '_%s__%s' % (self.name, k)) for k in self.properties)
+        self.__keys = {}
+
+    def __contains__(self, name):
+        return name in self.attributes
+
+    def attribute(self, key):
+        """Return the property and attribute an API key is stored under
+
+        :param key: A top-level key of an API response entry, e.g. ``serverId``
+        :type key: str.
+        :returns: `tuple` of property and name-mangled attribute, or `None`
+            if the class has no property for `key`
+        """
+        try:
+            return self.__keys[key]
+        except KeyError:
+            pass
+        name = uncamel(key)
+        name = RESERVED_WORDS.get(name, name)
+        if name in self.attributes:
+            entry = (name, self.attributes[name])
+        else:
+            entry = None
+        self.__keys[key] = entry
+        return entry
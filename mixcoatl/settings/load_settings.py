@@ -1,4 +1,3 @@
-from mixcoatl.config import Config
+from mixcoatl.config import LazyConfig
 
-settings = Config()
-settings.configure()
\ No newline at end of file
+settings = LazyConfig()
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+mixcoatl.stream
+---------------
+
+Incremental parsing of collection responses.
+
+A listing such as ``{"snapshots": [{...}, {...}, ...]}`` is read chunk by
+chunk from the response and each element of the collection array is
+decoded as soon as it is complete. Only the element being decoded and the
+current chunk are held in memory, however large the whole document is.
+
+>>> chunks = ['{"snapshots": [{"snapshotId": 1}, ', '{"snapshotId": 2}]}']
+>>> list(iter_array(chunks, 'snapshots'))
+[{u'snapshotId': 1}, {u'snapshotId': 2}]
+"""
+import re
+from mixcoatl.utils import json, pairs_decoder
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_number = re.compile(r'[0-9.eE+-]*')
+
+class _Reader(object):
+    """A buffer over an iterable of chunks of a JSON document"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """Append the next chunk to the buffer. Returns `False` at the end of the document."""
+        if self.eof:
+            return False
+        try:
+            chunk = self.chunks.next()
+        except StopIteration:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or `''` at the end"""
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ''
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of `chars`"""
+        c = self.peek()
+        if c == '' or c not in chars:
+            raise StreamException('Expected %r at offset %d, found %r' % (chars, self.pos, c))
+        self.pos += 1
+        return c
+
+    def value(self, decoder):
+        """Decode the next complete JSON value"""
+        while True:
+            self.peek()
+            try:
+                obj, end = decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.more():
+                    continue
+                raise StreamException('Truncated or invalid JSON at offset %d' % self.pos)
+            # A number at the end of the buffer may continue in the next chunk
+            if _number.match(self.buf, end).end() == len(self.buf) and self.more():
+                continue
+            self.pos = end
+            return obj
+
+def iter_array(chunks, key, object_pairs_hook=None):
+    """Yield each element of the array under top-level `key` of a JSON object
+
+    Other top-level members are decoded and discarded. Reading stops once
+    the array is complete.
+
+    :param chunks: The JSON document in pieces, e.g. ``response.iter_content(65536)``
+    :type chunks: iterable.
+    :param key: The top-level member holding the array, e.g. ``snapshots``
+    :type key: str.
+    :param object_pairs_hook: Passed on to the JSON decoder for each element
+    :type object_pairs_hook: func.
+    :raises: :class:`StreamException`
+    """
+    reader = _Reader(chunks)
+    plain = json.JSONDecoder()
+    if object_pairs_hook is None:
+        decoder = plain
+    else:
+        decoder = pairs_decoder(object_pairs_hook)
+    reader.expect('{')
+    if reader.peek() == '}':
+        raise StreamException('No %s in response' % key)
+    while True:
+        name = reader.value(plain)
+        reader.expect(':')
+        if name == key:
+            reader.expect('[')
+            if reader.peek() == ']':
+                return
+            while True:
+                yield reader.value(decoder)
+                if reader.expect(',]') == ']':
+                    return
+        reader.value(plain)
+        if reader.expect(',}') == '}':
+            raise StreamException('No %s in response' % key)
+
+class StreamException(BaseException): pass
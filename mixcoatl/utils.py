@@ -1,4 +1,22 @@
 """Common helper utilities for use with mixcoatl"""
+import re
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+#: The maximum number of keys remembered by :func:`uncamel` and :func:`camelize`
+MAX_MEMO = 10000
+
+_uncamel_re = re.compile('(((?<=[a-z])[A-Z])|([A-Z](?![A-Z]|$)))')
+_uncameled = {}
+_camelized = {}
+
+def _remember(memo, key, value):
+    if len(memo) >= MAX_MEMO:
+        memo.clear()
+    memo[key] = value
+    return value
 
 def uncamel(val):
     """Return the snake case version of :attr:`str`
@@ -8,9 +26,10 @@ def uncamel(val):
     >>> uncamel('dataCenterName')
     'data_center_name'
     """
-    import re
-    s = lambda val: re.sub('(((?<=[a-z])[A-Z])|([A-Z](?![A-Z]|$)))', '_\\1', val).lower().strip('_')
-    return s(val)
+    try:
+        return _uncameled[val]
+    except KeyError:
+        return _remember(_uncameled, val, _uncamel_re.sub('_\\1', val).lower().strip('_'))
 
 def uncamel_keys(d1):
     """Return :attr:`d1` with all keys converted to snake case
@@ -38,8 +57,11 @@ def camelize(val):
     >>> camelize('this_is_a_thing')
     'thisIsAThing'
     """
-    s = ''.join([t.title() for t in val.split('_')])
-    return s[0].lower()+s[1:]
+    try:
+        return _camelized[val]
+    except KeyError:
+        s = ''.join([t.title() for t in val.split('_')])
+        return _remember(_camelized, val, s[0].lower()+s[1:])
 
 def camel_keys(d1):
     """Return :attr:`d1` with all keys converted to camel case
@@ -79,3 +101,51 @@ def convert(val):
         return val.encode('utf-8')
     else:
         return val
+
+class Uncameled(dict):
+    """A `dict` decoded by :func:`loads` with its keys already in snake case"""
+    __slots__ = ()
+
+def uncamel_pairs(pairs):
+    """Return an :class:`Uncameled` dict of decoded `(key, value)` pairs
+
+    Use as the `object_pairs_hook` of a JSON decoder.
+    """
+    d = Uncameled()
+    for k, v in pairs:
+        try:
+            d[_uncameled[k]] = v
+        except KeyError:
+            d[uncamel(k)] = v
+    return d
+
+def pairs_decoder(object_pairs_hook):
+    """Return a JSON decoder calling `object_pairs_hook` with the pairs of each object
+
+    The :mod:`json` of Python 2.6 has no `object_pairs_hook`. There the hook
+    gets the items of each decoded `dict` through an `object_hook` instead.
+    """
+    try:
+        return json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+    except TypeError:
+        # Python 2.6
+        return json.JSONDecoder(object_hook=lambda obj: object_pairs_hook(obj.iteritems()))
+
+def loads(content, uncameled=False):
+    """Return the decoded JSON :attr:`content`
+
+    `simplejson` is used instead of :mod:`json` when it is installed.
+
+    >>> loads('{"myThings":[{"thingId":1}]}', uncameled=True)
+    {u'my_things': [{u'thing_id': 1}]}
+
+    :param content: The JSON document
+    :type content: str.
+    :param uncameled: Convert all keys to snake case while decoding, which
+        gives the same result as :func:`uncamel_keys` without a second pass.
+        Objects are decoded as :class:`Uncameled`.
+    :type uncameled: bool.
+    """
+    if uncameled:
+        return pairs_decoder(uncamel_pairs).decode(content)
+    return json.loads(content)
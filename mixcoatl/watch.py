@@ -0,0 +1,396 @@
+"""
+mixcoatl.watch
+--------------
+
+Wait for many asynchronous operations at once.
+
+A :class:`JobWatcher` tracks any number of jobs and checks all of them on
+each tick: with a single `admin/Job` listing once two or more jobs are
+watched, loading only the jobs missing from the listing. Ticks start
+`interval` seconds apart and back off to `max_interval` while nothing
+changes. Each watched job resolves a :class:`~mixcoatl.futures.Future` and
+fires its callback once it reaches the expected status or fails.
+
+>>> from mixcoatl.watch import JobWatcher
+>>> watcher = JobWatcher()
+>>> futures = [watcher.watch(s.current_job, callback=report) for s in launched]
+>>> watcher.run(timeout=1800)
+True
+>>> [f.result().message for f in futures]
+[u'339452', u'339453', ...]
+
+:func:`get_watcher` returns a watcher that runs in a background thread and
+is shared by :meth:`Job.wait_for() <mixcoatl.admin.job.Job.wait_for>`.
+
+A :class:`StatusWaiter` does the same for the status of servers, databases
+or any other resource with a `status`, refreshing them all with one
+basic-detail listing per tick:
+
+>>> from mixcoatl.watch import StatusWaiter
+>>> for server in StatusWaiter(servers, 'RUNNING', timeout=900, region_id=100):
+...     print server.server_id, server.status
+"""
+import atexit
+import logging
+import threading
+import time
+try:
+    from collections import OrderedDict
+except ImportError:
+    # Python 2.6, with the ordereddict backport
+    from ordereddict import OrderedDict
+from mixcoatl.admin.job import Job, JobException
+from mixcoatl.futures import Future, TimeoutError
+from mixcoatl.resource import Resource
+from mixcoatl.utils import uncamel
+
+try:
+    from logging import NullHandler
+except ImportError:
+    # Python 2.6
+    class NullHandler(logging.Handler):
+        def emit(self, record):
+            pass
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.addHandler(NullHandler())
+
+_watcher = None
+_lock = threading.Lock()
+
+class JobWatcher(object):
+    """Track many jobs, polling them together
+
+    :param interval: The seconds between the first ticks
+    :type interval: float.
+    :param max_interval: The most seconds between ticks
+    :type max_interval: float.
+    :param backoff: How much longer each tick waits than the one before
+    :type backoff: float.
+    :param list_threshold: List every job with one call once this many jobs
+        are watched, instead of loading each of them
+    :type list_threshold: int.
+    """
+
+    def __init__(self, interval=1, max_interval=30, backoff=1.5, list_threshold=2):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.list_threshold = list_threshold
+        #: The number of ticks so far
+        self.ticks = 0
+        #: The number of API calls made so far
+        self.calls = 0
+        #: The number of ticks that failed with an exception
+        self.errors = 0
+        self.__delay = interval
+        self.__watched = {}
+        self.__lock = threading.Lock()
+        self.__wakeup = threading.Event()
+        self.__thread = None
+        self.__started = False
+
+    @property
+    def pending(self):
+        """The ids of the jobs being watched"""
+        with self.__lock:
+            return self.__watched.keys()
+
+    def watch(self, job_id, status='COMPLETE', callback=None):
+        """Watch `job_id` until it reaches `status`
+
+        The future resolves to the final :class:`~mixcoatl.admin.job.Job`.
+        A job that ends in `ERROR`, or cannot be read, sets a
+        :class:`~mixcoatl.admin.job.JobException` instead. Cancelling the
+        future stops watching the job.
+
+        :param job_id: The job to watch
+        :type job_id: int.
+        :param status: The status to expect
+        :type status: str.
+        :param callback: Called with the final :class:`~mixcoatl.admin.job.Job`
+            when it reaches `status` or `ERROR`
+        :type callback: func.
+        :returns: :class:`~mixcoatl.futures.Future`
+        """
+        future = Future()
+        with self.__lock:
+            self.__watched.setdefault(job_id, []).append((status, future, callback))
+            self.__delay = self.interval
+            if self.__started:
+                self.__start_thread()
+        self.__wakeup.set()
+        return future
+
+    def __next_delay(self):
+        with self.__lock:
+            delay = self.__delay
+            self.__delay = min(self.max_interval, self.__delay * self.backoff)
+        return delay
+
+    def __fetch(self, job_ids):
+        jobs = {}
+        if len(job_ids) >= self.list_threshold:
+            r = Resource(Job.PATH)
+            r.request_details = 'basic'
+            data = r.get(uncameled=True)
+            self.calls += 1
+            if r.last_error is None:
+                for item in data['jobs']:
+                    if item['job_id'] in job_ids:
+                        job = Job(item['job_id'])
+                        job.request_details = r.request_details
+                        job.hydrate(item)
+                        jobs[job.job_id] = job
+        missing = [Job(i) for i in job_ids if i not in jobs]
+        Job.load_many(missing)
+        self.calls += len(missing)
+        for job in missing:
+            jobs[job.job_id] = job
+        return jobs
+
+    def poll(self):
+        """Check every watched job once, resolving those that are done
+
+        :returns: `list` of the :class:`~mixcoatl.admin.job.Job` resolved
+        """
+        with self.__lock:
+            for job_id, entries in self.__watched.items():
+                entries[:] = [e for e in entries if not e[1].cancelled()]
+                if len(entries) == 0:
+                    del self.__watched[job_id]
+            job_ids = set(self.__watched.keys())
+        if len(job_ids) == 0:
+            return []
+        self.ticks += 1
+        resolved = []
+        for job_id, job in self.__fetch(job_ids).items():
+            with self.__lock:
+                entries = self.__watched.get(job_id, [])
+                done = [e for e in entries if job.last_error is not None or
+                        job.status in [e[0], 'ERROR']]
+                entries[:] = [e for e in entries if e not in done]
+                if len(entries) == 0:
+                    self.__watched.pop(job_id, None)
+            if len(done) > 0:
+                resolved.append(job)
+            for status, future, callback in done:
+                self.__resolve(job, status, future, callback)
+        return resolved
+
+    def __resolve(self, job, status, future, callback):
+        if job.last_error is None and callback is not None:
+            try:
+                callback(job)
+            except Exception:
+                LOGGER.exception('exception calling callback for job %s', job.job_id)
+        if not future.set_running_or_notify_cancel():
+            return
+        if job.last_error is not None:
+            future.set_exception(JobException(job.last_error))
+        elif job.status == 'ERROR' and status != 'ERROR':
+            future.set_exception(JobException(job.message or 'Job %s failed' % job.job_id))
+        else:
+            future.set_result(job)
+
+    def run(self, timeout=None):
+        """Poll in the calling thread until every watched job is done
+
+        :param timeout: Give up after this many seconds
+        :type timeout: float.
+        :returns: `bool` - `False` if jobs were still pending at `timeout`
+        """
+        if timeout is not None:
+            deadline = time.time() + timeout
+        while True:
+            self.poll()
+            if len(self.pending) == 0:
+                return True
+            delay = self.__next_delay()
+            if timeout is not None:
+                delay = min(delay, deadline - time.time())
+                if delay <= 0:
+                    return False
+            time.sleep(delay)
+
+    def start(self):
+        """Poll in a background thread until :meth:`stop` is called
+
+        The thread only runs while jobs are watched.
+        """
+        with self.__lock:
+            self.__started = True
+            if len(self.__watched) > 0:
+                self.__start_thread()
+
+    def __start_thread(self):
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__loop, name='mixcoatl-job-watcher')
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def stop(self, timeout=None):
+        """Stop polling in the background
+
+        :param timeout: Wait up to this many seconds for the current tick to finish
+        :type timeout: float.
+        """
+        with self.__lock:
+            self.__started = False
+            thread = self.__thread
+        self.__wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def __loop(self):
+        try:
+            while True:
+                with self.__lock:
+                    if not self.__started or len(self.__watched) == 0:
+                        self.__thread = None
+                        return
+                self.__wakeup.clear()
+                try:
+                    self.poll()
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except BaseException:
+                    # The exceptions of mixcoatl derive from BaseException
+                    self.errors += 1
+                    LOGGER.exception('job watcher tick failed')
+                self.__wakeup.wait(self.__next_delay())
+        finally:
+            with self.__lock:
+                if self.__thread is threading.current_thread():
+                    self.__thread = None
+
+class StatusWaiter(object):
+    """Wait for many resources of one class to reach a status
+
+    Iterating over the waiter yields each resource as soon as it reaches
+    one of `status`. The resources are refreshed in place, all of them with
+    one basic-detail listing per tick once `list_threshold` are pending.
+    Resources missing from the listing are loaded on their own; those that
+    cannot be loaded are dropped and their error kept in :attr:`errors`.
+
+    :param resources: The resources to wait on, e.g. :class:`~mixcoatl.infrastructure.server.Server`
+    :type resources: iterable.
+    :param status: The status to expect, or a `list` of them
+    :type status: str.
+    :param timeout: Raise :class:`~mixcoatl.futures.TimeoutError` if resources
+        are still pending after this many seconds
+    :type timeout: float.
+    :param region_id: Only list resources in `region_id`
+    :type region_id: int.
+    :param data_center_id: Only list resources in `data_center_id`
+    :type data_center_id: int.
+    :param interval: The seconds between the first ticks
+    :type interval: float.
+    :param max_interval: The most seconds between ticks
+    :type max_interval: float.
+    :param backoff: How much longer each tick waits than the one before
+    :type backoff: float.
+    :param list_threshold: List every resource with one call once this many
+        are pending, instead of loading each of them
+    :type list_threshold: int.
+    """
+
+    def __init__(self, resources, status, timeout=None, region_id=None, data_center_id=None,
+                 interval=1, max_interval=30, backoff=1.5, list_threshold=2):
+        if isinstance(status, basestring):
+            status = [status]
+        self.status = frozenset(status)
+        self.timeout = timeout
+        self.params = {}
+        if region_id is not None:
+            self.params['regionId'] = region_id
+        if data_center_id is not None:
+            self.params['dataCenterId'] = data_center_id
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.list_threshold = list_threshold
+        #: Error message keyed by the primary key of each resource dropped
+        self.errors = {}
+        #: The number of ticks so far
+        self.ticks = 0
+        #: The number of API calls made so far
+        self.calls = 0
+        self.__pending = OrderedDict()
+        for resource in resources:
+            self.__pending[getattr(resource, resource.PRIMARY_KEY)] = resource
+
+    @property
+    def pending(self):
+        """The resources that have not reached the status yet"""
+        return self.__pending.values()
+
+    def __list(self, cls):
+        r = Resource(cls.PATH)
+        r.request_details = 'basic'
+        data = r.get(params=self.params, uncameled=True)
+        self.calls += 1
+        found = set()
+        if r.last_error is None:
+            for item in data[uncamel(cls.COLLECTION_NAME)]:
+                resource = self.__pending.get(item[cls.PRIMARY_KEY])
+                if resource is not None:
+                    resource.hydrate(item)
+                    found.add(item[cls.PRIMARY_KEY])
+        return found
+
+    def poll(self):
+        """Refresh every pending resource once
+
+        :returns: `list` of the resources that reached the status
+        """
+        if len(self.__pending) == 0:
+            return []
+        self.ticks += 1
+        cls = type(self.__pending.values()[0])
+        if len(self.__pending) >= self.list_threshold:
+            found = self.__list(cls)
+        else:
+            found = set()
+        missing = [r for k, r in self.__pending.items() if k not in found]
+        self.calls += len(missing)
+        for key, error in cls.load_many(missing).items():
+            self.errors[key] = error
+            del self.__pending[key]
+        reached = []
+        for key, resource in self.__pending.items():
+            if resource.status in self.status:
+                reached.append(resource)
+                del self.__pending[key]
+        return reached
+
+    def __iter__(self):
+        if self.timeout is not None:
+            deadline = time.time() + self.timeout
+        delay = self.interval
+        while True:
+            for resource in self.poll():
+                yield resource
+            if len(self.__pending) == 0:
+                return
+            if self.timeout is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError('%d resources did not reach %s in time' %
+                                       (len(self.__pending), '/'.join(sorted(self.status))))
+                time.sleep(min(delay, remaining))
+            else:
+                time.sleep(delay)
+            delay = min(self.max_interval, delay * self.backoff)
+
+def get_watcher():
+    """Return the shared :class:`JobWatcher`, started in a background thread on first use"""
+    global _watcher
+    if _watcher is None:
+        with _lock:
+            if _watcher is None:
+                watcher = JobWatcher()
+                watcher.start()
+                atexit.register(watcher.stop, 1)
+                _watcher = watcher
+    return _watcher
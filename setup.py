@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 
-import mixcoatl
 import os
+import re
+import sys
 import glob
 
 try:
@@ -24,10 +25,16 @@ packages = [
     'mixcoatl.settings'
 ]
 
+# Read the version without importing mixcoatl
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mixcoatl', '__init__.py')) as f:
+    version = re.search(r"^__version__ = '([^']+)'", f.read(), re.M).group(1)
+
 requires = ['requests==1.0.4', 'prettytable==0.7.2']
+if sys.version_info < (2, 7):
+    requires.append('ordereddict')
 setup(
     name='mixcoatl',
-    version=mixcoatl.__version__,
+    version=version,
     description='Dell Cloud Manager API Python wrapper',
     long_description='Dell Cloud Manager API Python wrapper',
     author='Dell Cloud Management Team',
@@ -36,6 +36,9 @@ class TestApiKey(unittest.TestCase):
         assert len(s) == 2
         for x in s:
             assert isinstance(x, billing_code.BillingCode)
+        assert HTTPretty.last_request.headers['x-es-details'] == 'extended'
+        billing_code.BillingCode.all(detail='basic')
+        assert HTTPretty.last_request.headers['x-es-details'] == 'basic'
 
     @httprettified
     def test_has_one(self):
@@ -35,6 +35,7 @@ class TestGroups(unittest.TestCase):
         assert len(s) == 2
         for x in s:
             assert isinstance(x, grp.Group)
+            assert 'loaded' in x.__dict__
 
     @httprettified
     def test_has_one(self):
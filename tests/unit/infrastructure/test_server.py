@@ -12,6 +12,7 @@ else:
 
 from httpretty import HTTPretty
 from httpretty import httprettified
+import mock
 
 import mixcoatl.infrastructure.server as rsrc
 from mixcoatl.settings.load_settings import settings
@@ -40,6 +41,26 @@ class TestServer(unittest.TestCase):
         for x in s:
             assert isinstance(x, self.cls)
 
+    @httprettified
+    def test_all_is_hydrated(self):
+        '''test all() populates each Server from the listing alone'''
+
+        with open(self.json_file) as f:
+            data = f.read()
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url,
+            body = data,
+            status = 200,
+            content_type = "application/json")
+        with mock.patch.object(self.cls, 'load') as load:
+            s = self.cls.all()
+            servers = dict((x.server_id, x) for x in s)
+            assert servers[331810].status == 'RUNNING'
+            assert servers[331810].region['region_id'] == 19344
+            assert servers[331810].request_details == 'extended'
+        assert load.called is False
+        assert HTTPretty.last_request.headers['x-es-details'] == 'extended'
+
     @httprettified
     def test_has_one(self):
         '''test Server(<id>) returns a valid resource'''
@@ -112,3 +112,38 @@ class TestSnapshot(unittest.TestCase):
         assert s.owning_account['account_id'] == 16000
         assert s.removable is True
         assert s.size_in_gb -- 8
+
+    @httprettified
+    def test_iter_all(self):
+        """test Snapshot.iter_all() yields hydrated Snapshots"""
+
+        with open(self.json_file) as f:
+            data = f.read()
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url,
+            body=data,
+            status=200,
+            content_type="application/json")
+
+        s = self.cls.iter_all()
+        assert not isinstance(s, list)
+        s = list(s)
+        assert len(s) == 19
+        expected = json.loads(data)[self.cls.COLLECTION_NAME]
+        for x, d in zip(s, expected):
+            assert isinstance(x, self.cls)
+            assert x.snapshot_id == d['snapshotId']
+            assert x.name == d['name']
+
+    @httprettified
+    def test_iter_all_error(self):
+        """test Snapshot.iter_all() raises SnapshotException on errors"""
+
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url,
+            body='{"error": {"message": "Access denied"}}',
+            status=403,
+            content_type="application/json")
+
+        with self.assertRaises(rsrc.SnapshotException):
+            self.cls.iter_all()
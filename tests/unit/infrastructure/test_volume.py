@@ -50,6 +50,58 @@ class TestVolume(unittest.TestCase):
         for x in s:
             assert isinstance(x, self.cls)
 
+    @httprettified
+    def test_has_all_parallel(self):
+        '''Volume.all(parallel=N) loads each Volume concurrently'''
+
+        with open(self.json_file) as f:
+            data = f.read()
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url,
+            body=data,
+            status=200,
+            content_type="application/json")
+
+        for d in self.raw_data[self.cls.COLLECTION_NAME]:
+            rec = {self.cls.COLLECTION_NAME:[d]}
+            u = self.es_url+'/'+str(d['volumeId'])
+            HTTPretty.register_uri(HTTPretty.GET,
+                    u,
+                    body=json.dumps(rec),
+                    status=200,
+                    content_type="application/json")
+
+        s = self.cls.all(parallel=4)
+        assert len(s) == 17
+        for x in s:
+            assert x.last_error is None
+            assert 'loaded' in x.__dict__
+
+    @httprettified
+    def test_load_many_collects_errors(self):
+        '''Volume.load_many() loads every volume and reports failures'''
+
+        for d in self.raw_data[self.cls.COLLECTION_NAME]:
+            rec = {self.cls.COLLECTION_NAME:[d]}
+            u = self.es_url+'/'+str(d['volumeId'])
+            HTTPretty.register_uri(HTTPretty.GET,
+                    u,
+                    body=json.dumps(rec),
+                    status=200,
+                    content_type="application/json")
+        HTTPretty.register_uri(HTTPretty.GET,
+                self.es_url+'/99999',
+                body='{"error": {"message": "No such volume: 99999"}}',
+                status=404,
+                content_type="application/json")
+
+        ids = [d['volumeId'] for d in self.raw_data[self.cls.COLLECTION_NAME]] + [99999]
+        volumes = [self.cls(i) for i in ids]
+        errors = self.cls.load_many(volumes, workers=4)
+        assert errors == {99999: 'No such volume: 99999'}
+        assert volumes[0].size_in_gb is not None
+        assert volumes[-1].last_error == 'No such volume: 99999'
+
     @httprettified
     def test_has_all_keys_only(self):
         '''Volume.all(keys_only=True) returns a list of keys'''
@@ -0,0 +1,152 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import argparse
+import json
+import shutil
+import tempfile
+from StringIO import StringIO
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+from mock import patch
+
+import mixcoatl.connection as connection
+from mixcoatl import bulk
+from mixcoatl.admin.job import Job
+from mixcoatl.infrastructure.server import Server
+from mixcoatl.settings.load_settings import settings
+
+class TestBulkAction(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.es_url = '%s/%s' % (settings.endpoint, Server.PATH)
+        self.job_url = '%s/%s' % (settings.endpoint, Job.PATH)
+        with open('../../tests/data/unit/admin/job.json') as f:
+            self.jobs = json.load(f)
+        self.tmp = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.tmp, 'stop.state')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def register(self, server_id, job_id=None, error=None):
+        if error is not None:
+            HTTPretty.register_uri(HTTPretty.PUT, '%s/%s' % (self.es_url, server_id),
+                body=json.dumps({'error': {'message': error}}), status=400)
+        else:
+            HTTPretty.register_uri(HTTPretty.PUT, '%s/%s' % (self.es_url, server_id),
+                body=json.dumps({'jobs': [{'jobId': job_id, 'status': 'RUNNING'}]}), status=202)
+        if job_id is not None:
+            data = {'jobs': [j for j in self.jobs['jobs'] if j['jobId'] == job_id]}
+            HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (self.job_url, job_id),
+                body=json.dumps(data))
+
+    @httprettified
+    def test_run(self):
+        '''test each resource is acted on and its outcome recorded'''
+        self.register(1001, 1)
+        self.register(1002, 2)
+        self.register(1003, error='Server is not running')
+        action = bulk.BulkAction(Server, 'stop', [1001, 1002, 1003], workers=2)
+        assert action.run() == {'succeeded': 0, 'started': 2, 'failed': 1, 'skipped': 0}
+        assert action.results[1001]['job_id'] == 1
+        assert action.failed() == {1003: 'Server is not running'}
+
+    @httprettified
+    def test_wait(self):
+        '''test the jobs started are tracked to the end'''
+        self.register(1001, 1)
+        self.register(1002, 5)
+        HTTPretty.register_uri(HTTPretty.GET, self.job_url, body=json.dumps(self.jobs))
+        action = bulk.BulkAction(Server, 'stop', [1001, 1002], wait=True)
+        assert action.run(timeout=10) == {'succeeded': 1, 'started': 0, 'failed': 1, 'skipped': 0}
+        assert action.failed() == {1002: 'kaboom!'}
+
+    @httprettified
+    def test_resume(self):
+        '''test a run resumes from the state file of an interrupted one'''
+        self.register(1003, 3)
+        action = bulk.BulkAction(Server, 'stop', [1001, 1002, 1003], state_file=self.state_file)
+        with open(self.state_file, 'w') as f:
+            f.write(json.dumps({'id': 1001, 'action': 'stop', 'status': 'succeeded'}) + '\n')
+            f.write(json.dumps({'id': 1002, 'action': 'stop', 'status': 'started', 'job_id': 2}) + '\n')
+            f.write('{"id": 1003, "act')
+        assert action.run() == {'succeeded': 0, 'started': 2, 'failed': 0, 'skipped': 1}
+        assert action.skipped == [1001]
+        assert action.results[1002]['job_id'] == 2
+        puts = [r for r in HTTPretty.latest_requests if r.method == 'PUT']
+        assert [r.path.split('/')[-1] for r in puts] == ['1003']
+        with open(self.state_file) as f:
+            assert json.loads(f.readlines()[-1])['id'] == 1003
+
+    def test_unknown_action(self):
+        '''test actions the class does not support are refused'''
+        with self.assertRaises(bulk.BulkActionException):
+            bulk.BulkAction(Job, 'pause', [1])
+
+class TestSelection(unittest.TestCase):
+
+    def test_read_ids(self):
+        '''test ids are read one per line, skipping comments and blanks'''
+        f = tempfile.NamedTemporaryFile(delete=False)
+        f.write('# dev servers\n1001\n\n  1002 \nabc\n')
+        f.close()
+        try:
+            assert bulk.read_ids(f.name) == [1001, 1002, 'abc']
+        finally:
+            os.unlink(f.name)
+
+    def test_parse_filters(self):
+        '''test FIELD=PATTERN filters are parsed'''
+        assert bulk.parse_filters(['name=dev-*', 'region.name = us-*']) == \
+            {'name': 'dev-*', 'region.name': 'us-*'}
+        with self.assertRaises(bulk.BulkActionException):
+            bulk.parse_filters(['name'])
+
+    @httprettified
+    def test_select(self):
+        '''test resources are selected by matching fields of the listing'''
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            data = json.load(f)
+        HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (settings.endpoint, Server.PATH),
+            body=json.dumps(data))
+        first = data['servers'][0]
+        expected = [s['serverId'] for s in data['servers'] if s['status'] == first['status'] and
+                    s['region']['name'] == first['region']['name']]
+        keys = bulk.select(Server, {'status': first['status'], 'region.name': first['region']['name']})
+        assert keys == expected
+        assert bulk.select(Server, {'status': first['status']}, ids=[first['serverId']]) == \
+            [first['serverId']]
+        assert bulk.select(Server, {'name': 'no-such-server-*'}) == []
+
+    def run_from_args(self, action, argv):
+        parser = argparse.ArgumentParser()
+        bulk.add_arguments(parser)
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            status = bulk.run_from_args(Server, action, parser.parse_args(argv))
+        return status, stdout.getvalue()
+
+    @httprettified
+    def test_destructive_filter_needs_yes(self):
+        '''test a filtered terminate only prints the selection without --yes or with --dry-run'''
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            data = json.load(f)
+        HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (settings.endpoint, Server.PATH),
+            body=json.dumps(data))
+        keys = [s['serverId'] for s in data['servers']]
+        status, out = self.run_from_args('terminate', ['--filter', 'name=*'])
+        assert status == 1
+        assert out.splitlines()[:len(keys)] == [str(k) for k in keys]
+        assert '--yes' in out
+        status, out = self.run_from_args('stop', ['--filter', 'name=*', '--dry-run'])
+        assert status == 0
+        assert out.splitlines()[-1] == '%d selected to stop' % len(keys)
+        assert [r.method for r in HTTPretty.latest_requests] == ['GET', 'GET']
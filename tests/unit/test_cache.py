@@ -0,0 +1,279 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+import shutil
+import tempfile
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+from mock import patch
+
+import mixcoatl.cache as cache
+import mixcoatl.connection as connection
+from mixcoatl.admin.group import Group
+from mixcoatl.geography.region import Region
+from mixcoatl.settings.load_settings import settings
+import tests.data.region as region_data
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = cache.ResponseCache(size=2, ttls={'admin/Job': 60})
+
+    def test_resource_type(self):
+        '''test resource_type() strips ids from paths'''
+        assert cache.resource_type('infrastructure/Server/1234') == 'infrastructure/Server'
+        assert cache.resource_type('geography/Region') == 'geography/Region'
+
+    def test_uncacheable_type_has_no_key(self):
+        '''test types without a TTL are not cached'''
+        assert self.cache.key('infrastructure/Server', {}, 'basic') is None
+
+    def test_key_includes_details_and_params(self):
+        '''test keys differ by params and detail level'''
+        k1 = self.cache.key('admin/Job', {'a': 1, 'b': 2}, 'basic')
+        k2 = self.cache.key('admin/Job', {'b': 2, 'a': 1}, 'basic')
+        k3 = self.cache.key('admin/Job', {'a': 1, 'b': 2}, 'extended')
+        assert k1 == k2
+        assert k1 != k3
+        assert settings.access_key in k1
+
+    def test_expiry(self):
+        '''test entries expire after their TTL'''
+        key = self.cache.key('admin/Job', None, 'basic')
+        with patch('time.time', return_value=1000):
+            self.cache.put(key, 'response')
+        with patch('time.time', return_value=1059):
+            assert self.cache.get(key) == 'response'
+        with patch('time.time', return_value=1061):
+            assert self.cache.get(key) is None
+        assert self.cache.hits == 1
+        assert self.cache.misses == 1
+
+    def test_lru_eviction(self):
+        '''test the least recently used entry is evicted'''
+        keys = [self.cache.key('admin/Job/%d' % i, None, 'basic') for i in range(3)]
+        self.cache.put(keys[0], 0)
+        self.cache.put(keys[1], 1)
+        self.cache.get(keys[0])
+        self.cache.put(keys[2], 2)
+        assert self.cache.get(keys[1]) is None
+        assert self.cache.get(keys[0]) == 0
+        assert self.cache.evictions == 1
+
+    def test_invalidate(self):
+        '''test invalidate() drops every entry of a resource type'''
+        self.cache.put(self.cache.key('admin/Job', None, 'basic'), 0)
+        self.cache.put(self.cache.key('admin/Job/1', None, 'basic'), 1)
+        self.cache.invalidate('admin/Job/1')
+        assert len(self.cache) == 0
+        assert self.cache.invalidations == 2
+
+class TestCachedRequests(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.cache = cache.enable()
+        self.cache.set_ttl(Group.PATH, 60)
+        self.es_url = '%s/%s' % (settings.endpoint, Group.PATH)
+
+    def tearDown(self):
+        cache.disable()
+
+    @httprettified
+    def test_reference_data_is_cached(self):
+        '''test Region.all() is answered from the cache the second time'''
+        HTTPretty.register_uri(HTTPretty.GET,
+            '%s/%s' % (settings.endpoint, Region.PATH),
+            body=json.dumps(region_data.all_regions),
+            status=200,
+            content_type="application/json")
+        first = Region.all()
+        second = Region.all()
+        assert [x.region_id for x in first] == [x.region_id for x in second]
+        assert self.cache.stats()['hits'] == 1
+        assert self.cache.stats()['misses'] == 1
+
+    @httprettified
+    def test_write_invalidates(self):
+        '''test a PUT drops cached responses of the same type'''
+        with open('../../tests/data/unit/admin/group.json') as f:
+            data = f.read()
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url,
+            body=data,
+            status=200,
+            content_type="application/json")
+        HTTPretty.register_uri(HTTPretty.PUT,
+            self.es_url + '/9848',
+            status=204,
+            content_type="application/json")
+        Group.all()
+        Group.all()
+        g = Group(9848)
+        g.put(g.PATH + '/9848', data='{}')
+        Group.all()
+        stats = self.cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+        assert stats['invalidations'] == 1
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'mixcoatl', 'responses.db')
+        self.cache = cache.DiskCache(path=self.path, ttls={'admin/Job': 60})
+        self.response = cache.CachedResponse(200, {'content-type': 'application/json'},
+                                             '{"jobs":[]}', 'https://example.com/admin/Job')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_defaults_include_groups_and_billing_codes(self):
+        '''test the disk cache keeps groups and billing codes'''
+        assert self.cache.key('admin/Group', None, 'basic') is not None
+        assert self.cache.key('admin/BillingCode', None, 'basic') is not None
+        assert self.cache.key('infrastructure/Server', None, 'basic') is None
+
+    def test_shared_between_instances(self):
+        '''test a response stored by one DiskCache is read by another'''
+        key = self.cache.key('admin/Job', None, 'basic')
+        self.cache.put(key, self.response)
+        cached = cache.DiskCache(path=self.path, ttls={'admin/Job': 60}).get(key)
+        assert cached.status_code == 200
+        assert cached.content == '{"jobs":[]}'
+        assert cached.headers['content-type'] == 'application/json'
+
+    def test_expiry(self):
+        '''test entries expire after their TTL'''
+        key = self.cache.key('admin/Job', None, 'basic')
+        with patch('time.time', return_value=1000):
+            self.cache.put(key, self.response)
+        with patch('time.time', return_value=1059):
+            assert self.cache.get(key) is not None
+        with patch('time.time', return_value=1061):
+            assert self.cache.get(key) is None
+        assert self.cache.hits == 1
+        assert self.cache.misses == 1
+
+    def test_refresh(self):
+        '''test refresh ignores cached responses'''
+        key = self.cache.key('admin/Job', None, 'basic')
+        self.cache.put(key, self.response)
+        self.cache.refresh = True
+        assert self.cache.get(key) is None
+
+    def test_invalidate(self):
+        '''test invalidate() drops every entry of a resource type'''
+        self.cache.put(self.cache.key('admin/Job', None, 'basic'), self.response)
+        self.cache.put(self.cache.key('admin/Job/1', None, 'basic'), self.response)
+        self.cache.invalidate('admin/Job/1')
+        assert len(self.cache) == 0
+        assert self.cache.invalidations == 2
+
+    def test_errors_are_ignored(self):
+        '''test database errors count as errors instead of failing'''
+        os.remove(self.path)
+        os.mkdir(self.path)
+        key = self.cache.key('admin/Job', None, 'basic')
+        self.cache.put(key, self.response)
+        assert self.cache.get(key) is None
+        assert self.cache.errors == 2
+        self.cache.clear()
+        assert self.cache.stats()['entries'] == 0
+        assert self.cache.errors == 4
+        cache.invalidate_disk('admin/Job', db=self.path)
+
+class TestDiskCachedRequests(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'responses.db')
+
+    def tearDown(self):
+        cache.disable()
+        cache.disable_disk()
+        shutil.rmtree(self.dir)
+
+    def register_regions(self):
+        HTTPretty.register_uri(HTTPretty.GET,
+            '%s/%s' % (settings.endpoint, Region.PATH),
+            body=json.dumps(region_data.all_regions),
+            status=200,
+            content_type="application/json")
+
+    @httprettified
+    def test_warm_start(self):
+        '''test a later run is answered from the disk and fills the memory cache'''
+        self.register_regions()
+        cache.enable_disk(path=self.path)
+        first = Region.all()
+        memory = cache.enable()
+        disk = cache.enable_disk(path=self.path)
+        second = Region.all()
+        third = Region.all()
+        assert [x.region_id for x in first] == [x.region_id for x in second]
+        assert [x.region_id for x in first] == [x.region_id for x in third]
+        assert disk.stats()['hits'] == 1
+        assert memory.stats()['hits'] == 1
+        assert memory.stats()['misses'] == 1
+
+    @httprettified
+    def test_refresh_stores_fresh_response(self):
+        '''test --refresh fetches again and updates the disk cache'''
+        self.register_regions()
+        cache.enable_disk(path=self.path)
+        Region.all()
+        disk = cache.enable_disk(path=self.path, refresh=True)
+        Region.all()
+        assert disk.stats()['hits'] == 0
+        assert disk.stats()['entries'] == 1
+
+    @httprettified
+    def test_write_without_disk_cache_invalidates(self):
+        '''test a write from a process not using the disk cache refreshes cached listings'''
+        with open('../../tests/data/unit/admin/group.json') as f:
+            data = f.read()
+        HTTPretty.register_uri(HTTPretty.GET,
+            '%s/%s' % (settings.endpoint, Group.PATH),
+            body=data,
+            status=200,
+            content_type="application/json")
+        HTTPretty.register_uri(HTTPretty.PUT,
+            '%s/%s/9848' % (settings.endpoint, Group.PATH),
+            status=204,
+            content_type="application/json")
+        with patch.object(settings, 'cache_dir', self.dir):
+            cache.enable_disk()
+            Group.all()
+            cache.disable_disk()
+            g = Group(9848)
+            g.put(g.PATH + '/9848', data='{}')
+            disk = cache.enable_disk()
+            Group.all()
+        assert disk.stats()['hits'] == 0
+        assert disk.stats()['misses'] == 1
+
+    def test_use_disk_cache_resets_refresh(self):
+        '''test a command after one run with --refresh reads the shared disk cache again'''
+        with patch.object(settings, 'cache_dir', self.dir):
+            settings.set_disk_cache('1')
+            disk = cache.use_disk_cache(refresh=True)
+            assert disk.refresh
+            assert cache.use_disk_cache() is disk
+            assert not disk.refresh
+
+    def test_use_disk_cache_respects_setting(self):
+        '''test ES_DISK_CACHE=0 keeps command line tools off the disk'''
+        settings.set_disk_cache('0')
+        assert cache.use_disk_cache() is None
+        assert cache.get_caches() == []
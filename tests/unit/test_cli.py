@@ -0,0 +1,86 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import shutil
+import tempfile
+from StringIO import StringIO
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch
+
+from mixcoatl import cli
+
+class TestCLI(unittest.TestCase):
+
+    def setUp(self):
+        self.bin = tempfile.mkdtemp()
+        self.directories = [self.bin]
+        self.script('echo', "import sys\nsys.stdout.write(' '.join(sys.argv) + '\\n')\n")
+        self.script('count', "import mixcoatl\n"
+                             "mixcoatl.cli_test_runs = getattr(mixcoatl, 'cli_test_runs', 0) + 1\n")
+        self.script('fail', "if __name__ == '__main__':\n    raise SystemExit(3)\n")
+        self.script('raise', "raise ValueError('boom')\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.bin)
+
+    def script(self, name, body):
+        with open(os.path.join(self.bin, 'dcm-' + name), 'w') as f:
+            f.write(body)
+
+    def test_commands(self):
+        '''test subcommands are the dcm-* tools without their prefix'''
+        assert cli.commands(self.directories) == ['count', 'echo', 'fail', 'raise']
+        assert cli.find('dcm-echo', self.directories) == os.path.join(self.bin, 'dcm-echo')
+        self.assertRaises(cli.CLIException, cli.find, 'nothing', self.directories)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run(self, stdout):
+        '''test a tool runs with its own argv and the exit status is returned'''
+        argv = sys.argv
+        assert cli.run(['echo', '-a', 'b c'], self.directories) == 0
+        assert stdout.getvalue() == '%s -a b c\n' % os.path.join(self.bin, 'dcm-echo')
+        assert sys.argv is argv
+
+    @patch('mixcoatl.cli.runpy', new=object())
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run_without_run_path(self, stdout, stderr):
+        '''test tools still run on Python 2.6, which has no runpy.run_path'''
+        assert cli.run(['echo', '-a'], self.directories) == 0
+        assert stdout.getvalue() == '%s -a\n' % os.path.join(self.bin, 'dcm-echo')
+        assert cli.run(['fail'], self.directories) == 3
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_failures(self, stderr):
+        '''test exits and exceptions become exit statuses'''
+        assert cli.run(['fail'], self.directories) == 3
+        assert cli.run(['raise'], self.directories) == 1
+        assert 'boom' in stderr.getvalue()
+        assert cli.run(['nothing'], self.directories) == 127
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_batch(self, stderr):
+        '''test a batch runs every command in this process and stops at the first failure'''
+        import mixcoatl
+        mixcoatl.cli_test_runs = 0
+        lines = ['count', '# a comment', '', 'count  # twice', 'fail', 'count']
+        assert cli.batch(lines, directories=self.directories) == 3
+        assert mixcoatl.cli_test_runs == 2
+        assert cli.batch(lines, keep_going=True, echo=True, directories=self.directories) == 3
+        assert mixcoatl.cli_test_runs == 5
+        assert '+ dcm fail' in stderr.getvalue()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_shell(self, stdout):
+        '''test the shell runs one command per line'''
+        shell = cli.Shell(self.directories, stdin=StringIO('echo one\n\nfail\nexit\n'), stdout=stdout)
+        shell.use_rawinput = False
+        shell.cmdloop('')
+        assert 'dcm-echo one' in stdout.getvalue()
+        assert shell.status == 3
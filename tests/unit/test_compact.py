@@ -0,0 +1,68 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+
+import mixcoatl.compact as compact
+import mixcoatl.connection as connection
+from mixcoatl.infrastructure.server import Server
+from mixcoatl.settings.load_settings import settings
+
+class TestCompact(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.cls = Server.compact()
+        self.es_url = '%s/%s' % (settings.endpoint, Server.PATH)
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.data = f.read()
+
+    def tearDown(self):
+        settings.set_debug('0')
+
+    def test_compact_class(self):
+        '''test compact() builds one slot-based class per resource class'''
+        assert Server.compact() is self.cls
+        assert self.cls.COMPACT
+        assert '_Server__status' in self.cls.__slots__
+        assert self.cls.schema() is Server.schema()
+
+    def test_hydrate_interns_strings(self):
+        '''test compact resources share repeated strings'''
+        servers = self.cls.from_collection(json.loads(self.data))
+        running = [x for x in servers if x.status == 'RUNNING']
+        assert len(running) > 1
+        assert running[0].status is running[1].status
+        assert running[0].to_dict() == Server.from_collection(json.loads(self.data))[
+            servers.index(running[0])].to_dict()
+
+    def test_intern_value_keeps_types(self):
+        '''test intern_value() does not mix str and unicode'''
+        assert type(compact.intern_value(u'abc')) is unicode
+        assert type(compact.intern_value('abc')) is str
+
+    @httprettified
+    def test_load_drops_response(self):
+        '''test a compact resource keeps no response body unless debugging'''
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url + '/331810',
+            body=self.data,
+            status=200,
+            content_type="application/json")
+        s = self.cls(331810)
+        assert s.name is not None
+        assert s.last_request.status_code == 200
+        assert s.last_request.content is None
+        settings.set_debug('1')
+        t = self.cls(331810)
+        assert t.name is not None
+        assert t.last_request.content == self.data
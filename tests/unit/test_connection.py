@@ -0,0 +1,65 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import threading
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+import mock
+
+import mixcoatl.connection as connection
+from mixcoatl.resource import Resource
+from mixcoatl.settings.load_settings import settings
+
+class TestConnection(unittest.TestCase):
+
+    def tearDown(self):
+        settings.set_keep_alive('1')
+        connection.close_all()
+
+    def test_session_reused_in_thread(self):
+        '''test get_session() returns the same session within a thread'''
+        assert connection.get_session() is connection.get_session()
+
+    def test_session_per_thread(self):
+        '''test get_session() returns a distinct session per thread'''
+        sessions = []
+        def worker():
+            sessions.append(connection.get_session())
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert sessions[0] is not connection.get_session()
+
+    def test_close_session(self):
+        '''test close_session() discards the current thread's session'''
+        s = connection.get_session()
+        connection.close_session()
+        assert connection.get_session() is not s
+
+    def test_keep_alive_disabled(self):
+        '''test ES_KEEP_ALIVE=0 sends Connection: close'''
+        settings.set_keep_alive('0')
+        connection.close_all()
+        assert connection.get_session().headers['Connection'] == 'close'
+
+    @httprettified
+    def test_resource_uses_pooled_session(self):
+        '''test Resource requests go through the pooled session'''
+        HTTPretty.register_uri(HTTPretty.GET,
+            '%s/%s' % (settings.endpoint, 'admin/Job'),
+            body='{"jobs":[]}',
+            status=200,
+            content_type="application/json")
+        r = Resource('admin/Job')
+        with mock.patch.object(connection, 'get_session', wraps=connection.get_session) as gs:
+            r.get()
+            r.get()
+        assert r.last_error is None
+        assert gs.call_count == 2
@@ -0,0 +1,124 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from StringIO import StringIO
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch
+
+from mixcoatl import daemon
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'dcm.sock')
+        with open(os.path.join(self.dir, 'dcm-echo'), 'w') as f:
+            f.write("from mixcoatl import daemon\n"
+                    "daemon.forward()\n"
+                    "import os, sys\n"
+                    "print ' '.join(sys.argv[1:]), os.getcwd()\n"
+                    "sys.stderr.write('done\\n')\n"
+                    "sys.exit(4)\n")
+        self.interval = daemon.POLL_INTERVAL
+        daemon.POLL_INTERVAL = 0.05
+        self.daemon = daemon.Daemon(self.path, [self.dir])
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve)
+        self.thread.daemon = True
+        self.thread.start()
+        while not daemon._serving:
+            time.sleep(0.01)
+        self.out = StringIO()
+        self.err = StringIO()
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.thread.join(5)
+        daemon.POLL_INTERVAL = self.interval
+        shutil.rmtree(self.dir)
+
+    def test_call(self):
+        '''test a command runs in the daemon with its output and exit status relayed'''
+        code = daemon.call(['dcm-echo', 'a', 'b'], self.path, self.out, self.err)
+        assert code == 4
+        assert self.out.getvalue() == 'a b %s\n' % os.getcwd()
+        assert self.err.getvalue() == 'done\n'
+        assert daemon.call(['dcm-echo'], self.path, self.out, self.err) == 4
+        assert self.daemon.commands == 2
+
+    def test_fallback(self):
+        '''test commands run on their own without a daemon, with stdin or with other settings'''
+        assert daemon.call(['dcm-echo'], os.path.join(self.dir, 'none.sock')) is None
+        assert daemon.call(['dcm-echo', '--ids-from-file', '-'], self.path) is None
+        reply = daemon.request({'argv': ['dcm-echo'], 'key': 'other'}, self.path, self.out, self.err)
+        assert reply['exit'] is None
+        assert self.daemon.commands == 0
+
+    def test_fingerprint(self):
+        '''test commands with other retry, rate limit or cache settings are not forwarded'''
+        from mixcoatl.settings.load_settings import settings
+        key = daemon.fingerprint()
+        retries = settings.retries
+        settings.set_retries(retries + 1)
+        try:
+            assert daemon.fingerprint() != key
+        finally:
+            settings.set_retries(retries)
+        assert daemon.fingerprint() == key
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_not_forwarded_in_process(self, stdout, stderr):
+        '''test tools run by dcm batch or dcm shell run in that process'''
+        from mixcoatl import cli
+        # The daemon serving in the thread above is not this process serving
+        with patch.object(daemon, '_serving', False):
+            with patch.dict(os.environ, {'ES_DAEMON_SOCKET': self.path}):
+                assert cli.run(['echo', 'here'], [self.dir]) == 4
+            assert not daemon._serving
+        assert stdout.getvalue() == 'here %s\n' % os.getcwd()
+        assert self.daemon.commands == 0
+
+    def test_forward_without_daemon(self):
+        '''test forward() reads no settings when there is no socket'''
+        with patch.dict(os.environ, {'ES_DAEMON_SOCKET': os.path.join(self.dir, 'none.sock')}):
+            with patch.object(daemon, '_settings') as settings:
+                with patch.object(daemon, 'call') as call:
+                    daemon.forward()
+        assert not settings.called
+        assert not call.called
+
+    def test_stop(self):
+        '''test --status and --stop'''
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            assert daemon.main(['--socket', self.path, '--status']) == 0
+        assert 'has run 0 commands' in stdout.getvalue()
+        with self.assertRaises(daemon.DaemonException):
+            daemon.Daemon(self.path).bind()
+        assert daemon.main(['--socket', self.path, '--stop']) == 0
+        self.thread.join(5)
+        assert not os.path.exists(self.path)
+        with patch('sys.stderr', new_callable=StringIO):
+            assert daemon.main(['--socket', self.path, '--stop']) == 1
+
+    def test_stale_socket(self):
+        '''test a socket left behind by a daemon that died is replaced'''
+        stale = os.path.join(self.dir, 'stale.sock')
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.bind(stale)
+        s.close()
+        other = daemon.Daemon(stale)
+        other.bind()
+        other.stop()
+        assert not os.path.exists(stale)
@@ -0,0 +1,85 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+from mock import patch
+
+import mixcoatl.connection as connection
+from mixcoatl import directory
+from mixcoatl import resource_utils
+from mixcoatl.admin.billing_code import BillingCode
+from mixcoatl.admin.group import Group
+from mixcoatl.admin.user import User
+from mixcoatl.directory import Directory, DirectoryException
+from mixcoatl.settings.load_settings import settings
+
+class TestDirectory(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        for cls, name in [(Group, 'group'), (BillingCode, 'billing_code'), (User, 'user')]:
+            with open('../../tests/data/unit/admin/%s.json' % name) as f:
+                setattr(self, name, f.read())
+        self.directory = Directory(ttl=60)
+
+    def register(self):
+        HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (settings.endpoint, Group.PATH), body=self.group)
+        HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (settings.endpoint, BillingCode.PATH),
+            body=self.billing_code)
+        HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (settings.endpoint, User.PATH), body=self.user)
+
+    @httprettified
+    def test_lookups(self):
+        '''test lookups list each kind once'''
+        self.register()
+        assert self.directory.group_id('Development') == 9848
+        assert self.directory.group_id('Admin') == 9465
+        assert self.directory.budget_id('Test') == 10670
+        assert self.directory.budget_name('10670') == 'Test'
+        assert self.directory.user(email='john.vincent@domain.com').user_id == 6789
+        assert self.directory.user(vm_login_id='p9876').email == 'bob.smith@domain.com'
+        assert self.directory.listings == 3
+        assert len(HTTPretty.latest_requests) == 3
+
+    @httprettified
+    def test_unknown(self):
+        '''test unknown names raise DirectoryException'''
+        self.register()
+        with self.assertRaises(DirectoryException):
+            self.directory.group_id('No such group')
+
+    @httprettified
+    def test_ttl(self):
+        '''test an index is listed again once it expires or is refreshed'''
+        self.register()
+        with patch('time.time') as now:
+            now.return_value = 1000
+            self.directory.group_id('Admin')
+            now.return_value = 1059
+            self.directory.group_id('Admin')
+            assert self.directory.listings == 1
+            now.return_value = 1060
+            self.directory.group_id('Admin')
+            assert self.directory.listings == 2
+        self.directory.refresh('group')
+        self.directory.group_id('Admin')
+        assert self.directory.listings == 3
+
+    @httprettified
+    def test_resource_utils(self):
+        '''test the resource_utils helpers share one directory'''
+        self.register()
+        with patch.object(directory, '_directory', self.directory):
+            assert resource_utils.get_group_id('Admin') == 9465
+            assert resource_utils.get_budget_id('Default') == 10287
+            assert resource_utils.get_vm_login_id(email='bob.smith@domain.com') == 'p9876'
+            assert resource_utils.get_group_id('Development') == 9848
+        assert self.directory.listings == 3
@@ -0,0 +1,85 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import csv
+import json
+from StringIO import StringIO
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+import mixcoatl.export as export
+from mixcoatl.infrastructure.server import Server
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.servers = Server.from_collection(json.load(f))
+        self.out = StringIO()
+
+    def test_to_dict_fields(self):
+        '''test to_dict() projects the requested fields'''
+        d = self.servers[0].to_dict(['server_id', 'status'])
+        assert d == {'server_id': self.servers[0].server_id, 'status': self.servers[0].status}
+        self.assertRaises(AttributeError, self.servers[0].to_dict, ['no_such_field'])
+
+    def test_to_json(self):
+        '''test to_json() matches to_dict()'''
+        s = self.servers[0]
+        assert json.loads(s.to_json(['server_id', 'region'])) == s.to_dict(['server_id', 'region'])
+
+    def test_default_fields(self):
+        '''test exports start with the primary key and skip request state'''
+        fields = export.default_fields(self.servers[0])
+        assert fields[0] == 'server_id'
+        assert 'last_request' not in fields
+
+    def test_ndjson(self):
+        '''test write_ndjson() writes one object per line from a generator'''
+        n = export.write_ndjson((s for s in self.servers), self.out, fields=['server_id', 'name'])
+        lines = self.out.getvalue().splitlines()
+        assert n == len(self.servers) == len(lines)
+        assert json.loads(lines[0]) == {'server_id': self.servers[0].server_id, 'name': self.servers[0].name}
+
+    def test_json(self):
+        '''test write_json() writes a valid array'''
+        n = export.export(self.servers, self.out, 'json')
+        data = json.loads(self.out.getvalue())
+        assert n == len(data) == len(self.servers)
+        assert data[0]['server_id'] == self.servers[0].server_id
+
+    def test_csv(self):
+        '''test write_csv() writes a header and JSON encoded nested values'''
+        export.export(self.servers, self.out, 'csv', fields=['server_id', 'status', 'region'])
+        rows = list(csv.reader(StringIO(self.out.getvalue())))
+        assert rows[0] == ['server_id', 'status', 'region']
+        assert len(rows) == len(self.servers) + 1
+        assert json.loads(rows[1][2])['region_id'] == self.servers[0].region['region_id']
+
+    def test_empty(self):
+        '''test exporting nothing'''
+        assert export.write_csv([], self.out) == 0
+        assert export.write_json([], self.out) == 0
+        assert json.loads(self.out.getvalue()) == []
+
+    def test_unknown_format(self):
+        '''test an unknown format raises ExportException'''
+        self.assertRaises(export.ExportException, export.export, self.servers, self.out, 'xml')
+
+    def test_tsv(self):
+        '''test tsv writes tab separated rows'''
+        export.export(self.servers, self.out, 'tsv', fields=['server_id', 'status'])
+        lines = self.out.getvalue().splitlines()
+        assert lines[1] == '%s\t%s' % (self.servers[0].server_id, self.servers[0].status)
+
+    def test_write_rows(self):
+        '''test write_rows() writes dicts, defaulting CSV columns to the keys of the first row'''
+        rows = [{'b': 2, 'a': 1}, {'a': 3}]
+        assert export.write_rows(iter(rows), self.out, 'csv') == 2
+        assert self.out.getvalue() == 'a,b\n1,2\n3,\n'
+        self.assertRaises(export.ExportException, export.write_rows, rows, self.out, 'xml')
@@ -0,0 +1,88 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import threading
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+from mixcoatl.futures import Future, CancelledError, TimeoutError
+from mixcoatl.futures import FIRST_COMPLETED, as_completed, wait
+
+class TestFuture(unittest.TestCase):
+
+    def test_result(self):
+        '''test result() waits for a result set from another thread'''
+        f = Future()
+        threading.Timer(0.05, f.set_result, [42]).start()
+        assert f.result(timeout=5) == 42
+        assert f.done()
+        assert f.exception() is None
+
+    def test_exception(self):
+        '''test result() raises the exception of the operation'''
+        f = Future()
+        f.set_exception(ValueError('bad'))
+        with self.assertRaises(ValueError):
+            f.result()
+        assert isinstance(f.exception(), ValueError)
+
+    def test_timeout(self):
+        '''test result() gives up after timeout'''
+        with self.assertRaises(TimeoutError):
+            Future().result(timeout=0.01)
+
+    def test_cancel(self):
+        '''test a pending future can be cancelled but a running one cannot'''
+        f = Future()
+        assert f.cancel()
+        assert f.cancelled()
+        assert not f.set_running_or_notify_cancel()
+        with self.assertRaises(CancelledError):
+            f.result()
+        f = Future()
+        assert f.set_running_or_notify_cancel()
+        assert not f.cancel()
+
+    def test_done_callbacks(self):
+        '''test callbacks run once done, or right away when added later'''
+        called = []
+        f = Future()
+        f.add_done_callback(called.append)
+        f.add_done_callback(lambda x: 1 / 0)
+        f.set_result(1)
+        f.add_done_callback(called.append)
+        assert called == [f, f]
+
+class TestWait(unittest.TestCase):
+
+    def test_as_completed(self):
+        '''test as_completed() yields futures in the order they finish'''
+        first, second = Future(), Future()
+        threading.Timer(0.05, second.set_result, [2]).start()
+        threading.Timer(0.1, first.set_result, [1]).start()
+        assert [f.result() for f in as_completed([first, second], timeout=5)] == [2, 1]
+
+    def test_as_completed_timeout(self):
+        '''test as_completed() raises TimeoutError once the timeout passes'''
+        done, pending = Future(), Future()
+        done.set_result(1)
+        items = as_completed([done, pending], timeout=0.01)
+        assert items.next() is done
+        with self.assertRaises(TimeoutError):
+            items.next()
+
+    def test_wait(self):
+        '''test wait() splits the futures into done and not done'''
+        done, failed, pending = Future(), Future(), Future()
+        done.set_result(1)
+        failed.set_exception(ValueError('bad'))
+        result = wait([done, failed, pending], timeout=0.01)
+        assert result.done == set([done, failed])
+        assert result.not_done == set([pending])
+        result = wait([done, pending], return_when=FIRST_COMPLETED)
+        assert result.done == set([done])
@@ -0,0 +1,138 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import csv
+import json
+from StringIO import StringIO
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+
+import mixcoatl.connection as connection
+from mixcoatl import listing
+from mixcoatl.infrastructure.server import Server
+from mixcoatl.settings.load_settings import settings
+
+class TestListing(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.es_url = '%s/%s' % (settings.endpoint, Server.PATH)
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.data = json.load(f)
+        self.columns = [listing.Column('Server ID', 'server_id'),
+                        listing.Column('Region', 'region.name'),
+                        listing.Column('Owner', 'owning_user.email', default='Not Found')]
+
+    @httprettified
+    def test_full_listing(self):
+        '''test resources from a full listing are rendered without any other call'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, body=json.dumps(self.data))
+        rows = list(listing.rows(listing.project(Server.all(), self.columns), self.columns))
+        assert len(HTTPretty.latest_requests) == 1
+        assert [r[0] for r in rows] == [s['serverId'] for s in self.data['servers']]
+        assert rows[0][1] == self.data['servers'][0]['region']['name']
+
+    @httprettified
+    def test_basic_listing(self):
+        '''test resources listed without the fields rendered are loaded'''
+        first = self.data['servers'][0]
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url,
+            body=json.dumps({'servers': [{'serverId': first['serverId'], 'name': first['name']}]}))
+        HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (self.es_url, first['serverId']),
+            body=json.dumps({'servers': [first]}))
+        servers = list(listing.project(Server.all(detail='basic'), self.columns))
+        assert len(HTTPretty.latest_requests) == 2
+        assert servers[0].request_details == 'extended'
+        assert listing.Column('Region', 'region.name').value(servers[0]) == first['region']['name']
+
+    @httprettified
+    def test_unloaded(self):
+        '''test resources built from their id are loaded a page at a time'''
+        for s in self.data['servers']:
+            HTTPretty.register_uri(HTTPretty.GET, '%s/%s' % (self.es_url, s['serverId']),
+                body=json.dumps({'servers': [s]}))
+        servers = [Server(s['serverId']) for s in self.data['servers']]
+        table = listing.table(listing.project(servers, self.columns, page_size=5), self.columns)
+        assert len(HTTPretty.latest_requests) == len(servers)
+        # The header, three borders and a line per server
+        assert len(table.get_string().splitlines()) == len(servers) + 4
+
+    def test_columns(self):
+        '''test --fields, defaults, formats and fallback fields'''
+        columns = listing.parse_fields(' server_id, region.name,,')
+        assert [c.title for c in columns] == ['server_id', 'region.name']
+        server = Server()
+        server.hydrate({'server_id': 1, 'public_ip_addresses': ['10.0.0.1', '10.0.0.2']})
+        assert self.columns[2].value(server) == 'Not Found'
+        assert listing.Column('IP', ['public_ip_address', 'public_ip_addresses']).value(server) == \
+            '10.0.0.1,10.0.0.2'
+        assert listing.Column('ID', 'server_id', format=lambda v: v * 2).value(server) == 2
+
+class TestWrite(unittest.TestCase):
+
+    def setUp(self):
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.servers = Server.from_collection(json.load(f))
+        self.columns = [listing.Column('Server ID', 'server_id'),
+                        listing.Column('Status', 'status'),
+                        listing.Column('Region', 'region.name', key='region')]
+        self.out = StringIO()
+
+    def test_ndjson(self):
+        '''test ndjson rows are keyed by field'''
+        n = listing.write(self.servers, self.columns, 'ndjson', out=self.out)
+        lines = self.out.getvalue().splitlines()
+        assert n == len(lines) == len(self.servers)
+        assert json.loads(lines[0]) == {'server_id': self.servers[0].server_id,
+                                        'status': self.servers[0].status,
+                                        'region': self.servers[0].region['name']}
+
+    def test_csv_limit(self):
+        '''test --limit stops reading resources and --no-header drops the header'''
+        def servers():
+            for i, server in enumerate(self.servers):
+                assert i < 2
+                yield server
+        listing.write(servers(), self.columns, 'csv', limit=2, header=False, out=self.out)
+        rows = list(csv.reader(StringIO(self.out.getvalue())))
+        assert [int(r[0]) for r in rows] == [s.server_id for s in self.servers[:2]]
+
+    def test_sort(self):
+        '''test --sort orders by a column before --limit applies'''
+        listing.write(self.servers, self.columns, 'tsv', sort='-Server ID', limit=3, out=self.out)
+        lines = self.out.getvalue().splitlines()
+        assert lines[0] == 'server_id\tstatus\tregion'
+        assert [int(l.split('\t')[0]) for l in lines[1:]] == \
+            sorted([s.server_id for s in self.servers], reverse=True)[:3]
+        self.assertRaises(listing.ListingException, listing.write, self.servers, self.columns, sort='name')
+
+    def test_table(self):
+        '''test the table output and dict rows'''
+        groups = [{'group_id': 1, 'name': 'Admin'}, {'group_id': 2, 'name': 'Dev'}]
+        columns = [listing.Column('Group ID', 'group_id'), listing.Column('Group Name', 'name', align='l')]
+        assert listing.write(groups, columns, header=False, out=self.out) == 2
+        assert 'Group ID' not in self.out.getvalue()
+        assert 'Admin' in self.out.getvalue()
+
+    def test_from_args(self):
+        '''test the options parsed by add_arguments() and the default sort'''
+        import argparse
+        parser = argparse.ArgumentParser()
+        listing.add_arguments(parser, sort='Status')
+        cmd_args = parser.parse_args(['--output', 'ndjson', '--fields', 'server_id,name'])
+        listing.write_from_args(self.servers, self.columns, cmd_args, out=self.out)
+        lines = [json.loads(l) for l in self.out.getvalue().splitlines()]
+        assert [l['server_id'] for l in lines] == [s.server_id for s in self.servers]
+        assert sorted(lines[0].keys()) == ['name', 'server_id']
+        self.out.truncate(0)
+        cmd_args = parser.parse_args(['--output', 'csv'])
+        listing.write_from_args(self.servers, self.columns, cmd_args, out=self.out)
+        statuses = [r[1] for r in csv.reader(StringIO(self.out.getvalue()))][1:]
+        assert statuses == sorted(statuses)
@@ -0,0 +1,120 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+import threading
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+
+import mixcoatl.connection as connection
+import mixcoatl.paging as paging
+from mixcoatl.admin.job import Job
+from mixcoatl.settings.load_settings import settings
+from mixcoatl.stream import StreamException
+
+class TestPrefetch(unittest.TestCase):
+
+    def test_pages(self):
+        '''test pages() splits items into lists of page_size'''
+        assert list(paging.pages(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(paging.pages([], 2)) == []
+
+    def test_order(self):
+        '''test prefetch() yields every item in order'''
+        for depth in [0, 1, 3]:
+            assert list(paging.prefetch(iter(range(250)), 7, depth)) == range(250)
+
+    def test_produces_ahead(self):
+        '''test the next page is produced while the current one is consumed'''
+        produced = []
+        ready = threading.Event()
+
+        def _items():
+            for i in range(4):
+                produced.append(i)
+                if i == 3:
+                    ready.set()
+                yield i
+        items = paging.prefetch(_items(), page_size=2, prefetch=1)
+        assert items.next() == 0
+        assert ready.wait(5)
+        assert produced == [0, 1, 2, 3]
+        assert list(items) == [1, 2, 3]
+
+    def test_error(self):
+        '''test errors are raised after the pages before them'''
+        def _items():
+            yield 1
+            yield 2
+            raise ValueError('broken')
+        items = paging.prefetch(_items(), page_size=2)
+        assert items.next() == 1
+        assert items.next() == 2
+        with self.assertRaises(ValueError):
+            items.next()
+
+    def test_base_exception(self):
+        '''test mixcoatl exceptions, which derive from BaseException, reach the caller'''
+        def _items():
+            yield 1
+            raise StreamException('truncated')
+        items = paging.prefetch(_items(), page_size=1)
+        assert items.next() == 1
+        with self.assertRaises(StreamException):
+            items.next()
+
+    def test_close_stops_producer(self):
+        '''test closing the generator closes the items being paged'''
+        closed = threading.Event()
+
+        def _items():
+            try:
+                for i in xrange(1000000):
+                    yield i
+            finally:
+                closed.set()
+        items = paging.prefetch(_items(), page_size=10, prefetch=1)
+        assert items.next() == 0
+        items.close()
+        assert closed.wait(5)
+
+    def test_options(self):
+        '''test options() picks out the paging arguments'''
+        assert paging.options({'page_size': 5, 'detail': 'basic'}) == {'page_size': 5}
+
+class TestIterAll(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.es_url = '%s/%s' % (settings.endpoint, Job.PATH)
+        with open('../../tests/data/unit/admin/job.json') as f:
+            self.data = json.load(f)
+
+    @httprettified
+    def test_loads_pages(self):
+        '''test iter_all() lists the ids and loads each resource a page at a time'''
+        HTTPretty.register_uri(HTTPretty.GET,
+            self.es_url,
+            body=json.dumps(self.data),
+            status=200,
+            content_type="application/json")
+        for d in self.data[Job.COLLECTION_NAME]:
+            HTTPretty.register_uri(HTTPretty.GET,
+                '%s/%s' % (self.es_url, d['jobId']),
+                body=json.dumps({'jobs': [d]}),
+                status=200,
+                content_type="application/json")
+
+        jobs = list(Job.iter_all(page_size=2, workers=2))
+        assert [j.job_id for j in jobs] == [d['jobId'] for d in self.data['jobs']]
+        for j in jobs:
+            assert isinstance(j, Job)
+            assert j.last_error is None
+            assert j.status is not None
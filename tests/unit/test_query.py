@@ -0,0 +1,92 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+
+import mixcoatl.connection as connection
+from mixcoatl import query
+from mixcoatl import resource_utils
+from mixcoatl.infrastructure.server import Server
+from mixcoatl.infrastructure.volume import Volume
+from mixcoatl.settings.load_settings import settings
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.es_url = '%s/%s' % (settings.endpoint, Server.PATH)
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.data = json.load(f)
+
+    def expected(self, test):
+        return [s['serverId'] for s in self.data['servers'] if test(s)]
+
+    @httprettified
+    def test_query(self):
+        '''test filters are pushed to the listing or applied in one pass without loading'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, body=json.dumps(self.data))
+        servers = Server.query(region_id=19556, owner_email='jim.sander@enstratus.com',
+                               group_id=9465, budget_id='10287')
+        assert len(HTTPretty.latest_requests) == 1
+        assert 'regionId=19556' in HTTPretty.last_request.path
+        assert [s.server_id for s in servers] == self.expected(
+            lambda s: s.get('owningUser', {}).get('email') == 'jim.sander@enstratus.com' and
+                      9465 in [g['groupId'] for g in s.get('owningGroups', [])])
+
+    @httprettified
+    def test_values(self):
+        '''test values go through nested dicts and lists'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, body=json.dumps(self.data))
+        server = Server.all()[0]
+        assert query.values(server, 'group_id') == [9465]
+        assert query.values(server, 'region.provider_id') == ['ap-southeast-2']
+        assert query.values(server, 'no_such_field') == []
+
+    @httprettified
+    def test_tests(self):
+        '''test filters match lists of values and functions'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, body=json.dumps(self.data))
+        servers = Server.all()
+        found = query.select(servers, {'status': ['RUNNING', 'PAUSED'],
+                                       'name': lambda n: n.startswith('Sample')})
+        assert [s.server_id for s in found] == self.expected(
+            lambda s: s['status'] in ['RUNNING', 'PAUSED'] and s['name'].startswith('Sample'))
+
+    @httprettified
+    def test_collection(self):
+        '''test a collection answers queries from its indexes'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, body=json.dumps(self.data))
+        servers = query.Collection(Server.all())
+        assert len(servers.index('owner_email')['jim.sander@enstratus.com']) == 4
+        found = servers.query(owner_email=['jim.sander@enstratus.com', 'sean.kang@enstratus.com'],
+                              budget_id='10287', status=lambda s: s != 'TERMINATED')
+        assert [s.server_id for s in found] == self.expected(
+            lambda s: s.get('owningUser', {}).get('email') in ['jim.sander@enstratus.com',
+                                                                'sean.kang@enstratus.com'] and
+                      s['status'] != 'TERMINATED')
+        assert servers.query(group_id=1) == []
+
+    def test_split(self):
+        '''test only filters the listing takes are pushed down'''
+        pushed, rest = query.split(Volume, {'data_center_id': 3, 'region_id': [1, 2], 'budget_id': 4})
+        assert pushed == {'datacenter_id': 3}
+        assert rest == {'region_id': [1, 2], 'budget_id': 4}
+
+    @httprettified
+    def test_resource_utils(self):
+        '''test get_servers() filters in a single pass'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, body=json.dumps(self.data))
+        servers = resource_utils.get_servers(Server.all(), email='sean.kang@enstratus.com',
+                                             group_id='9465', vm_login_id=None)
+        assert [s.server_id for s in servers] == self.expected(
+            lambda s: s.get('owningUser', {}).get('email') == 'sean.kang@enstratus.com')
+        assert len(HTTPretty.latest_requests) == 1
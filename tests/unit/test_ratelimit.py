@@ -0,0 +1,112 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+import shutil
+import tempfile
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+from mock import patch
+
+import mixcoatl.connection as connection
+import mixcoatl.ratelimit as ratelimit
+from mixcoatl.exceptions import ConfigException
+from mixcoatl.geography.region import Region
+from mixcoatl.settings.load_settings import settings
+import tests.data.region as region_data
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        '''test a full bucket allows a burst and then one call per 1/rate seconds'''
+        with patch('time.time', return_value=1000):
+            bucket = ratelimit.TokenBucket(rate=2, burst=2)
+            waits = [bucket.reserve() for i in range(4)]
+        assert waits == [0, 0, 0.5, 1.0]
+        with patch('time.time', return_value=1002):
+            assert bucket.reserve() == 0
+
+    def test_default_burst(self):
+        '''test the burst defaults to the rate and at least one call'''
+        assert ratelimit.TokenBucket(rate=5).burst == 5
+        assert ratelimit.TokenBucket(rate=0.2).burst == 1
+
+class TestFileTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'limits', 'ratelimit')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_shared_between_processes(self):
+        '''test buckets on the same file draw from the same tokens'''
+        with patch('time.time', return_value=1000):
+            first = ratelimit.FileTokenBucket(self.path, rate=1, burst=2)
+            second = ratelimit.FileTokenBucket(self.path, rate=1, burst=2)
+            assert first.reserve() == 0
+            assert second.reserve() == 0
+            assert first.reserve() == 1
+            assert second.reserve() == 2
+
+class TestRateLimiter(unittest.TestCase):
+
+    def tearDown(self):
+        ratelimit.disable()
+
+    @patch('time.sleep')
+    def test_per_endpoint_limits(self, sleep):
+        '''test resource types with a limit of their own wait on it'''
+        limiter = ratelimit.RateLimiter(limits={'admin/Job': (1, 1)})
+        with patch('time.time', return_value=1000):
+            assert limiter.acquire('admin/Job/1') == 0
+            assert limiter.acquire('admin/Job') == 1
+            assert limiter.acquire('geography/Region') == 0
+        sleep.assert_called_once_with(1)
+        assert limiter.stats() == {'requests': 3, 'throttled': 1, 'waited': 1}
+
+    def test_overall_limit_applies_to_every_call(self):
+        '''test the overall limit is shared by every resource type'''
+        limiter = ratelimit.RateLimiter(rate=1, burst=1, limits={'admin/Job': 100})
+        with patch('time.time', return_value=1000):
+            assert limiter.limits()[None].reserve() == 0
+            with patch('time.sleep'):
+                assert limiter.acquire('admin/Job') == 1
+
+    def test_settings(self):
+        '''test ES_RATE_LIMITS is parsed into rates and bursts'''
+        settings.set_rate_limits('infrastructure/Server=2, admin/Job=5:10')
+        try:
+            assert settings.rate_limits == {'infrastructure/Server': (2,), 'admin/Job': (5, 10)}
+            limiter = ratelimit.get_limiter()
+            assert limiter.limits()['admin/Job'].burst == 10
+            assert None not in limiter.limits()
+        finally:
+            settings.set_rate_limits({})
+        with self.assertRaises(ConfigException):
+            settings.set_rate_limits('admin/Job')
+
+    @httprettified
+    @patch('time.sleep')
+    def test_requests_are_limited(self, sleep):
+        '''test API calls take a token before they are made'''
+        connection.close_all()
+        HTTPretty.register_uri(HTTPretty.GET,
+            '%s/%s' % (settings.endpoint, Region.PATH),
+            body=json.dumps(region_data.all_regions),
+            status=200,
+            content_type="application/json")
+        limiter = ratelimit.enable(rate=1, burst=1)
+        Region.all()
+        Region.all()
+        assert limiter.stats()['requests'] == 2
+        assert limiter.stats()['throttled'] == 1
+        assert sleep.call_count == 1
@@ -0,0 +1,51 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+from mixcoatl.resource import Resource
+from mixcoatl.settings.load_settings import settings
+
+class TestResource(unittest.TestCase):
+
+    def setUp(self):
+        self.r = Resource('admin/Job')
+
+    def test_prepare_request(self):
+        '''test prepare_request() returns a signed request'''
+        req = self.r.prepare_request('GET', params={'jobId': 1})
+        assert req['method'] == 'GET'
+        assert req['url'] == settings.endpoint + '/admin/Job'
+        assert req['params'] == {'jobId': 1}
+        assert req['headers']['x-esauth-access'] == 'abcdefg'
+        assert req['headers']['x-es-details'] == 'extended'
+        assert 'x-esauth-signature' in req['headers']
+
+    def test_handle_response_get(self):
+        '''test handle_response() decodes a successful GET'''
+        x = self.r.handle_response('GET', 200, '{"jobs":[{"jobId":1}]}')
+        assert self.r.last_error is None
+        assert x['jobs'][0]['jobId'] == 1
+
+    def test_handle_response_async_post(self):
+        '''test handle_response() tracks the job of an asynchronous POST'''
+        x = self.r.handle_response('POST', 202, '{"jobs":[{"jobId":84322}]}')
+        assert self.r.last_error is None
+        assert self.r.current_job == 84322
+        assert x['jobs'][0]['jobId'] == 84322
+
+    def test_handle_response_error(self):
+        '''test handle_response() sets last_error on failure'''
+        x = self.r.handle_response('GET', 404, '{"error": {"message": "No such job ID: 5"}}')
+        assert x == 'No such job ID: 5'
+        assert self.r.last_error == 'No such job ID: 5'
+
+    def test_handle_response_delete(self):
+        '''test handle_response() returns True on 204 DELETE'''
+        assert self.r.handle_response('DELETE', 204, '') is True
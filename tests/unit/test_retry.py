@@ -0,0 +1,115 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+from mock import Mock, patch
+from requests.exceptions import ConnectionError
+
+import mixcoatl.connection as connection
+import mixcoatl.retry as retry
+from mixcoatl.geography.region import Region
+from mixcoatl.resource import Resource
+from mixcoatl.settings.load_settings import settings
+import tests.data.region as region_data
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        retry.reset_stats()
+
+    def test_delay_grows_with_jitter(self):
+        '''test delays are random and bounded by backoff * 2 ** attempt'''
+        policy = retry.RetryPolicy(retries=5, backoff=1, max_backoff=10)
+        for attempt, bound in [(0, 1), (2, 4), (6, 10)]:
+            delays = [policy.delay(attempt) for i in range(50)]
+            assert max(delays) <= bound
+            assert len(set(delays)) > 1
+
+    def test_retry_after(self):
+        '''test a Retry-After header sets the minimum delay'''
+        policy = retry.RetryPolicy(backoff=0.01, max_backoff=5)
+        response = Mock(headers={'retry-after': '3'})
+        assert policy.delay(0, response) == 3
+        response = Mock(headers={'retry-after': '120'})
+        assert policy.delay(0, response) == 5
+
+    def test_defaults(self):
+        '''test GET is retried by default and other methods only when marked safe'''
+        assert retry.get_policy('GET').retries == settings.retries
+        assert retry.get_policy('POST').retries == 0
+        assert retry.get_policy('POST', True) is retry.SAFE
+        assert retry.get_policy('GET', False) is retry.NEVER
+
+    @patch('time.sleep')
+    def test_connection_errors(self, sleep):
+        '''test connection errors are retried until the retries run out'''
+        send = Mock(side_effect=ConnectionError('refused'))
+        with self.assertRaises(ConnectionError):
+            retry.call(send, retry.RetryPolicy(retries=2))
+        assert send.call_count == 3
+        assert sleep.call_count == 2
+        assert retry.stats() == {'retries': 2, 'recovered': 0, 'exhausted': 1}
+
+    def test_other_errors_are_raised(self):
+        '''test errors other than connection errors are never retried'''
+        send = Mock(side_effect=ValueError('bad'))
+        with self.assertRaises(ValueError):
+            retry.call(send, retry.RetryPolicy(retries=2))
+        assert send.call_count == 1
+
+class TestRetriedRequests(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        retry.reset_stats()
+        self.es_url = '%s/%s' % (settings.endpoint, Region.PATH)
+
+    @httprettified
+    @patch('time.sleep')
+    def test_get_recovers(self, sleep):
+        '''test a GET succeeds after a transient 503'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url,
+            responses=[HTTPretty.Response(body='{"error": {"message": "busy"}}', status=503),
+                       HTTPretty.Response(body=json.dumps(region_data.all_regions), status=200)])
+        regions = Region.all()
+        assert len(regions) == len(region_data.all_regions['regions'])
+        assert retry.stats() == {'retries': 1, 'recovered': 1, 'exhausted': 0}
+
+    @httprettified
+    @patch('time.sleep')
+    def test_get_exhausted(self, sleep):
+        '''test the error of the last attempt is kept once the retries run out'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url,
+            body='{"error": {"message": "busy"}}', status=503)
+        r = Resource(Region.PATH)
+        r.get(retry=retry.RetryPolicy(retries=2))
+        assert r.last_error == 'busy'
+        assert sleep.call_count == 2
+        assert retry.stats()['exhausted'] == 1
+
+    @httprettified
+    @patch('time.sleep')
+    def test_post_is_not_retried(self, sleep):
+        '''test a POST is only retried when marked safe'''
+        HTTPretty.register_uri(HTTPretty.POST, self.es_url,
+            responses=[HTTPretty.Response(body='{"error": {"message": "busy"}}', status=503),
+                       HTTPretty.Response(body='{"regions": []}', status=201),
+                       HTTPretty.Response(body='{"error": {"message": "busy"}}', status=503),
+                       HTTPretty.Response(body='{"regions": []}', status=201)])
+        r = Resource(Region.PATH)
+        r.post(data='{}')
+        assert r.last_error == 'busy'
+        assert retry.stats()['retries'] == 0
+        r.post(data='{}')
+        r.post(data='{}', retry=True)
+        assert r.last_error is None
+        assert retry.stats() == {'retries': 1, 'recovered': 1, 'exhausted': 0}
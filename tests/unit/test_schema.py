@@ -0,0 +1,48 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+from mixcoatl.infrastructure.server import Server
+from mixcoatl.infrastructure.volume import Volume
+from mixcoatl.platform.storage_object import StorageObject
+
+class TestSchema(unittest.TestCase):
+
+    def test_schema_is_built_once_per_class(self):
+        '''test schema() is cached per class'''
+        assert Server.schema() is Server.schema()
+        assert Server.schema() is not Volume.schema()
+
+    def test_attribute(self):
+        '''test attribute() maps API keys to mangled attributes'''
+        assert Server.schema().attribute('serverId') == ('server_id', '_Server__server_id')
+        assert Server.schema().attribute('noSuchKey') is None
+
+    def test_reserved_words(self):
+        '''test the type key maps to e_type'''
+        assert StorageObject.schema().attribute('type') == ('e_type', '_StorageObject__e_type')
+
+    def test_mutable(self):
+        '''test mutable lists only properties with a setter'''
+        assert 'name' in Server.schema().mutable
+        assert 'server_id' not in Server.schema().mutable
+
+    def test_base_properties(self):
+        '''test every schema includes the request properties'''
+        assert 'last_error' in Server.schema()
+        assert 'request_details' in Server.schema()
+
+    def test_hydrate(self):
+        '''test hydrate() converts nested keys and rejects unknown ones'''
+        s = Server(1)
+        s.hydrate({'serverId': 1, 'region': {'regionId': 2}, 'firewalls': [{'firewallId': 3}]})
+        assert s.region == {'region_id': 2}
+        assert s.firewalls == [{'firewall_id': 3}]
+        self.assertRaises(AttributeError, s.hydrate, {'noSuchKey': 1})
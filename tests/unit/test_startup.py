@@ -0,0 +1,71 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import subprocess
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch
+
+from mixcoatl.config import LazyConfig
+from mixcoatl.exceptions import ConfigException
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+#: Imported by a dcm-* tool before it needs them, these would slow down every run
+DEFERRED = ['requests', 'sqlite3', 'prettytable', 'random', 'socket']
+
+IMPORTS = """
+import sys
+from mixcoatl.infrastructure.server import Server
+from mixcoatl import daemon, listing, resource_utils
+daemon.forward()
+print ','.join(m for m in %r if m in sys.modules)
+from mixcoatl.settings.load_settings import settings
+try:
+    settings.endpoint
+except Exception as e:
+    print type(e).__name__
+""" % DEFERRED
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_budget(self):
+        '''test importing a resource module neither configures nor imports heavy modules'''
+        env = dict((k, v) for k, v in os.environ.items() if not k.startswith('ES_'))
+        env['PYTHONPATH'] = os.pathsep.join([ROOT] + [p for p in [env.get('PYTHONPATH')] if p])
+        p = subprocess.Popen([sys.executable, '-c', IMPORTS], env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = p.communicate()
+        assert p.returncode == 0, err
+        assert out.splitlines() == ['', 'ConfigException']
+
+    def test_lazy_config(self):
+        '''test settings are read from the environment on first use, keeping those set before'''
+        config = LazyConfig()
+        with patch.dict(os.environ, {'ES_API_VERSION': '2013-03-13'}, clear=True):
+            config.set_access_key('key')
+            config.set_secret_key('secret')
+            config.set_pool_size(3)
+            os.environ['ES_POOL_SIZE'] = '7'
+            os.environ['ES_RETRIES'] = '5'
+            assert config.access_key == 'key'
+            assert config.pool_size == 3
+            assert config.retries == 5
+            assert config.basepath == '/api/enstratus/2013-03-13'
+            del os.environ['ES_RETRIES']
+            assert config.retries == 5
+
+    def test_missing_keys(self):
+        '''test a missing key is raised on every read until it is set'''
+        config = LazyConfig()
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertRaises(ConfigException, getattr, config, 'endpoint')
+            self.assertRaises(ConfigException, getattr, config, 'endpoint')
+            config.access_key = 'key'
+            config.secret_key = 'secret'
+            assert config.endpoint == 'https://api.enstratus.com/api/enstratus/2012-06-15'
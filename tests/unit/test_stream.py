@@ -0,0 +1,55 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import json
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+
+import mixcoatl.stream as stream
+from mixcoatl.utils import uncamel_pairs
+
+class TestIterArray(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = ('{"error": null, "snapshots": [{"snapshotId": 1, "name": "a, b]"}, '
+                    '{"snapshotId": 22, "tags": [1, {"x": "}"}]}, 3.5, 12345], "total": 4}')
+
+    def test_every_split(self):
+        '''test elements are decoded wherever the chunks are split'''
+        expected = json.loads(self.doc)['snapshots']
+        for i in range(len(self.doc) + 1):
+            chunks = [self.doc[:i], self.doc[i:]]
+            assert list(stream.iter_array(chunks, 'snapshots')) == expected
+
+    def test_one_byte_chunks(self):
+        '''test a document read a byte at a time'''
+        items = list(stream.iter_array(iter(self.doc), 'snapshots'))
+        assert items[3] == 12345
+
+    def test_object_pairs_hook(self):
+        '''test the hook is applied to each element'''
+        items = list(stream.iter_array([self.doc], 'snapshots', uncamel_pairs))
+        assert items[0]['snapshot_id'] == 1
+
+    def test_empty(self):
+        '''test an empty array yields nothing'''
+        assert list(stream.iter_array(['{"snapshots": [ ]}'], 'snapshots')) == []
+
+    def test_missing_key(self):
+        '''test a document without the array raises StreamException'''
+        with self.assertRaises(stream.StreamException):
+            list(stream.iter_array(['{"error": "nope"}'], 'snapshots'))
+        with self.assertRaises(stream.StreamException):
+            list(stream.iter_array(['{}'], 'snapshots'))
+
+    def test_truncated(self):
+        '''test a truncated document raises StreamException after the complete elements'''
+        items = stream.iter_array([self.doc[:90]], 'snapshots')
+        assert items.next()['snapshotId'] == 1
+        with self.assertRaises(stream.StreamException):
+            items.next()
@@ -0,0 +1,59 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch
+
+import mixcoatl.utils as utils
+
+class TestUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = '{"serverId":1,"dataCenter":{"dataCenterId":2},"volumes":[{"volumeId":3,"deviceId":"sdb"}]}'
+
+    def test_uncamel_is_memoized(self):
+        '''test uncamel() returns the same object for a repeated key'''
+        assert utils.uncamel('dataCenterName') == 'data_center_name'
+        assert utils.uncamel('dataCenterName') is utils.uncamel('dataCenterName')
+        assert utils.camelize('data_center_name') is utils.camelize('data_center_name')
+
+    def test_memo_is_bounded(self):
+        '''test the memo tables never grow past MAX_MEMO'''
+        with patch.object(utils, 'MAX_MEMO', 10):
+            for i in range(25):
+                utils.uncamel('someKey%d' % i)
+            assert len(utils._uncameled) <= 10
+        assert utils.uncamel('someKey1') == 'some_key1'
+
+    def test_loads_uncameled(self):
+        '''test loads() converts keys in the same pass'''
+        fused = utils.loads(self.doc, uncameled=True)
+        assert fused == utils.uncamel_keys(utils.loads(self.doc))
+        assert isinstance(fused, utils.Uncameled)
+        assert isinstance(fused['data_center'], utils.Uncameled)
+
+    def test_loads_without_object_pairs_hook(self):
+        '''test loads() converts keys with the json of Python 2.6, which has no object_pairs_hook'''
+        decoder = utils.json.JSONDecoder
+
+        def _decoder(**kwargs):
+            if 'object_pairs_hook' in kwargs:
+                raise TypeError("__init__() got an unexpected keyword argument 'object_pairs_hook'")
+            return decoder(**kwargs)
+        with patch.object(utils.json, 'JSONDecoder', side_effect=_decoder):
+            fused = utils.loads(self.doc, uncameled=True)
+        assert fused == utils.uncamel_keys(utils.loads(self.doc))
+        assert isinstance(fused, utils.Uncameled)
+        assert isinstance(fused['data_center'], utils.Uncameled)
+
+    def test_loads(self):
+        '''test loads() keeps keys as they are by default'''
+        plain = utils.loads(self.doc)
+        assert plain['dataCenter']['dataCenterId'] == 2
+        assert not isinstance(plain, utils.Uncameled)
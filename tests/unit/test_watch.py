@@ -0,0 +1,246 @@
+import os
+import sys
+# These have to be set before importing any mixcoatl modules
+os.environ['ES_ACCESS_KEY'] = 'abcdefg'
+os.environ['ES_SECRET_KEY'] = 'gfedcba'
+import copy
+import json
+
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from httpretty import HTTPretty
+from httpretty import httprettified
+from mock import patch
+
+import mixcoatl.connection as connection
+from mixcoatl.admin.job import Job, JobException
+from mixcoatl.futures import JobFuture, TimeoutError
+from mixcoatl.infrastructure.server import Server
+from mixcoatl.settings.load_settings import settings
+from mixcoatl.watch import JobWatcher, StatusWaiter
+
+class TestJobWatcher(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.es_url = '%s/%s' % (settings.endpoint, Job.PATH)
+        with open('../../tests/data/unit/admin/job.json') as f:
+            self.running = json.load(f)
+        self.complete = copy.deepcopy(self.running)
+        for job in self.complete['jobs']:
+            if job['status'] == 'RUNNING':
+                job['status'] = 'COMPLETE'
+        self.watcher = JobWatcher(interval=1, max_interval=2, backoff=1.5)
+
+    def response(self, data, jobs=None):
+        if jobs is not None:
+            data = {'jobs': [j for j in data['jobs'] if j['jobId'] in jobs]}
+        return HTTPretty.Response(body=json.dumps(data), status=200)
+
+    @httprettified
+    @patch('time.sleep')
+    def test_one_listing_per_tick(self, sleep):
+        '''test many jobs are checked with a single listing per tick'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url,
+            responses=[self.response(self.running), self.response(self.complete)])
+        self.watcher.list_threshold = 1
+        finished = []
+        running = self.watcher.watch(4, callback=finished.append)
+        failed = self.watcher.watch(5, callback=finished.append)
+        complete = self.watcher.watch(1)
+        assert self.watcher.run() is True
+        assert self.watcher.ticks == 2
+        assert self.watcher.calls == 2
+        assert running.result().status == 'COMPLETE'
+        assert complete.result().job_id == 1
+        with self.assertRaises(JobException):
+            failed.result()
+        assert str(failed.exception()) == 'kaboom!'
+        assert sorted(j.job_id for j in finished) == [4, 5]
+
+    @httprettified
+    @patch('time.sleep')
+    def test_backs_off(self, sleep):
+        '''test ticks start fast and back off to max_interval'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url + '/4',
+            responses=[self.response(self.running, [4])] * 4 + [self.response(self.complete, [4])])
+        f = self.watcher.watch(4)
+        assert self.watcher.run() is True
+        # load_many() sleeps too, in the threads of its pool
+        assert [c[0][0] for c in sleep.call_args_list if c[0][0] >= 1] == [1, 1.5, 2, 2]
+        assert self.watcher.calls == 5
+        assert f.result().status == 'COMPLETE'
+
+    @httprettified
+    @patch('time.sleep')
+    def test_missing_from_listing(self, sleep):
+        '''test jobs missing from the listing are loaded on their own'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url,
+            body=json.dumps({'jobs': [j for j in self.complete['jobs'] if j['jobId'] != 3]}))
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url + '/3',
+            body=json.dumps({'error': {'message': 'No such job ID: 3'}}), status=404)
+        found = self.watcher.watch(1)
+        lost = self.watcher.watch(3)
+        self.watcher.run()
+        assert self.watcher.calls == 2
+        assert found.result().job_id == 1
+        assert str(lost.exception()) == 'No such job ID: 3'
+
+    @httprettified
+    def test_thread_survives_errors(self):
+        '''test the background thread keeps polling after a tick raises a mixcoatl exception'''
+        HTTPretty.register_uri(HTTPretty.GET, '%s/1' % self.es_url,
+            body=json.dumps({'jobs': [j for j in self.complete['jobs'] if j['jobId'] == 1]}))
+        watcher = JobWatcher(interval=0.01, max_interval=0.01)
+        poll = watcher.poll
+        ticks = [JobException('broken')]
+
+        def _poll():
+            if ticks:
+                raise ticks.pop()
+            return poll()
+        with patch.object(watcher, 'poll', side_effect=_poll):
+            watcher.start()
+            try:
+                assert watcher.watch(1).result(timeout=5).job_id == 1
+            finally:
+                watcher.stop(5)
+        assert watcher.errors == 1
+
+    def test_cancel(self):
+        '''test cancelled futures are no longer watched'''
+        f = self.watcher.watch(4)
+        f.cancel()
+        assert self.watcher.poll() == []
+        assert self.watcher.pending == []
+
+    @httprettified
+    def test_wait_for_uses_shared_watcher(self):
+        '''test Job.wait_for() waits on the background watcher'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url + '/4',
+            responses=[self.response(self.running, [4]), self.response(self.complete, [4])])
+        assert Job.wait_for(4) is True
+
+class TestStatusWaiter(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.es_url = '%s/%s' % (settings.endpoint, Server.PATH)
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.data = json.load(f)
+
+    def response(self, running, ids=None):
+        data = copy.deepcopy(self.data)
+        for s in data['servers']:
+            if s['serverId'] in running:
+                s['status'] = 'RUNNING'
+        if ids is not None:
+            data['servers'] = [s for s in data['servers'] if s['serverId'] in ids]
+        return HTTPretty.Response(body=json.dumps(data), status=200)
+
+    @httprettified
+    @patch('time.sleep')
+    def test_one_listing_per_tick(self, sleep):
+        '''test resources are refreshed together and yielded as they reach the status'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url,
+            responses=[self.response([]), self.response([322765, 325853])])
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url + '/311540',
+            responses=[self.response([311540], [311540])])
+        servers = [Server(322765), Server(325853), Server(311540)]
+        waiter = StatusWaiter(servers, 'RUNNING', region_id=19556)
+        reached = list(waiter)
+        assert [s.server_id for s in reached] == [322765, 325853, 311540]
+        assert reached[0] is servers[0]
+        assert waiter.ticks == 3
+        assert waiter.calls == 3
+        assert waiter.errors == {}
+
+    @httprettified
+    def test_timeout(self):
+        '''test a deadline raises TimeoutError with the rest still pending'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url, responses=[self.response([322765])])
+        waiter = StatusWaiter([Server(322765), Server(325853)], ['RUNNING', 'STOPPED'], timeout=0)
+        items = iter(waiter)
+        assert items.next().server_id == 322765
+        with self.assertRaises(TimeoutError):
+            items.next()
+        assert [s.server_id for s in waiter.pending] == [325853]
+
+    @httprettified
+    @patch('time.sleep')
+    def test_server_wait_for(self, sleep):
+        '''test Server.wait_for() refreshes the server until it is RUNNING'''
+        HTTPretty.register_uri(HTTPretty.GET, self.es_url + '/324466',
+            responses=[self.response([], [324466]), self.response([324466], [324466])])
+        server = Server(324466)
+        assert server.wait_for('RUNNING') is server
+        assert server.status == 'RUNNING'
+
+class TestJobFuture(unittest.TestCase):
+
+    def setUp(self):
+        connection.close_all()
+        self.job_url = '%s/%s' % (settings.endpoint, Job.PATH)
+        self.server_url = '%s/%s' % (settings.endpoint, Server.PATH)
+        with open('../../tests/data/unit/admin/job.json') as f:
+            self.jobs = json.load(f)
+        with open('../../tests/data/unit/infrastructure/server.json') as f:
+            self.servers = json.load(f)
+        self.watcher = JobWatcher()
+
+    def job(self, job_id):
+        return json.dumps({'jobs': [j for j in self.jobs['jobs'] if j['jobId'] == job_id]})
+
+    @httprettified
+    def test_resolve(self):
+        '''test the future resolves to the result of the final job'''
+        HTTPretty.register_uri(HTTPretty.GET, self.job_url + '/2', body=self.job(2))
+        f = JobFuture(2, lambda job: int(job.message), watcher=self.watcher)
+        assert not f.done()
+        self.watcher.poll()
+        assert f.result() == 339452
+
+    @httprettified
+    def test_failed_job(self):
+        '''test a failed job sets a JobException'''
+        HTTPretty.register_uri(HTTPretty.GET, self.job_url + '/5', body=self.job(5))
+        f = JobFuture(5, watcher=self.watcher)
+        self.watcher.poll()
+        with self.assertRaises(JobException):
+            f.result()
+
+    def test_no_job(self):
+        '''test an operation without a job resolves right away'''
+        f = JobFuture(None, lambda job: 'done')
+        assert f.result(timeout=0) == 'done'
+
+    def test_cancel(self):
+        '''test cancelling the future stops watching the job'''
+        f = JobFuture(4, watcher=self.watcher)
+        assert f.cancel()
+        assert self.watcher.poll() == []
+        assert self.watcher.pending == []
+
+    @httprettified
+    def test_launch(self):
+        '''test Server.launch(future=True) resolves to the launched server'''
+        HTTPretty.register_uri(HTTPretty.POST, self.server_url,
+            body='{"jobs":[{"jobId":2,"status":"RUNNING"}]}', status=202)
+        HTTPretty.register_uri(HTTPretty.GET, self.job_url + '/2', body=self.job(2))
+        data = {'servers': self.servers['servers'][:1]}
+        data['servers'][0]['serverId'] = 339452
+        HTTPretty.register_uri(HTTPretty.GET, self.server_url + '/339452', body=json.dumps(data))
+        s = Server()
+        s.provider_product_id = 'm1.xlarge'
+        s.machine_image = 284831
+        s.description = 'unit test server'
+        s.name = 'my-test-server'
+        s.data_center = 64716
+        s.budget = 10287
+        f = s.launch(future=True)
+        assert f.job_id == 2
+        assert f.result(timeout=10) is s
+        assert s.server_id == 339452
+        assert s.last_error is None